@@ -1,20 +1,77 @@
-import pandas as pd
+import asyncio
+import json
 import os
-import shutil
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import io
+import threading
+import uuid
+from fastapi import FastAPI, HTTPException, Request, Query
 # IMPORTANT: Import CORSMiddleware to fix the cross-origin fetch errors
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, List
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Iterator, List, Literal
 
 # --- Core Modules from your project ---
 # NOTE: These imports assume you have 'core/graph_state.py' and 'main_graph.py'
+from core.artifacts import ARTIFACT_STORE
+from core.batches import BatchManager
+from core.checkpoints import CHECKPOINTS, checkpoint_run_id
 from core.graph_state import GenerationState
-from main_graph import build_generation_graph
+from core.instrumentation import NODE_METRICS
+from core.jobs import Job, JobCancelled, JobManager, QueueFullError
+from core.loader import DEFAULT_LOAD_ENGINE, load_csv
+from core.model_cache import MODEL_CACHE
+from core.progress import PROGRESS, TERMINAL_EVENT
+from core.quality import QUALITY_MAX_COLUMN_PAIRS, QUALITY_ROW_BUDGET, QUALITY_TIME_BUDGET_S
+from core.sampling import DEFAULT_BATCH_SIZE
+from core.result_store import ResultStore
+from core.schema_cache import SCHEMA_CACHE
+from core.sinks import DEFAULT_OUTPUT_FORMAT, discard_partial, iter_output_batches, output_columns
+from core.synthesizers import DEFAULT_SYNTHESIZER
+from core.uploads import (
+    UPLOAD_DIR, UPLOAD_MAX_BYTES, UPLOAD_MULTIPART_OVERHEAD, InvalidUpload, UploadTooLarge, store_upload,
+)
 
 # --- FastAPI Setup ---
 app = FastAPI(title="Synthetic Data Generation API", version="1.0.0")
-app_graph = build_generation_graph()
+
+# The compiled graph (LangGraph, LangChain and the node modules) is built on first use
+# rather than at import, so server boot doesn't pay for it. Set SYNTH_WARMUP=1 to build
+# it, import SDV/SDMetrics and initialize the LLM in the background right after startup.
+_app_graph = None
+_app_graph_lock = threading.Lock()
+WARMUP_ON_STARTUP = os.environ.get("SYNTH_WARMUP", "0") == "1"
+
+
+def get_app_graph():
+    """Returns the compiled generation graph, building it on first call."""
+    global _app_graph
+    if _app_graph is None:
+        with _app_graph_lock:
+            if _app_graph is None:
+                from main_graph import build_generation_graph
+                _app_graph = build_generation_graph()
+    return _app_graph
+
+
+def warm_up_pipeline() -> None:
+    """Builds the graph and pre-loads heavy dependencies and the LLM client."""
+    from main_graph import warm_up
+    get_app_graph()
+    warm_up()
+
+# --- Upload Size Limit ---
+# Bodies without a Content-Length are cut off by store_upload as the bytes arrive
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Rejects an oversized upload from its Content-Length before any of the body is read."""
+    if request.url.path == "/upload-file":
+        length = request.headers.get("content-length")
+        if length and length.isdigit() and int(length) > UPLOAD_MAX_BYTES + UPLOAD_MULTIPART_OVERHEAD:
+            return JSONResponse(status_code=413,
+                                content={"detail": f"Upload exceeds the {UPLOAD_MAX_BYTES:,} byte limit."})
+    return await call_next(request)
+
 
 # --- CORS Configuration ---
 # Fixes the 'Access-Control-Allow-Origin' CORS policy error when testing with a local HTML file.
@@ -29,9 +86,11 @@ app.add_middleware(
 )
 
 # --- State Management ---
-LATEST_STATUS = {"status": "Awaiting Run", "quality_score": None, "error_message": None, "project_id": "P_001"}
-SYNTHETIC_DATA = pd.DataFrame()
-UPLOAD_DIR = "uploads"
+# Per-project status, quality report and output handle; loaded frames are LRU-cached by bytes.
+RESULT_STORE = ResultStore()
+DEFAULT_PROJECT_ID = "P_001"
+DEFAULT_PAGE_ROWS = 100
+MAX_PAGE_ROWS = 10_000
 
 
 # Define the models for endpoint responses
@@ -40,164 +99,647 @@ class PipelineStatus(BaseModel):
     quality_score: float | None
     error_message: str | None
     synthetic_row_count: int
+    node_metrics: List[Dict[str, Any]] = []  # Per-node wall/cpu seconds, peak RSS delta, rows in/out
 
 
 class SyntheticDataResponse(BaseModel):
     columns: List[str]
     data: List[Dict[str, Any]]
+    offset: int
+    limit: int
+    total_rows: int
+    next_offset: int | None  # Cursor for the next page, None on the last page
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    project_id: str
+    status: str
+    error_message: str | None
+    result: Dict[str, Any]
+    submitted_at: float
+    started_at: float | None
+    finished_at: float | None
+
+
+class BatchItem(BaseModel):
+    """One table of a batch; the options mirror the /run-pipeline query parameters."""
+    input_file_path: str
+    project_id: str | None = None  # Defaults to BATCH_<batch prefix>_<index>
+    num_rows: int = Field(5000, ge=1)
+    synthesizer: Literal['gaussian_copula', 'ctgan', 'tvae', 'copula_gan', 'fast'] = DEFAULT_SYNTHESIZER
+    parallel: bool = False
+    constraints: List[str] = []
+    batch_size: int = Field(DEFAULT_BATCH_SIZE, ge=1)
+    workers: int = Field(1, ge=1)
+    seed: int | None = None
+    output_format: Literal['csv', 'parquet', 'feather'] = DEFAULT_OUTPUT_FORMAT
+    load_engine: Literal['pandas', 'pyarrow'] = DEFAULT_LOAD_ENGINE
+    load_sample_rows: int | None = Field(None, ge=1)
+    incremental: bool = False
+    quality_mode: Literal['auto', 'full', 'sampled'] = 'auto'
+    quality_row_budget: int = Field(QUALITY_ROW_BUDGET, ge=100)
+    quality_max_column_pairs: int = Field(QUALITY_MAX_COLUMN_PAIRS, ge=1)
+    quality_time_budget_s: float = Field(QUALITY_TIME_BUDGET_S, gt=0)
+    quality_threshold: float | None = Field(None, ge=0, le=1)
+    checkpoint: bool = False
+    profile_nodes: bool = False
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    status: str  # 'running' until every item has finished, then 'completed' or 'cancelled'
+    submitted_at: float
+    finished_at: float | None
+    counts: Dict[str, int]  # Items per state: pending, queued, running, completed, failed, cancelled
+    items: List[Dict[str, Any]]  # Per-table job state, pipeline status, quality score, rows and run time
+    throughput: Dict[str, float]  # Elapsed seconds, tables finished, rows generated, tables/min, rows/s
 
 
 class FileUploadResponse(BaseModel):
     file_path: str
     message: str
+    sha256: str  # Content hash; identical uploads share one stored file
+    size_bytes: int
+    deduplicated: bool  # True when an identical file was already stored
 
 
-# --- Utility Function to Load Data ---
-def load_latest_synthetic_data(project_id: str):
-    """Attempts to load the last generated CSV data into the global DataFrame based on project_id."""
-    global SYNTHETIC_DATA
-    global LATEST_STATUS
+# --- Utility Function to Build Status Responses ---
+def pipeline_status_for(project_id: str) -> "PipelineStatus":
+    """Builds the /status payload for a project from the result store."""
+    result = RESULT_STORE.discover(project_id)
+    if result is None:
+        return PipelineStatus(
+            status="Awaiting Run",
+            quality_score=None,
+            error_message=None,
+            synthetic_row_count=0
+        )
 
-    file_path = f"synthetic_data_{project_id}.csv"
+    return PipelineStatus(
+        status=result.status,
+        quality_score=result.quality_score,
+        error_message=result.error_message,
+        synthetic_row_count=result.row_count,
+        node_metrics=result.node_metrics
+    )
 
-    if not os.path.exists(file_path):
-        SYNTHETIC_DATA = pd.DataFrame()
-        return
+
+# --- Endpoint 0: Upload File ---
+# The body is parsed from the request stream rather than through an UploadFile
+# parameter (which spools it to a temporary file first), so the form is described here
+UPLOAD_REQUEST_BODY = {
+    'required': True,
+    'content': {'multipart/form-data': {'schema': {
+        'type': 'object', 'required': ['file'], 'properties': {'file': {'type': 'string', 'format': 'binary'}},
+    }}},
+}
+
+
+@app.post("/upload-file", response_model=FileUploadResponse, openapi_extra={'requestBody': UPLOAD_REQUEST_BODY})
+async def upload_file_handler(request: Request):
+    """
+    Accepts a CSV file upload (multipart form field 'file') and stores it under its
+    content hash (uploads/<sha256>.csv). The body is parsed as it arrives and the file
+    is written to disk once, without blocking the event loop; uploads over
+    SYNTH_UPLOAD_MAX_BYTES are rejected with 413 as soon as the limit is crossed.
+    """
 
     try:
-        SYNTHETIC_DATA = pd.read_csv(file_path)
-        LATEST_STATUS['project_id'] = project_id
+        stored = await store_upload(request.stream(), request.headers.get('content-type', ''),
+                                    UPLOAD_DIR, UPLOAD_MAX_BYTES)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        SYNTHETIC_DATA = pd.DataFrame()
+        raise HTTPException(status_code=500, detail=f"Failed to save file on server: {e}")
 
+    filename = stored.pop('filename')
+    message = (f"File '{filename}' was already uploaded; reusing the stored copy." if stored['deduplicated']
+               else f"File '{filename}' uploaded successfully.")
+    return FileUploadResponse(message=message, **stored)
 
-# --- Endpoint 0: Upload File ---
-@app.post("/upload-file", response_model=FileUploadResponse)
-async def upload_file_handler(file: UploadFile = File(...)):
-    """Accepts a file upload and saves it to the local filesystem."""
 
-    if not file.filename or not file.filename.lower().endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed.")
+# --- Job Execution (runs on a JobManager worker thread) ---
+def run_pipeline_job(job: Job) -> Dict[str, Any]:
+    """Executes one queued pipeline run and publishes its outcome to the project's result entry."""
+    project_id = job.project_id
+    RESULT_STORE.update(project_id, status="Running", quality_score=None, error_message=None, job_id=job.job_id,
+                        input_file_path=job.params['input_file_path'], node_metrics=[])
+    PROGRESS.publish(project_id, 'status', status="Running", job_id=job.job_id)
 
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
+    # Checkpointed runs keep their tables in a namespace shared by runs of the same input,
+    # so a retry or re-validation can restore node outputs that point into it
+    checkpoint = job.params['checkpoint']
+    run_id = checkpoint_run_id(job.params['input_file_path']) if checkpoint else job.job_id
+
+    initial_state = GenerationState(
+        project_id=project_id,
+        job_id=job.job_id,
+        run_id=run_id,
+        input_file_path=job.params['input_file_path'],
+        original_data_ref=None,
+        load_engine=job.params['load_engine'],
+        load_sample_rows=job.params['load_sample_rows'],
+        load_stats={},
+        incremental=job.params['incremental'],
+        append_base=None,
+        data_stats=None,
+        inferred_schema={},
+        user_constraints=job.params['user_constraints'],
+        metadata=None,
+        num_rows=job.params['num_rows'],
+        synthesizer=job.params['synthesizer'],
+        parallel=job.params['parallel'],
+        prefit_metadata=None,
+        prefit_error=None,
+        batch_size=job.params['batch_size'],
+        workers=job.params['workers'],
+        seed=job.params['seed'],
+        output_format=job.params['output_format'],
+        quality_mode=job.params['quality_mode'],
+        quality_row_budget=job.params['quality_row_budget'],
+        quality_max_column_pairs=job.params['quality_max_column_pairs'],
+        quality_time_budget_s=job.params['quality_time_budget_s'],
+        quality_threshold=job.params['quality_threshold'],
+        synthetic_data_ref=None,
+        streamed_output_path=None,
+        quality_report={},
+        output_path=None,
+        output_row_count=0,
+        status='Initialized',
+        log_messages=[],
+        error_message=None,
+        node_metrics=[],
+        profile_nodes=job.params['profile_nodes'],
+        checkpoint=checkpoint,
+        executed_nodes=[]
+    )
 
+    final_state = initial_state
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # stream() yields the state after every node, giving a cancellation point between nodes
+        for final_state in get_app_graph().stream(initial_state, stream_mode="values"):
+            RESULT_STORE.update(project_id, node_metrics=final_state.get('node_metrics') or [])
+            job.check_cancelled()
+
+        quality_report = final_state.get('quality_report', {})
+        approved = final_state['status'] == 'Quality Approved'
+        result = RESULT_STORE.update(
+            project_id,
+            status=final_state['status'],
+            error_message=final_state.get('error_message'),
+            quality_score=quality_report.get('Overall Score'),
+            quality_report=quality_report,
+            metadata=final_state.get('metadata'),
+            # Only approved runs publish an output; a failed run leaves no previewable data
+            output_path=final_state.get('output_path') if approved else None,
+            row_count=final_state.get('output_row_count', 0) if approved else 0
+        )
+
+    except JobCancelled as e:
+        RESULT_STORE.update(project_id, status="Cancelled", error_message=str(e), quality_score=None)
+        raise
+
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save file on server: {e}")
+        error_msg = f"CRITICAL GRAPH EXECUTION ERROR: {e}"
+        RESULT_STORE.update(project_id, status="Error", error_message=error_msg, quality_score=None)
+        raise
+
     finally:
-        await file.close()
+        # The run's intermediate tables are no longer needed once its outcome is published,
+        # unless checkpoints refer to them (the checkpoint store expires those). A streamed
+        # output data_saver never published (failed validation, error, cancel) goes either
+        # way: checkpoints keep their own link to it.
+        if not checkpoint:
+            ARTIFACT_STORE.release(run_id)
+        if not final_state.get('output_path'):
+            discard_partial(final_state.get('streamed_output_path'))
+        PROGRESS.publish(project_id, TERMINAL_EVENT, job_id=job.job_id, **pipeline_status_for(project_id).model_dump())
+
+    return {
+        'status': result.status,
+        'quality_score': result.quality_score,
+        'error_message': result.error_message,
+        'synthetic_row_count': result.row_count
+    }
 
-    return FileUploadResponse(file_path=file_path, message=f"File '{file.filename}' uploaded successfully.")
+
+def publish_dropped(job: Job) -> None:
+    """Publishes the outcome of a job cancelled before it started: run_pipeline_job never runs to report it."""
+    RESULT_STORE.update(job.project_id, status="Cancelled", error_message="Job cancelled before it started.",
+                        quality_score=None)
+    PROGRESS.publish(job.project_id, TERMINAL_EVENT, job_id=job.job_id,
+                     **pipeline_status_for(job.project_id).model_dump())
+
+
+def publish_queued(job: Job) -> None:
+    """Announces a submitted job; called by the JobManager before the job can start running."""
+    PROGRESS.publish(job.project_id, 'status', status="Queued", job_id=job.job_id)
+
+
+JOB_MANAGER = JobManager(run_pipeline_job, on_queued=publish_queued, on_dropped=publish_dropped)
+
+
+def enqueue_run(project_id: str, params: Dict[str, Any]) -> Job:
+    """Submits a pipeline run for the project; raises QueueFullError, leaving its status as it was."""
+    # Mark the project as queued before submitting, so pollers don't mistake the previous
+    # outcome for this run and a fast job's final status is never overwritten.
+    previous = RESULT_STORE.get(project_id)
+    previous_fields = previous.to_dict() if previous else None
+    RESULT_STORE.update(project_id, status="Queued", quality_score=None, error_message=None)
+
+    try:
+        job = JOB_MANAGER.submit(project_id, **params)
+    except QueueFullError:
+        if previous_fields:
+            RESULT_STORE.update(project_id, status=previous_fields['status'],
+                                quality_score=previous_fields['quality_score'],
+                                error_message=previous_fields['error_message'])
+        else:
+            RESULT_STORE.update(project_id, status="Awaiting Run")
+        raise
+    return job
+
+
+BATCH_MANAGER = BatchManager(JOB_MANAGER, enqueue_run, JOB_MANAGER.cancel, prepare=warm_up_pipeline)
 
 
 # --- Endpoint 1: Run the Pipeline ---
-@app.post("/run-pipeline", response_model=PipelineStatus)
+@app.post("/run-pipeline", response_model=JobStatusResponse, status_code=202)
 async def run_data_pipeline(
         input_file_path: str,
-        project_id: str = "P_001"
+        project_id: str = DEFAULT_PROJECT_ID,
+        num_rows: int = Query(5000, ge=1, description="Number of synthetic rows to generate."),
+        synthesizer: Literal['gaussian_copula', 'ctgan', 'tvae', 'copula_gan', 'fast'] = Query(
+            DEFAULT_SYNTHESIZER, description="Synthesizer engine; 'fast' is a NumPy copula for quick previews."),
+        parallel: bool = Query(False, description="Fit the synthesizer concurrently with the LLM schema call."),
+        constraints: List[str] = Query([], description="Rules every output row must satisfy, e.g. 'Age >= 18', "
+                                                        "'start <= end', 'City in [A, B]'. Repeat for several."),
+        batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, description="Rows sampled per batch; larger runs are streamed to disk."),
+        workers: int = Query(1, ge=1, description="Processes used to sample batches in parallel."),
+        seed: int | None = Query(None, description="Seed for reproducible output."),
+        output_format: Literal['csv', 'parquet', 'feather'] = Query(DEFAULT_OUTPUT_FORMAT, description="File format of the stored output."),
+        load_engine: Literal['pandas', 'pyarrow'] = Query(DEFAULT_LOAD_ENGINE, description="CSV parser; 'pyarrow' parses with multiple threads."),
+        load_sample_rows: int | None = Query(None, ge=1, description="Fit and validate on a uniform sample of this many input rows."),
+        incremental: bool = Query(False, description="Reuse the schema and update the model of an earlier input this file only appends rows to."),
+        quality_mode: Literal['auto', 'full', 'sampled'] = Query('auto', description="'auto' samples only when the data exceeds the budgets."),
+        quality_row_budget: int = Query(QUALITY_ROW_BUDGET, ge=100, description="Max rows per frame scored by the sampled quality check."),
+        quality_max_column_pairs: int = Query(QUALITY_MAX_COLUMN_PAIRS, ge=1, description="Max column pairs scored by the sampled quality check."),
+        quality_time_budget_s: float = Query(QUALITY_TIME_BUDGET_S, gt=0, description="Time after which the sampled check stops scoring pairs."),
+        quality_threshold: float | None = Query(None, ge=0, le=1, description="Minimum Overall Score; lower-scoring runs end in 'Validation Failure'."),
+        checkpoint: bool = Query(False, description="Restore node outputs of an earlier checkpointed run with the same input and "
+                                                    "parameters, e.g. to retry or re-validate without re-sampling."),
+        profile_nodes: bool = Query(False, description="Dump a cProfile of every graph node under profiles/<project_id>/.")
 ):
     """
-    Triggers the LangGraph pipeline to generate synthetic data.
+    Enqueues a LangGraph pipeline run and returns its job id immediately.
+    Progress is available from /jobs/{job_id} and /status; a full queue returns 429.
     """
-    global LATEST_STATUS
-    global SYNTHETIC_DATA
-
     if not os.path.exists(input_file_path):
         raise HTTPException(
             status_code=400,
             detail=f"Input file not found at path: {input_file_path}. Please check the path."
         )
 
-    initial_state = GenerationState(
-        project_id=project_id,
-        input_file_path=input_file_path,
-        original_data=pd.DataFrame(),
-        inferred_schema={},
-        user_constraints=[],
-        synthetic_data=None,
-        quality_report={},
-        status='Initialized',
-        log_messages=[],
-        error_message=None
-    )
-
     try:
-        final_state = app_graph.invoke(initial_state)
+        job = enqueue_run(project_id, dict(
+            input_file_path=input_file_path,
+            num_rows=num_rows,
+            synthesizer=synthesizer,
+            parallel=parallel,
+            user_constraints=constraints,
+            batch_size=batch_size,
+            workers=workers,
+            seed=seed,
+            output_format=output_format,
+            load_engine=load_engine,
+            load_sample_rows=load_sample_rows,
+            incremental=incremental,
+            quality_mode=quality_mode,
+            quality_row_budget=quality_row_budget,
+            quality_max_column_pairs=quality_max_column_pairs,
+            quality_time_budget_s=quality_time_budget_s,
+            quality_threshold=quality_threshold,
+            checkpoint=checkpoint,
+            profile_nodes=profile_nodes
+        ))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+    return JobStatusResponse(**job.to_dict())
+
+
+# --- Endpoint 1b: Job Status and Cancellation ---
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job_status(job_id: str):
+    """Returns the state of a queued, running or finished pipeline job."""
+    job = JOB_MANAGER.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return JobStatusResponse(**job.to_dict())
+
+
+@app.delete("/jobs/{job_id}", response_model=JobStatusResponse)
+def cancel_job(job_id: str):
+    """Cancels a queued job, or stops a running job after its current graph node."""
+    job = JOB_MANAGER.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return JobStatusResponse(**job.to_dict())
+
+
+@app.get("/jobs")
+def get_job_queue_stats():
+    """Returns worker-pool limits and job counts by state."""
+    return JOB_MANAGER.stats()
+
+
+# --- Endpoint 1c: Batch Runs ---
+@app.post("/run-batch", response_model=BatchStatusResponse, status_code=202)
+def run_batch(request: BatchRequest):
+    """
+    Runs many tables in one request. Items are fed to the shared worker pool as slots
+    free up (at most SYNTH_MAX_CONCURRENT_JOBS at a time), so every run reuses the
+    compiled graph, LLM client and schema/model caches. Each item publishes to its own
+    project; poll /batches/{batch_id} for the aggregate status.
+    """
+    prefix = uuid.uuid4().hex[:8]
+    project_ids = [item.project_id or f"BATCH_{prefix}_{index:03d}" for index, item in enumerate(request.items)]
+    duplicates = sorted({project_id for project_id in project_ids if project_ids.count(project_id) > 1})
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Batch items must have distinct project ids: {duplicates}")
+    missing = [item.input_file_path for item in request.items if not os.path.exists(item.input_file_path)]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Input files not found: {missing}")
+
+    items = []
+    for project_id, item in zip(project_ids, request.items):
+        params = item.model_dump(exclude={'project_id', 'constraints'})
+        items.append({'project_id': project_id, 'user_constraints': item.constraints, **params})
+    try:
+        batch = BATCH_MANAGER.submit(items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BatchStatusResponse(**batch.to_dict())
 
-        LATEST_STATUS['status'] = final_state['status']
-        LATEST_STATUS['error_message'] = final_state.get('error_message')
-        LATEST_STATUS['quality_score'] = final_state.get('quality_report', {}).get('Overall Score')
-        LATEST_STATUS['project_id'] = project_id
 
-        if LATEST_STATUS['status'] == 'Quality Approved':
-            load_latest_synthetic_data(project_id)
-        else:
-            SYNTHETIC_DATA = pd.DataFrame()
+@app.get("/batches/{batch_id}", response_model=BatchStatusResponse)
+def get_batch_status(batch_id: str):
+    """Aggregate status of a batch: item counts by state, per-table results and throughput."""
+    batch = BATCH_MANAGER.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Unknown batch id: {batch_id}")
+    return BatchStatusResponse(**batch.to_dict())
 
-    except Exception as e:
-        error_msg = f"CRITICAL GRAPH EXECUTION ERROR: {e}"
-        LATEST_STATUS.update({
-            "status": "Error",
-            "error_message": error_msg,
-            "quality_score": None
-        })
-        raise HTTPException(status_code=500, detail=error_msg)
 
-    return PipelineStatus(
-        status=LATEST_STATUS['status'],
-        quality_score=LATEST_STATUS['quality_score'],
-        error_message=LATEST_STATUS['error_message'],
-        synthetic_row_count=SYNTHETIC_DATA.shape[0]
-    )
+@app.delete("/batches/{batch_id}", response_model=BatchStatusResponse)
+def cancel_batch(batch_id: str):
+    """Stops submitting a batch's remaining items and cancels its queued and running jobs."""
+    batch = BATCH_MANAGER.cancel(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Unknown batch id: {batch_id}")
+    return BatchStatusResponse(**batch.to_dict())
 
 
 # --- Endpoint 2: Get Current Status ---
 @app.get("/status", response_model=PipelineStatus)
-def get_status(project_id: str = "P_001"):
+def get_status(project_id: str = DEFAULT_PROJECT_ID):
     """Returns the status and quality score of the last pipeline run for the given project_id."""
-    if project_id != LATEST_STATUS['project_id']:
-        return PipelineStatus(
-            status="Awaiting Run",
-            quality_score=None,
-            error_message=None,
-            synthetic_row_count=0
-        )
+    return pipeline_status_for(project_id)
 
-    return PipelineStatus(
-        status=LATEST_STATUS['status'],
-        quality_score=LATEST_STATUS['quality_score'],
-        error_message=LATEST_STATUS['error_message'],
-        synthetic_row_count=SYNTHETIC_DATA.shape[0]
-    )
+
+# --- Endpoint 2b: Push-Based Progress (Server-Sent Events) ---
+SSE_HEARTBEAT_S = 15
+ACTIVE_STATUSES = ('Awaiting Run', 'Queued', 'Running')
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.get("/progress")
+async def stream_progress(project_id: str = DEFAULT_PROJECT_ID):
+    """
+    Server-Sent Events stream of a project's run: a 'status' snapshot first, then
+    'status' (Queued/Running), 'node_started', 'node_finished' (with the node's
+    metrics) and 'sampling' (rows generated, rows/sec) events as they happen, and a
+    final 'done' carrying the /status payload, after which the stream ends.
+    """
+    # Subscribe before taking the snapshot so no event falls between the two
+    queue = PROGRESS.subscribe(project_id)
+
+    async def events():
+        try:
+            snapshot = pipeline_status_for(project_id).model_dump()
+            yield _sse('status', snapshot)
+            if snapshot['status'] not in ACTIVE_STATUSES:
+                yield _sse(TERMINAL_EVENT, snapshot)
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_S)
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event['event'], event)
+                if event['event'] == TERMINAL_EVENT:
+                    return
+        finally:
+            PROGRESS.unsubscribe(project_id, queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 # --- Endpoint 3: Retrieve Synthetic Data ---
+def _resolve_output(project_id: str, columns: List[str] | None):
+    """Looks up a project's published output and validates a column projection against it."""
+    result = RESULT_STORE.discover(project_id)
+    if result is None or not result.output_path or not os.path.exists(result.output_path):
+        raise HTTPException(status_code=404,
+                            detail=f"No synthetic data available for project {project_id}. Run the pipeline first.")
+
+    if columns:
+        unknown = [col for col in columns if col not in output_columns(result.output_path)]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown column(s): {', '.join(unknown)}")
+    return result
+
+
 @app.get("/data", response_model=SyntheticDataResponse)
-def get_synthetic_data(project_id: str = "P_001"):
-    """Returns the last generated synthetic data in a JSON structure for the given project_id."""
+def get_synthetic_data(
+        project_id: str = DEFAULT_PROJECT_ID,
+        offset: int = Query(0, ge=0, description="Index of the first row to return."),
+        limit: int = Query(DEFAULT_PAGE_ROWS, ge=1, le=MAX_PAGE_ROWS, description="Maximum rows in this page."),
+        columns: List[str] | None = Query(None, description="Columns to return (repeat the parameter); all if omitted.")
+):
+    """Returns one page of the last generated synthetic data for the given project_id."""
 
-    if project_id != LATEST_STATUS['project_id'] or SYNTHETIC_DATA.empty:
-        load_latest_synthetic_data(project_id)
+    result = _resolve_output(project_id, columns)
+    page = RESULT_STORE.read_page(project_id, offset, limit, columns)
 
-    if SYNTHETIC_DATA.empty:
+    if page is None:
         raise HTTPException(status_code=404,
                             detail=f"No synthetic data available for project {project_id}. Run the pipeline first.")
 
-    data_list = SYNTHETIC_DATA.to_dict('records')
-
+    next_offset = offset + page.shape[0]
     return SyntheticDataResponse(
-        columns=SYNTHETIC_DATA.columns.tolist(),
-        data=data_list
+        columns=page.columns.tolist(),
+        data=page.to_dict('records'),
+        offset=offset,
+        limit=limit,
+        total_rows=result.row_count,
+        next_offset=next_offset if next_offset < result.row_count else None
     )
 
 
+def _arrow_stream_chunks(batches) -> Iterator[bytes]:
+    """Encodes DataFrame chunks as an Arrow IPC stream, flushing bytes after every batch."""
+    import pyarrow as pa
+
+    buffer = io.BytesIO()
+    writer, schema = None, None
+    for batch in batches:
+        record_batch = pa.RecordBatch.from_pandas(batch, schema=schema, preserve_index=False)
+        if writer is None:
+            schema = record_batch.schema
+            writer = pa.ipc.new_stream(buffer, schema)
+        writer.write_batch(record_batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is not None:
+        writer.close()
+        yield buffer.getvalue()
+
+
+def _ndjson_chunk(batch) -> str:
+    # Recent pandas already ends lines=True output with a newline; older versions don't
+    text = batch.to_json(orient='records', lines=True)
+    return text if text.endswith("\n") else text + "\n"
+
+
+@app.get("/data/stream")
+def stream_synthetic_data(
+        project_id: str = DEFAULT_PROJECT_ID,
+        format: Literal['ndjson', 'csv', 'arrow'] = Query('ndjson', description="Wire format of the streamed rows."),
+        offset: int = Query(0, ge=0),
+        limit: int | None = Query(None, ge=1, description="Maximum rows to stream; all remaining rows if omitted."),
+        columns: List[str] | None = Query(None, description="Columns to return (repeat the parameter); all if omitted.")
+):
+    """
+    Streams the stored output chunk by chunk as NDJSON, CSV or an Arrow IPC stream,
+    so full exports never materialize the whole dataset in server memory.
+    """
+    result = _resolve_output(project_id, columns)
+    batches = iter_output_batches(result.output_path, columns, offset=offset, limit=limit)
+
+    if format == 'ndjson':
+        body = (_ndjson_chunk(batch) for batch in batches if not batch.empty)
+        media_type = "application/x-ndjson"
+    elif format == 'csv':
+        body = (batch.to_csv(index=False, header=i == 0) for i, batch in enumerate(batches))
+        media_type = "text/csv"
+    else:
+        body = _arrow_stream_chunks(batches)
+        media_type = "application/vnd.apache.arrow.stream"
+
+    return StreamingResponse(body, media_type=media_type)
+
+
+# --- Endpoint 3b: Full Quality Report On Demand ---
+@app.get("/quality-report")
+def get_full_quality_report(project_id: str = DEFAULT_PROJECT_ID):
+    """
+    Computes the exact SDMetrics report of the project's stored output against its
+    input file. Approvals may have used the sampled check; this is the full one.
+    """
+    result = _resolve_output(project_id, None)
+    if not result.input_file_path or not os.path.exists(result.input_file_path):
+        raise HTTPException(status_code=404,
+                            detail=f"Input file of project {project_id} is not available on this server.")
+
+    from core.metadata import detect_metadata
+    from core.quality import full_quality_report
+
+    original_df, _ = load_csv(result.input_file_path)
+    if 'Unnamed: 0' in original_df.columns:
+        original_df = original_df.drop(columns=['Unnamed: 0'])
+    synthetic_df = RESULT_STORE.get_frame(project_id)
+    # Score with the metadata the run was synthesized and approved with
+    metadata = result.metadata or detect_metadata(original_df)
+    try:
+        return full_quality_report(original_df, synthetic_df, metadata)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Statistical Validation Error: SDMetrics failed. {e}")
+
+
+# --- Endpoint 4: Model Cache Statistics ---
+@app.get("/model-cache")
+def get_model_cache_stats():
+    """Returns hit/miss counters and disk usage of the fitted-synthesizer cache."""
+    return MODEL_CACHE.stats()
+
+
+# --- Endpoint 4b: Schema Cache Statistics ---
+@app.get("/schema-cache")
+def get_schema_cache_stats():
+    """Returns hit/miss counters of the prompt-keyed LLM schema cache."""
+    return SCHEMA_CACHE.stats()
+
+
+# --- Endpoint 5: Result Store Statistics ---
+@app.get("/result-store")
+def get_result_store_stats():
+    """Returns the number of tracked projects and memory held by cached output frames."""
+    return RESULT_STORE.stats()
+
+
+# --- Endpoint 5b: Checkpoint Statistics ---
+@app.get("/checkpoints")
+def get_checkpoint_stats():
+    """Returns the number of stored node outputs, per node."""
+    return CHECKPOINTS.stats()
+
+
+# --- Endpoint 6: Prometheus Metrics ---
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Per-node timing/memory aggregates and cache/queue gauges in Prometheus text format."""
+    model_cache, schema_cache, jobs = MODEL_CACHE.stats(), SCHEMA_CACHE.stats(), JOB_MANAGER.stats()
+    extra = {
+        'synth_model_cache_hits': model_cache['hits'],
+        'synth_model_cache_misses': model_cache['misses'],
+        'synth_schema_cache_hits': schema_cache['hits'],
+        'synth_schema_cache_misses': schema_cache['misses'],
+        'synth_result_store_cached_bytes': RESULT_STORE.stats()['cached_bytes'],
+        'synth_progress_subscribers': PROGRESS.subscriber_count(),
+        'synth_batches_running': BATCH_MANAGER.stats()['batches'].get('running', 0),
+    }
+    for state in ('queued', 'running', 'completed', 'failed', 'cancelled'):
+        extra[f'synth_jobs_{state}'] = jobs['jobs'].get(state, 0)
+    return PlainTextResponse(NODE_METRICS.render(extra), media_type="text/plain; version=0.0.4")
+
+
 # --- Startup Event ---
 @app.on_event("startup")
 def startup_event():
-    """Loads existing synthetic data (default project) and ensures upload directory exists when the server starts."""
-    load_latest_synthetic_data(LATEST_STATUS['project_id'])
+    """Registers existing synthetic data (default project) and ensures upload directory exists when the server starts."""
+    RESULT_STORE.discover(DEFAULT_PROJECT_ID)
     os.makedirs(UPLOAD_DIR, exist_ok=True)
+    if WARMUP_ON_STARTUP:
+        threading.Thread(target=warm_up_pipeline, name="pipeline-warmup", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stops accepting pipeline jobs and signals running ones to cancel."""
+    JOB_MANAGER.shutdown()
 
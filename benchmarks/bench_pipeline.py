@@ -0,0 +1,237 @@
+"""
+Pipeline benchmark: generates a synthetic input of configurable shape, then times
+each stage (data_loader, analyze_dataframe_stats, synthesizer fit and sample,
+quality_check, data_saver) and the full graph with a stubbed LLM, cold and with
+warm caches. Results (latency, CPU, throughput, peak RSS growth) are emitted as
+JSON so runs can be compared over time.
+
+Usage (from the project root):
+    python benchmarks/bench_pipeline.py [--rows 20000] [--numeric 6] [--categorical 3]
+        [--datetime 1] [--boolean 1] [--synth-rows 20000] [--repeat 3] [--output pipeline.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.instrumentation import peak_rss_bytes  # noqa: E402
+
+
+# --- Input Generation ---
+def make_input(rows: int, numeric: int, categorical: int, datetime: int, boolean: int, seed: int) -> pd.DataFrame:
+    """Random table with the requested column type mix (ints/floats, skewed categories, dates, flags)."""
+    rng = np.random.default_rng(seed)
+    columns: Dict[str, Any] = {}
+    for i in range(numeric):
+        if i % 2:
+            columns[f"num_{i}"] = rng.normal(loc=50 * i, scale=10 + i, size=rows).round(3)
+        else:
+            columns[f"num_{i}"] = rng.integers(0, 100 * (i + 1), size=rows)
+    for i in range(categorical):
+        levels = np.array([f"level_{j}" for j in range(5 + 5 * i)])
+        weights = 1.0 / np.arange(1, levels.size + 1)
+        columns[f"cat_{i}"] = rng.choice(levels, size=rows, p=weights / weights.sum())
+    for i in range(datetime):
+        start = np.datetime64("2020-01-01")
+        columns[f"date_{i}"] = (start + rng.integers(0, 3 * 365, size=rows).astype("timedelta64[D]")).astype(str)
+    for i in range(boolean):
+        columns[f"flag_{i}"] = rng.random(rows) < 0.3
+    return pd.DataFrame(columns)
+
+
+# --- Stubbed LLM ---
+class StubLLM:
+    """Stands in for the HuggingFace endpoint: answers the schema prompt with the rule-based schema."""
+
+    def invoke(self, prompt: str) -> str:
+        from core.tools import infer_schema_from_stats
+
+        stats_json = prompt.split("DATA STATISTICS:\n", 1)[1].rsplit("\n\nOutput the complete JSON schema:", 1)[0]
+        return json.dumps(infer_schema_from_stats(json.loads(stats_json)))
+
+
+def reset_caches(workdir: str) -> None:
+    """Points the model and schema caches at empty directories so the next run is cold."""
+    from core.model_cache import MODEL_CACHE
+    from core.schema_cache import SCHEMA_CACHE
+
+    MODEL_CACHE.cache_dir = tempfile.mkdtemp(prefix="model_cache_", dir=workdir)
+    SCHEMA_CACHE.cache_dir = tempfile.mkdtemp(prefix="schema_cache_", dir=workdir)
+    SCHEMA_CACHE._memory.clear()
+
+
+# --- Measurement ---
+def measure(fn: Callable[[], Any], repeat: int, rows: int, setup: Callable[[], None] = None) -> Dict[str, Any]:
+    """Runs `fn` `repeat` times and summarizes wall/CPU time, throughput and peak RSS growth."""
+    walls: List[float] = []
+    cpus: List[float] = []
+    rss_delta = 0
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        rss_before = peak_rss_bytes()
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        fn()
+        walls.append(time.perf_counter() - started)
+        cpus.append(time.process_time() - cpu_started)
+        rss_delta = max(rss_delta, peak_rss_bytes() - rss_before)
+
+    median = statistics.median(walls)
+    return {
+        'median_s': median,
+        'min_s': min(walls),
+        'max_s': max(walls),
+        'cpu_s': statistics.median(cpus),
+        'rows': rows,
+        'rows_per_sec': rows / median if median > 0 else None,
+        'peak_rss_delta_bytes': rss_delta,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    import nodes.schema_inference as schema_inference_node
+    from core.artifacts import ARTIFACT_STORE
+    from core.sampling import iter_synthetic_batches
+    from core.tools import analyze_dataframe_stats, fit_synthesizer
+    from main_graph import build_generation_graph
+    from nodes.data_loader import data_loader
+    from nodes.data_saver import data_saver
+    from nodes.quality_check import quality_check
+
+    schema_inference_node.get_llm = lambda: StubLLM()
+
+    input_path = os.path.join(workdir, "bench_input.csv")
+    make_input(args.rows, args.numeric, args.categorical, args.datetime, args.boolean, args.seed).to_csv(
+        input_path, index=False)
+
+    state: Dict[str, Any] = {
+        'project_id': "BENCH", 'run_id': "bench", 'input_file_path': input_path, 'original_data_ref': None,
+        'inferred_schema': {}, 'user_constraints': [], 'metadata': None,
+        'num_rows': args.synth_rows, 'synthesizer': args.synthesizer, 'batch_size': args.batch_size,
+        'workers': 1, 'seed': args.seed,
+        'output_format': args.output_format, 'synthetic_data_ref': None, 'streamed_output_path': None,
+        'quality_report': {}, 'output_path': None, 'output_row_count': 0,
+        'status': 'Initialized', 'log_messages': [], 'error_message': None, 'node_metrics': [],
+    }
+    stages: Dict[str, Any] = {}
+    reset_caches(workdir)
+
+    # 1. Loading
+    stages['data_loader'] = measure(lambda: state.update(data_loader(state)), args.repeat, args.rows)
+    df = ARTIFACT_STORE.get(state['original_data_ref'])
+
+    # 2. Profiling (the statistics sent to the LLM)
+    stages['analyze_dataframe_stats'] = measure(lambda: analyze_dataframe_stats.invoke({'df': df}),
+                                                args.repeat, args.rows)
+
+    # 3. Schema inference (stubbed LLM, cold schema cache) provides the shared metadata
+    state.update(schema_inference_node.schema_inference(state))
+    metadata = state['metadata']
+
+    # 4. Synthesis: fit on a cold model cache, then sample
+    fitted: Dict[str, Any] = {}
+    stages['synthesizer_fit'] = measure(
+        lambda: fitted.update(model=fit_synthesizer(df, metadata, args.synthesizer)[0]),
+        args.repeat, args.rows, setup=lambda: reset_caches(workdir))
+    synthesizer = fitted['model']
+    sampled: Dict[str, Any] = {}
+    stages['synthesizer_sample'] = measure(
+        lambda: sampled.update(df=pd.concat(list(iter_synthetic_batches(synthesizer, args.synth_rows,
+                                                                         args.batch_size, args.seed)),
+                                            ignore_index=True)),
+        args.repeat, args.synth_rows)
+    state.update(synthetic_data_ref=ARTIFACT_STORE.put(state['run_id'], 'synthetic', sampled['df']),
+                 status='Data Generated')
+
+    # 5. Validation and persistence
+    stages['quality_check'] = measure(lambda: quality_check(dict(state)), args.repeat, args.synth_rows)
+    stages['data_saver'] = measure(lambda: data_saver(dict(state)), args.repeat, args.synth_rows)
+
+    # 6. Full graph, cold (empty model/schema caches) and warm (second run on the same input)
+    graph = build_generation_graph()
+    initial_state = {**state, 'original_data_ref': None, 'synthetic_data_ref': None, 'metadata': None,
+                     'inferred_schema': {}, 'status': 'Initialized', 'log_messages': [], 'node_metrics': []}
+    final: Dict[str, Any] = {}
+    stages['graph_cold'] = measure(lambda: final.update(graph.invoke(dict(initial_state))),
+                                   args.repeat, args.synth_rows, setup=lambda: reset_caches(workdir))
+    stages['graph_cold']['status'] = final.get('status')
+    stages['graph_cold']['node_seconds'] = {m['node']: m['wall_seconds'] for m in final.get('node_metrics', [])}
+    stages['graph_warm'] = measure(lambda: final.update(graph.invoke(dict(initial_state))),
+                                   args.repeat, args.synth_rows)
+    stages['graph_warm']['node_seconds'] = {m['node']: m['wall_seconds'] for m in final.get('node_metrics', [])}
+
+    import sdv
+    return {
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'sdv': sdv.__version__,
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'keep')},
+        'input': {'rows': args.rows, 'columns': int(df.shape[1]),
+                  'dtypes': {str(column): str(dtype) for column, dtype in df.dtypes.items()}},
+        'stages': stages,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000, help="Rows in the generated input.")
+    parser.add_argument("--numeric", type=int, default=6, help="Numeric columns (alternating int/float).")
+    parser.add_argument("--categorical", type=int, default=3, help="Categorical columns.")
+    parser.add_argument("--datetime", type=int, default=1, help="Date columns.")
+    parser.add_argument("--boolean", type=int, default=1, help="Boolean columns.")
+    parser.add_argument("--synth-rows", type=int, default=20_000, help="Synthetic rows to sample.")
+    parser.add_argument("--synthesizer", default="gaussian_copula", help="Registered synthesizer to benchmark.")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Sampling batch size.")
+    parser.add_argument("--output-format", default="csv", choices=["csv", "parquet", "feather"])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the median is reported.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout.")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary working directory.")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    cwd = os.getcwd()
+    output = os.path.abspath(args.output) if args.output else None
+    # Outputs and caches are written relative to the working directory: keep them out of the project
+    os.chdir(workdir)
+    try:
+        results = run_benchmark(args, workdir)
+    finally:
+        os.chdir(cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    payload = json.dumps(results, indent=2, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Startup-time benchmark: measures how long a fresh interpreter takes to import
+`main_graph` and `api_server`, so regressions in import cost (e.g. a heavy
+dependency moved back to module level) show up as a number.
+
+Usage (from the project root):
+    python benchmarks/bench_startup.py [--repeat 5] [--top 10] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["main_graph", "api_server"]
+
+
+def time_import(module: str) -> float:
+    """Wall time of `import module` in a fresh interpreter, including interpreter start."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-W", "ignore", "-c", f"import {module}"],
+                   cwd=PROJECT_ROOT, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def slowest_imports(module: str, top: int) -> List[Dict[str, Any]]:
+    """Top-N packages by cumulative import time, parsed from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-W", "ignore", "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_ROOT, check=True, capture_output=True, text=True)
+
+    # Keep the largest cumulative time seen per top-level package (e.g. 'sdv', 'langgraph');
+    # nested entries are already included in their parent's cumulative figure.
+    per_package: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        package = name.strip().split(".")[0]
+        if package != module:
+            per_package[package] = max(per_package.get(package, 0.0), int(cumulative_us) / 1000)
+
+    ranked = sorted(per_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{'package': package, 'cumulative_ms': ms} for package, ms in ranked]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh-interpreter imports per module.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to report per module.")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout.")
+    args = parser.parse_args()
+
+    baseline = [time_import("sys") for _ in range(args.repeat)]
+    results = {
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'interpreter_startup_s': statistics.median(baseline),
+        'modules': {},
+    }
+    for module in MODULES:
+        samples = [time_import(module) for _ in range(args.repeat)]
+        results['modules'][module] = {
+            'median_s': statistics.median(samples),
+            'min_s': min(samples),
+            'max_s': max(samples),
+            'import_only_s': statistics.median(samples) - results['interpreter_startup_s'],
+            'slowest_imports': slowest_imports(module, args.top),
+        }
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import pickle
+import shutil
+import uuid
+from typing import Any, Dict, Optional
+
+from pandas import DataFrame
+
+# --- Artifact Store Configuration ---
+# Graph state carries small references to tables instead of the DataFrames
+# themselves: each table is written once as an uncompressed Arrow IPC file and
+# memory-mapped by the nodes that read it, so state transitions stay O(1), state
+# snapshots don't pin table memory, and a run's tables go away with release().
+ARTIFACT_DIR = os.environ.get("SYNTH_ARTIFACT_DIR", "artifacts")
+
+# A reference: {'path': str, 'rows': int, 'columns': int}
+ArtifactRef = Dict[str, Any]
+
+
+def run_id_for(state: Dict[str, Any]) -> str:
+    """Artifact namespace of a run: its run_id, or the project id for callers that set none."""
+    return state.get('run_id') or state['project_id']
+
+
+class ArtifactStore:
+    """Per-run table files under artifact_dir/<run_id>/, addressed by ArtifactRef."""
+
+    def __init__(self, artifact_dir: str = ARTIFACT_DIR):
+        self.artifact_dir = artifact_dir
+
+    def put(self, run_id: str, name: str, df: DataFrame) -> ArtifactRef:
+        """Writes `df` under the run and returns its reference."""
+        import pyarrow as pa
+
+        directory = os.path.join(self.artifact_dir, str(run_id))
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"{name}-{uuid.uuid4().hex[:8]}")
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            path = f"{stem}.arrow"
+            with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        except (pa.ArrowException, TypeError, ValueError):
+            # Columns Arrow can't type (e.g. mixed Python objects) are kept exactly via pickle
+            path = f"{stem}.pkl"
+            with open(path, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return {'path': path, 'rows': int(df.shape[0]), 'columns': int(df.shape[1])}
+
+    def get(self, ref: Optional[ArtifactRef]) -> Optional[DataFrame]:
+        """Loads the table behind `ref` (memory-mapped for Arrow files); None for no reference."""
+        if not ref:
+            return None
+        path = ref['path']
+        if path.endswith('.pkl'):
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+
+        import pyarrow as pa
+        with pa.memory_map(path, 'r') as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    def release(self, run_id: str) -> None:
+        """Deletes every table written for the run."""
+        shutil.rmtree(os.path.join(self.artifact_dir, str(run_id)), ignore_errors=True)
+
+
+# Shared process-wide store used by the graph nodes
+ARTIFACT_STORE = ArtifactStore()
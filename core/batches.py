@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from core.jobs import TERMINAL_JOB_STATES, Job, JobManager, QueueFullError
+
+# --- Batch Configuration ---
+# A batch is a list of pipeline runs fed into the shared JobManager by one feeder
+# thread. The feeder keeps at most `max_workers` of the batch's jobs queued or running,
+# so a large batch streams through the same warm worker pool (compiled graph, LLM
+# client, schema and model caches) without filling the queue interactive runs use.
+MAX_BATCH_ITEMS = int(os.environ.get("SYNTH_MAX_BATCH_ITEMS", 100))
+MAX_RETAINED_BATCHES = 50  # Finished batches kept for status lookups before being forgotten
+FEEDER_POLL_S = 1.0  # Upper bound on the feeder's wait for a slot freed by another client's job
+
+
+class Batch:
+    """Runs submitted together; item i is `items[i]` (the run's params) and `jobs[i]` once submitted."""
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.batch_id = uuid.uuid4().hex
+        self.items = items
+        self.jobs: List[Optional[Job]] = [None] * len(items)
+        self.submit_errors: List[Optional[str]] = [None] * len(items)
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+
+    def item_state(self, index: int) -> str:
+        job = self.jobs[index]
+        if job is not None:
+            return job.status
+        if self.submit_errors[index]:
+            return 'failed'
+        return 'cancelled' if self.cancel_event.is_set() else 'pending'
+
+    @property
+    def status(self) -> str:
+        if self.finished_at is None:
+            return 'running'
+        return 'cancelled' if self.cancel_event.is_set() else 'completed'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Aggregate status: counts by state, per-item outcomes and throughput so far."""
+        now = self.finished_at or time.time()
+        counts: Dict[str, int] = {}
+        items = []
+        rows_generated = 0
+        for index, params in enumerate(self.items):
+            state = self.item_state(index)
+            counts[state] = counts.get(state, 0) + 1
+            job = self.jobs[index]
+            result = job.result if job is not None else {}
+            rows_generated += result.get('synthetic_row_count') or 0
+            run_s = (job.finished_at or now) - job.started_at if job is not None and job.started_at else None
+            items.append({
+                'index': index,
+                'project_id': params['project_id'],
+                'input_file_path': params['input_file_path'],
+                'job_id': job.job_id if job is not None else None,
+                'state': state,
+                'status': result.get('status'),
+                'quality_score': result.get('quality_score'),
+                'synthetic_row_count': result.get('synthetic_row_count', 0),
+                'error_message': (job.error_message or result.get('error_message')) if job is not None
+                else self.submit_errors[index],
+                'run_s': run_s,
+            })
+
+        elapsed_s = now - self.submitted_at
+        finished = sum(counts.get(state, 0) for state in TERMINAL_JOB_STATES)
+        return {
+            'batch_id': self.batch_id,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'finished_at': self.finished_at,
+            'counts': counts,
+            'items': items,
+            'throughput': {
+                'elapsed_s': elapsed_s,
+                'tables_finished': finished,
+                'rows_generated': rows_generated,
+                'tables_per_minute': finished * 60 / elapsed_s if elapsed_s > 0 else 0.0,
+                'rows_per_s': rows_generated / elapsed_s if elapsed_s > 0 else 0.0,
+            },
+        }
+
+
+class BatchManager:
+    """
+    Feeds batches into a JobManager. `submit_run(project_id, params)` enqueues one run
+    (raising QueueFullError when the queue is saturated, in which case the feeder retries
+    once a slot frees up) and `cancel_run(job_id)` cancels one.
+    """
+
+    def __init__(self, job_manager: JobManager, submit_run: Callable[[str, Dict[str, Any]], Job],
+                 cancel_run: Callable[[str], Any], prepare: Optional[Callable[[], None]] = None,
+                 max_items: int = MAX_BATCH_ITEMS):
+        self.job_manager = job_manager
+        self.submit_run = submit_run
+        self.cancel_run = cancel_run
+        self.prepare = prepare
+        self.max_items = max_items
+        self._batches: "OrderedDict[str, Batch]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, items: List[Dict[str, Any]]) -> Batch:
+        """Starts feeding a batch of run params (each with 'project_id') and returns immediately."""
+        if not items:
+            raise ValueError("A batch needs at least one item.")
+        if len(items) > self.max_items:
+            raise ValueError(f"A batch holds at most {self.max_items} items, got {len(items)}.")
+
+        batch = Batch(items)
+        with self._lock:
+            self._batches[batch.batch_id] = batch
+            self._forget_finished()
+        threading.Thread(target=self._feed, args=(batch,), name=f"batch-{batch.batch_id[:8]}", daemon=True).start()
+        return batch
+
+    def _feed(self, batch: Batch) -> None:
+        try:
+            if self.prepare is not None:
+                # Load libraries and the LLM client once, before the first item needs them
+                try:
+                    self.prepare()
+                except Exception:
+                    # Items still run; the first one pays for loading instead
+                    pass
+            for index, params in enumerate(batch.items):
+                run_params = {key: value for key, value in params.items() if key != 'project_id'}
+                while not batch.cancel_event.is_set():
+                    in_flight = [job.future for job in batch.jobs if job is not None and job.future is not None
+                                 and job.status not in TERMINAL_JOB_STATES]
+                    if len(in_flight) < self.job_manager.max_workers:
+                        try:
+                            batch.jobs[index] = self.submit_run(params['project_id'], run_params)
+                            if batch.cancel_event.is_set():
+                                # cancel() ran while this item was being submitted
+                                self.cancel_run(batch.jobs[index].job_id)
+                            break
+                        except QueueFullError:
+                            pass
+                        except Exception as e:
+                            batch.submit_errors[index] = str(e)
+                            break
+                    wait(in_flight, timeout=FEEDER_POLL_S, return_when=FIRST_COMPLETED)
+                if batch.cancel_event.is_set():
+                    break
+
+            futures = [job.future for job in batch.jobs if job is not None and job.future is not None]
+            wait(futures)
+        finally:
+            batch.finished_at = time.time()
+
+    def get(self, batch_id: str) -> Optional[Batch]:
+        return self._batches.get(batch_id)
+
+    def cancel(self, batch_id: str) -> Optional[Batch]:
+        """Stops submitting the batch's remaining items and cancels its queued and running jobs."""
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            return None
+        batch.cancel_event.set()
+        for job in list(batch.jobs):
+            if job is not None and job.status not in TERMINAL_JOB_STATES:
+                self.cancel_run(job.job_id)
+        return batch
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for batch in list(self._batches.values()):
+            counts[batch.status] = counts.get(batch.status, 0) + 1
+        return {'max_items': self.max_items, 'batches': counts}
+
+    def _forget_finished(self) -> None:
+        finished = [batch_id for batch_id, batch in self._batches.items() if batch.finished_at is not None]
+        for batch_id in finished[:max(0, len(self._batches) - MAX_RETAINED_BATCHES)]:
+            del self._batches[batch_id]
@@ -0,0 +1,233 @@
+import functools
+import hashlib
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import shutil
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.artifacts import ARTIFACT_STORE, run_id_for
+from core.sinks import DEFAULT_OUTPUT_FORMAT, output_path_for, partial_path_for
+from core.uploads import UPLOAD_DIR
+
+# --- Checkpoint Configuration ---
+# With checkpointing enabled, every completed node's output is stored in SQLite under
+# a key built from the input file's content hash and the run parameters that node and
+# its upstream nodes depend on. A retried or resumed run restores outputs node by node
+# and executes from the first node whose key (or referenced files) is missing, so a
+# re-validation with a new quality threshold reuses the already-sampled data, streamed
+# outputs included (see Streamed Outputs below).
+CHECKPOINT_DB = os.environ.get("SYNTH_CHECKPOINT_DB", "checkpoints.sqlite3")
+CHECKPOINT_MAX_AGE_S = float(os.environ.get("SYNTH_CHECKPOINT_MAX_AGE_S", 7 * 24 * 3600))
+CHECKPOINT_RUN_PREFIX = "checkpoint-"
+
+# Parameters each node's output depends on, in graph order; a node's key covers its
+# own parameters and those of every node before it. data_saver is not checkpointed:
+# it always publishes, since the project's output file may have changed since.
+NODE_PARAMS = (
+    ('data_loader', ('load_engine', 'load_sample_rows', 'incremental', 'seed')),
+    ('schema_inference', ()),
+    ('model_fitting', ('parallel', 'synthesizer')),
+    ('data_generation', ('synthesizer', 'num_rows', 'batch_size', 'workers', 'output_format', 'user_constraints',
+                         'project_id')),
+    ('quality_check', ('quality_mode', 'quality_row_budget', 'quality_max_column_pairs', 'quality_time_budget_s',
+                       'quality_threshold')),
+)
+_CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}$")
+_fingerprints: Dict[Tuple[str, int, int], str] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def input_fingerprint(path: str) -> str:
+    """SHA-256 of an input file, cached by (path, size, mtime); uploads are already named by it."""
+    path = os.path.abspath(path)
+    stem, _ = os.path.splitext(os.path.basename(path))
+    if _CONTENT_ADDRESSED.match(stem) and os.path.dirname(path) == os.path.abspath(UPLOAD_DIR):
+        return stem
+
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime_ns)
+    with _fingerprints_lock:
+        if cache_key in _fingerprints:
+            return _fingerprints[cache_key]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    with _fingerprints_lock:
+        _fingerprints[cache_key] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def checkpoint_run_id(path: str) -> str:
+    """Artifact namespace shared by checkpointed runs of one input, kept after the run ends."""
+    return f"{CHECKPOINT_RUN_PREFIX}{input_fingerprint(path)[:16]}"
+
+
+def node_key(name: str, state: Dict[str, Any]) -> str:
+    """Checkpoint key of a node's output for this input and these run parameters."""
+    params = {}
+    for node, keys in NODE_PARAMS:
+        params.update({key: state.get(key) for key in keys})
+        if node == name:
+            break
+    payload = json.dumps([input_fingerprint(state['input_file_path']), name, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# Output keys that refer to files: stored tables (ArtifactRef) and a retained streamed output
+_TABLE_REF_KEYS = ('original_data_ref', 'synthetic_data_ref')
+
+
+def _file_stamps(update: Dict[str, Any]) -> Dict[str, Tuple[int, int]]:
+    """(size, mtime) of every file an output refers to."""
+    paths = [update[key]['path'] for key in _TABLE_REF_KEYS if update.get(key)]
+    if update.get('streamed_output_path'):
+        paths.append(update['streamed_output_path'])
+    stamps = {}
+    for path in paths:
+        stat = os.stat(path)
+        stamps[path] = (stat.st_size, stat.st_mtime_ns)
+    return stamps
+
+
+def _files_unchanged(stamps: Dict[str, Tuple[int, int]]) -> bool:
+    """Whether the files an output referred to are still there and untouched (not published or rewritten)."""
+    try:
+        return all((stat.st_size, stat.st_mtime_ns) == stamp
+                   for stat, stamp in ((os.stat(path), stamp) for path, stamp in stamps.items()))
+    except OSError:
+        return False
+
+
+# --- Streamed Outputs ---
+# data_saver publishes a streamed output by moving its '.partial' file into place, so
+# a checkpoint keeps its own hard link (a copy across filesystems) to the sampled file
+# in the artifact namespace, and a restore hands the run a fresh partial linked to it.
+def _link_or_copy(source: str, target: str) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _retain_streamed_output(update: Dict[str, Any], namespace: str) -> Dict[str, Any]:
+    """The update to store, referring to the checkpoint's own link to the streamed output."""
+    streamed_output_path = update.get('streamed_output_path')
+    if not streamed_output_path:
+        return update
+    directory = os.path.join(ARTIFACT_STORE.artifact_dir, namespace)
+    os.makedirs(directory, exist_ok=True)
+    retained = os.path.join(directory, os.path.basename(streamed_output_path))
+    _link_or_copy(streamed_output_path, retained)
+    return {**update, 'streamed_output_path': retained}
+
+
+def _restore_streamed_output(output: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
+    """The restored output, with a new partial file of the project's output for data_saver to publish."""
+    retained = output.get('streamed_output_path')
+    if not retained:
+        return output
+    partial = partial_path_for(output_path_for(state['project_id'], state.get('output_format') or DEFAULT_OUTPUT_FORMAT))
+    _link_or_copy(retained, partial)
+    return {**output, 'streamed_output_path': partial}
+
+
+class CheckpointStore:
+    """SQLite table of pickled node outputs keyed by node_key()."""
+
+    def __init__(self, db_path: str = CHECKPOINT_DB, max_age_s: float = CHECKPOINT_MAX_AGE_S):
+        self.db_path = db_path
+        self.max_age_s = max_age_s
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            with self._lock:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS node_outputs ("
+                    " key TEXT PRIMARY KEY, node TEXT NOT NULL, namespace TEXT NOT NULL,"
+                    " output BLOB NOT NULL, created_at REAL NOT NULL)")
+                self._initialized = True
+        return connection
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """The stored output and when it was stored, or None when missing or its files changed."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT output, created_at FROM node_outputs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        output, stamps = pickle.loads(row[0])
+        return (output, row[1]) if _files_unchanged(stamps) else None
+
+    def put(self, key: str, node: str, namespace: str, output: Dict[str, Any]) -> None:
+        """Stores a node's output; its tables and streamed output stay in the artifact namespace until it expires."""
+        blob = pickle.dumps((output, _file_stamps(output)), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO node_outputs (key, node, namespace, output, created_at)"
+                " VALUES (?, ?, ?, ?, ?)", (key, node, namespace, blob, time.time()))
+        self.prune()
+
+    def prune(self) -> None:
+        """Drops expired outputs, and the artifacts of inputs no longer referenced by any output."""
+        cutoff = time.time() - self.max_age_s
+        with self._connect() as connection:
+            expired = {row[0] for row in connection.execute(
+                "SELECT DISTINCT namespace FROM node_outputs WHERE created_at < ?", (cutoff,))}
+            if not expired:
+                return
+            connection.execute("DELETE FROM node_outputs WHERE created_at < ?", (cutoff,))
+            live = {row[0] for row in connection.execute("SELECT DISTINCT namespace FROM node_outputs")}
+        for namespace in expired - live:
+            ARTIFACT_STORE.release(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        if not os.path.exists(self.db_path):
+            return {'entries': 0, 'nodes': {}}
+        with self._connect() as connection:
+            nodes = dict(connection.execute("SELECT node, COUNT(*) FROM node_outputs GROUP BY node").fetchall())
+        return {'entries': sum(nodes.values()), 'nodes': nodes}
+
+
+# Shared process-wide checkpoint store
+CHECKPOINTS = CheckpointStore()
+
+
+def checkpoint_node(name: str, node: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    """
+    Wraps a LangGraph node so that, for runs with state['checkpoint'] set, its output
+    is restored from the checkpoint store when every upstream node was restored too
+    and the files it refers to are unchanged, and stored after it completes otherwise.
+    Executed nodes are appended to state['executed_nodes'], which turns restoring
+    off for everything downstream of them.
+    """
+
+    @functools.wraps(node)
+    def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        if not state.get('checkpoint'):
+            return node(state)
+
+        key = node_key(name, state)
+        if not state.get('executed_nodes'):
+            restored = CHECKPOINTS.get(key)
+            if restored is not None:
+                restored, stored_at = restored
+                restored = _restore_streamed_output(restored, state)
+                stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stored_at))
+                logs = [f"Checkpoint: restored {name} output stored {stamp}."] + restored.get('log_messages', [])
+                return {**restored, 'log_messages': logs}
+
+        update = node(state)
+        if update.get('status') != 'Error':
+            CHECKPOINTS.put(key, name, run_id_for(state), _retain_streamed_output(update, run_id_for(state)))
+        return {**update, 'executed_nodes': [name]}
+
+    return wrapper
@@ -0,0 +1,216 @@
+import operator
+import re
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+# --- Constraint Syntax ---
+# Each entry of user_constraints is one rule over the output columns:
+#   Age >= 18                      bound on a column
+#   18 <= Age <= 65                range (two bounds)
+#   start_date <= end_date         inequality between two columns
+#   City in [Paris, 'New York']    allowed category set ('not in' for a forbidden one)
+# Columns with spaces or operator characters are written in backticks (`Annual Income`);
+# quoted operands are always literals; bare True/False are booleans and None/null is the
+# null value, and other bare words that are not columns are strings.
+# As in SQL CHECK constraints, a null value never violates a rule.
+_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    '<=': operator.le, '>=': operator.ge, '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '>': operator.gt,
+}
+_FLIPPED = {'<=': '>=', '>=': '<=', '<': '>', '>': '<', '==': '==', '!=': '!='}
+_COMPARISON_SPLIT = re.compile(r"(<=|>=|==|!=|<|>)")
+_KEYWORDS = {'true': True, 'false': False, 'none': None, 'null': None}
+_MEMBERSHIP = re.compile(r"^\s*(?P<column>`[^`]+`|\S+)\s+(?P<negated>not\s+)?in\s*[\[(](?P<items>.*)[\])]\s*$",
+                         re.IGNORECASE)
+
+
+class ConstraintError(ValueError):
+    """Raised for a constraint that cannot be parsed, names unknown columns, or cannot be met."""
+
+
+def _unquote(token: str) -> str:
+    return token[1:-1] if len(token) >= 2 and token[0] == token[-1] and token[0] in "'\"`" else token
+
+
+def _literal(token: str) -> Any:
+    token = token.strip()
+    if token[:1] in "'\"":
+        return _unquote(token)
+    if token.lower() in _KEYWORDS:
+        return _KEYWORDS[token.lower()]
+    try:
+        return float(token) if any(c in token for c in '.eE') else int(token)
+    except ValueError:
+        return token
+
+
+class _Operand:
+    def __init__(self, token: str, columns: Sequence[str]):
+        token = token.strip()
+        if not token:
+            raise ConstraintError("Missing operand.")
+        self.token = token
+        self.column = None
+        self.value = None
+        if token.startswith('`'):
+            self.column = _unquote(token)
+        elif token[:1] not in "'\"" and token in columns:
+            self.column = token
+        else:
+            self.value = _literal(token)
+        if self.column is not None and self.column not in columns:
+            raise ConstraintError(f"Unknown column '{self.column}'.")
+
+
+def _null_mask(series: pd.Series) -> np.ndarray:
+    return series.isna().to_numpy()
+
+
+def _as_float(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(np.float64, na_value=np.nan)
+    # Numbers stored as text (or categories of numbers) are compared numerically
+    return pd.to_numeric(series.astype(object), errors='coerce').to_numpy(np.float64)
+
+
+def _as_bool(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(bool)
+    # Booleans stored as text ('True', 'false') or as 0/1 numbers
+    return series.astype(object).map(lambda v: str(v).strip().lower() in ('true', '1', '1.0')).to_numpy(bool)
+
+
+def _with_literal(series: pd.Series, value: Any):
+    """Column values and the literal in forms NumPy can compare."""
+    if isinstance(value, bool):
+        return _as_bool(series), value
+    if pd.api.types.is_datetime64_any_dtype(series) and isinstance(value, str):
+        return series.to_numpy(), np.datetime64(pd.Timestamp(value))
+    if isinstance(value, (int, float)):
+        return _as_float(series), value
+    return series.astype(object).to_numpy(), value
+
+
+def _with_column(left: pd.Series, right: pd.Series):
+    """Values of two columns in forms NumPy can compare."""
+    if pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right):
+        return _as_float(left), _as_float(right)
+    if pd.api.types.is_datetime64_any_dtype(left) or pd.api.types.is_datetime64_any_dtype(right):
+        return (pd.to_datetime(left, errors='coerce').to_numpy(),
+                pd.to_datetime(right, errors='coerce').to_numpy())
+    return left.astype(object).to_numpy(), right.astype(object).to_numpy()
+
+
+class Comparison:
+    """`left op right` where at least one side is a column."""
+
+    def __init__(self, left: _Operand, op: str, right: _Operand, text: str):
+        if left.column is None and right.column is None:
+            # A bare word on either side was most likely meant as a column name
+            unknown = [operand.token for operand in (left, right)
+                       if isinstance(operand.value, str) and operand.token[:1] not in "'\""]
+            if unknown:
+                raise ConstraintError(f"Unknown column '{unknown[0]}' in '{text}'.")
+            raise ConstraintError(f"'{text}' does not reference any column.")
+        if left.column is None:
+            left, op, right = right, _FLIPPED[op], left
+        self.column, self.op, self.right, self.text = left.column, op, right, text
+        self.columns = [left.column] + ([right.column] if right.column is not None else [])
+
+    def mask(self, batch: DataFrame) -> np.ndarray:
+        series = batch[self.column]
+        nulls = _null_mask(series)
+        if self.right.column is not None:
+            other = batch[self.right.column]
+            nulls |= _null_mask(other)
+            left, right = _with_column(series, other)
+        else:
+            left, right = _with_literal(series, self.right.value)
+
+        # Only non-null rows are compared; nulls pass
+        passes = np.ones(batch.shape[0], dtype=bool)
+        valid = ~nulls
+        if valid.any():
+            try:
+                with np.errstate(invalid='ignore'):
+                    passes[valid] = _OPERATORS[self.op](
+                        left[valid], right[valid] if isinstance(right, np.ndarray) else right)
+            except TypeError as e:
+                raise ConstraintError(f"Cannot evaluate '{self.text}': {e}")
+        return passes
+
+
+class Membership:
+    """`column in [...]` / `column not in [...]`."""
+
+    def __init__(self, column: str, values: List[Any], negated: bool, text: str):
+        self.column, self.values, self.negated, self.text = column, values, negated, text
+        self.columns = [column]
+
+    def mask(self, batch: DataFrame) -> np.ndarray:
+        series = batch[self.column]
+        values = list(self.values)
+        if not pd.api.types.is_numeric_dtype(series):
+            # Bare numbers in a set still match categories stored as text
+            values += [str(value) for value in self.values if not isinstance(value, str)]
+        inside = series.isin(values).to_numpy()
+        return (~inside if self.negated else inside) | _null_mask(series)
+
+
+def parse_constraint(text: str, columns: Sequence[str]) -> List[Any]:
+    """Parses one constraint string into its rules (a two-sided range yields two)."""
+    membership = _MEMBERSHIP.match(text)
+    if membership:
+        column = _Operand(membership.group('column'), columns)
+        if column.column is None:
+            raise ConstraintError(f"Unknown column '{membership.group('column')}' in '{text}'.")
+        items = [item for item in re.findall(r"'[^']*'|\"[^\"]*\"|[^,]+", membership.group('items')) if item.strip()]
+        if not items:
+            raise ConstraintError(f"'{text}' has an empty value set.")
+        return [Membership(column.column, [_literal(item) for item in items],
+                           bool(membership.group('negated')), text)]
+
+    parts = _COMPARISON_SPLIT.split(text)
+    if len(parts) not in (3, 5):
+        raise ConstraintError(f"Cannot parse constraint '{text}'. Use e.g. 'Age >= 18', '0 <= Age <= 120', "
+                              f"'start <= end' or 'City in [A, B]'.")
+    try:
+        operands = [_Operand(token, columns) for token in parts[0::2]]
+    except ConstraintError as e:
+        raise ConstraintError(f"{e} In constraint '{text}'.")
+    ops = parts[1::2]
+    return [Comparison(operands[i], ops[i], operands[i + 1], text) for i in range(len(ops))]
+
+
+class ConstraintSet:
+    """Compiled user constraints; mask() evaluates all of them on a batch with vectorized operations."""
+
+    def __init__(self, rules: List[Any], texts: List[str]):
+        self.rules = rules
+        self.texts = texts
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def mask(self, batch: DataFrame) -> np.ndarray:
+        passes = np.ones(batch.shape[0], dtype=bool)
+        for rule in self.rules:
+            passes &= rule.mask(batch)
+        return passes
+
+    def apply(self, batch: DataFrame) -> DataFrame:
+        """Rows of `batch` satisfying every constraint."""
+        if not self.rules:
+            return batch
+        passes = self.mask(batch)
+        return batch if passes.all() else batch[passes]
+
+
+def compile_constraints(texts: Sequence[str] | None, columns: Sequence[str]) -> ConstraintSet:
+    """Parses and validates constraint strings against the table's columns; blank entries are ignored."""
+    texts = [text.strip() for text in texts or [] if text and text.strip()]
+    rules = [rule for text in texts for rule in parse_constraint(text, [str(c) for c in columns])]
+    return ConstraintSet(rules, texts)
@@ -1,24 +1,66 @@
-from typing import TypedDict, List, Dict, Any, Union
-from pandas import DataFrame
+import operator
+from typing import Annotated, TypedDict, List, Dict, Any, Union
+
+from core.artifacts import ArtifactRef
 
 # Define the Agent's shared memory (State)
+# Tables live in the artifact store (core/artifacts.py); the state only holds references.
+# List fields marked with operator.add are reducers: nodes return only their new entries.
 class GenerationState(TypedDict):
 
     # 1. Input/Context
     project_id: str
+    run_id: str  # Namespace of this run's artifacts, released when the run ends
+    job_id: str | None  # Queue job executing the run; long nodes check it for cancellation (core/jobs.py)
     input_file_path: str
-    original_data: DataFrame
+    original_data_ref: ArtifactRef | None  # Loaded input table
+    load_engine: str  # 'pandas' or 'pyarrow' (multi-threaded parse), see core/loader.py
+    load_sample_rows: int | None  # Keep only a reservoir sample of this many input rows
+    load_stats: Dict[str, Any]  # Rows read, rows/sec and peak RSS of the load
+    incremental: bool  # Detect inputs that only append rows to a fitted version and update its model
+    append_base: Dict[str, Any] | None  # Dataset registry record the input extends (see core/incremental.py)
+    data_stats: str | None  # analyze_dataframe_stats summary, profiled once by data_loader for both schema paths
 
     # 2. Schema and Constraints
     inferred_schema: Dict[str, Any]
     user_constraints: List[str]
+    metadata: Dict[str, Any] | None  # SDV metadata dict built from inferred_schema, shared by synthesis and validation
+
+    # 2b. Generation Parameters
+    num_rows: int
+    synthesizer: str  # Registry name, see core/synthesizers.py ('fast' for previews)
+    parallel: bool  # Fit the synthesizer concurrently with schema inference (nodes/model_fitting.py)
+    prefit_metadata: Dict[str, Any] | None  # Metadata the concurrent fit used
+    prefit_error: str | None  # Why the concurrent fit failed, if it did
+    batch_size: int
+    workers: int  # >1 samples batches across a process pool
+    seed: int | None  # Fixes output for a given (seed, num_rows, batch_size)
+    output_format: str  # 'csv', 'parquet' or 'feather' (see core/sinks.py)
+
+    # 2c. Quality Check Budget (see core/quality.py)
+    quality_mode: str  # 'auto', 'full' or 'sampled'
+    quality_row_budget: int
+    quality_max_column_pairs: int
+    quality_time_budget_s: float
+    quality_threshold: float | None  # Minimum Overall Score for approval; None approves any score
 
     # 3. Output Data & Fidelity
-    synthetic_data: DataFrame
+    synthetic_data_ref: ArtifactRef | None  # Full output, or the first batch when the run was streamed
+    streamed_output_path: str | None  # '.partial' file written batch-by-batch for large runs
     quality_report: Dict[str, Union[str, float]]
+    output_path: str | None  # Published output file, set by data_saver
+    output_row_count: int
 
     # 4. Status & Logging
     status: str
-    log_messages: List[str]
+    log_messages: Annotated[List[str], operator.add]
     error_message: str | None
 
+    # 5. Instrumentation (see core/instrumentation.py)
+    node_metrics: Annotated[List[Dict[str, Any]], operator.add]  # One record per node run: wall/cpu seconds, peak RSS delta, rows in/out
+    profile_nodes: bool  # Dump a cProfile of every node
+
+    # 6. Checkpointing (see core/checkpoints.py)
+    checkpoint: bool  # Store node outputs and restore them on a retried or re-validated run
+    executed_nodes: Annotated[List[str], operator.add]  # Nodes this run executed rather than restored
+
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+# --- Dataset Registry Configuration ---
+# Every fitted input is recorded by its column signature, row count and a digest of
+# its rows. A later input whose leading rows hash to a recorded digest is an
+# append-only extension of that version and can reuse its schema and model.
+DATASET_REGISTRY_DIR = os.environ.get("SYNTH_DATASET_REGISTRY_DIR", "dataset_registry")
+DATASET_REGISTRY_MAX_VERSIONS = 8  # Recorded versions kept per column signature
+
+
+def _normalized(df: DataFrame) -> DataFrame:
+    """Widens numerics so a row hashes the same whatever width the chunked loader picked."""
+    widened = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            widened[column] = series.astype(object)
+        elif pd.api.types.is_bool_dtype(series):
+            widened[column] = series
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+            widened[column] = series.astype(np.int64)
+        elif pd.api.types.is_float_dtype(series):
+            widened[column] = series.astype(np.float64)
+        else:
+            widened[column] = series
+    return pd.DataFrame(widened, index=df.index)
+
+
+def row_hashes(df: DataFrame) -> np.ndarray:
+    """One uint64 hash per row, independent of numeric widths and category encodings."""
+    return pd.util.hash_pandas_object(_normalized(df), index=False).to_numpy()
+
+
+def column_signature(df: DataFrame) -> str:
+    return hashlib.sha256(json.dumps([str(c) for c in df.columns]).encode()).hexdigest()[:16]
+
+
+def prefix_digest(hashes: np.ndarray, rows: int) -> str:
+    return hashlib.sha256(hashes[:rows].tobytes()).hexdigest()
+
+
+class DatasetRegistry:
+    """
+    JSON records of processed inputs (one directory per column signature), each with
+    the inferred schema, SDV metadata and the model cache keys fitted on it.
+    """
+
+    def __init__(self, registry_dir: str = DATASET_REGISTRY_DIR,
+                 max_versions: int = DATASET_REGISTRY_MAX_VERSIONS):
+        self.registry_dir = registry_dir
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+
+    def _versions(self, signature: str) -> List[Dict[str, Any]]:
+        directory = os.path.join(self.registry_dir, signature)
+        records = []
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(directory, name), "r") as f:
+                        records.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return records
+
+    def find_base(self, df: DataFrame, hashes: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the largest recorded version that `df` extends by appending rows
+        (same columns, identical leading rows, strictly more rows), or None.
+        """
+        hashes = row_hashes(df) if hashes is None else hashes
+        candidates = [record for record in self._versions(column_signature(df)) if record['rows'] < len(df)]
+        for record in sorted(candidates, key=lambda r: r['rows'], reverse=True):
+            if record['rows'] > 0 and prefix_digest(hashes, record['rows']) == record['digest']:
+                return record
+        return None
+
+    def record(self, df: DataFrame, model_class: str, model_key: str, metadata: Dict[str, Any],
+               schema: Optional[Dict[str, Any]] = None, hashes: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Records (or extends) the entry for this exact version of the data."""
+        hashes = row_hashes(df) if hashes is None else hashes
+        signature = column_signature(df)
+        digest = prefix_digest(hashes, len(df))
+        directory = os.path.join(self.registry_dir, signature)
+        path = os.path.join(directory, f"{digest}.json")
+
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            try:
+                with open(path, "r") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                record = {'rows': len(df), 'digest': digest, 'models': {}}
+            record['models'][model_class] = model_key
+            record['metadata'] = metadata
+            if schema:
+                record['schema'] = schema
+            record['recorded_at'] = time.time()
+
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(record, f, default=str)
+            os.replace(tmp_path, path)
+            self._evict(directory)
+        return record
+
+    def _evict(self, directory: str) -> None:
+        names = [name for name in os.listdir(directory) if name.endswith(".json")]
+        if len(names) <= self.max_versions:
+            return
+        names.sort(key=lambda name: os.path.getmtime(os.path.join(directory, name)))
+        for name in names[:len(names) - self.max_versions]:
+            os.remove(os.path.join(directory, name))
+
+
+# Shared process-wide registry used by the loader (detection) and synthesis (recording)
+DATASET_REGISTRY = DatasetRegistry()
@@ -0,0 +1,162 @@
+import cProfile
+import functools
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from core.progress import PROGRESS
+
+# --- Instrumentation Configuration ---
+# Every graph node is timed; with profiling enabled (env or the run's profile_nodes
+# flag) each node also runs under cProfile and dumps `<node>.prof` per project,
+# readable with `python -m pstats` or snakeviz.
+PROFILE_NODES = os.environ.get("SYNTH_PROFILE_NODES", "0") == "1"
+PROFILE_DIR = os.environ.get("SYNTH_PROFILE_DIR", "profiles")
+# Histogram buckets (seconds) for node wall time in /metrics
+WALL_TIME_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _rows(ref: Any) -> Optional[int]:
+    """Row count recorded in an artifact reference."""
+    return ref.get('rows') if isinstance(ref, dict) else None
+
+
+def _rows_out(state: Dict[str, Any], update: Dict[str, Any]) -> Optional[int]:
+    """Rows a node produced: published/streamed row counts first, then any table it stored."""
+    if update.get('output_row_count'):
+        return update['output_row_count']
+    if update.get('streamed_output_path'):
+        return state.get('num_rows')
+    for key in ('synthetic_data_ref', 'original_data_ref'):
+        rows = _rows(update.get(key))
+        if rows is not None:
+            return rows
+    return None
+
+
+class NodeMetrics:
+    """Process-wide aggregates of node runs, rendered in Prometheus text format by /metrics."""
+
+    def __init__(self, buckets=WALL_TIME_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            node = self._nodes.setdefault(record['node'], {
+                'runs': 0, 'errors': 0, 'wall_sum': 0.0, 'cpu_sum': 0.0, 'rows_out': 0,
+                'rss_delta_max': 0, 'buckets': [0] * len(self.buckets),
+            })
+            node['runs'] += 1
+            node['errors'] += record['status'] == 'Error'
+            node['wall_sum'] += record['wall_seconds']
+            node['cpu_sum'] += record['cpu_seconds']
+            node['rows_out'] += record['rows_out'] or 0
+            node['rss_delta_max'] = max(node['rss_delta_max'], record['peak_rss_delta_bytes'])
+            for i, bound in enumerate(self.buckets):
+                if record['wall_seconds'] <= bound:
+                    node['buckets'][i] += 1
+
+    def render(self, extra: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus text exposition (version 0.0.4) of the node aggregates plus `extra` gauges."""
+        with self._lock:
+            nodes = {name: dict(values, buckets=list(values['buckets'])) for name, values in self._nodes.items()}
+
+        lines = [
+            "# HELP synth_node_wall_seconds Wall-clock time spent in a pipeline node.",
+            "# TYPE synth_node_wall_seconds histogram",
+        ]
+        for name, node in nodes.items():
+            for bound, count in zip(self.buckets, node['buckets']):
+                lines.append(f'synth_node_wall_seconds_bucket{{node="{name}",le="{bound:g}"}} {count}')
+            lines.append(f'synth_node_wall_seconds_bucket{{node="{name}",le="+Inf"}} {node["runs"]}')
+            lines.append(f'synth_node_wall_seconds_sum{{node="{name}"}} {node["wall_sum"]:.6f}')
+            lines.append(f'synth_node_wall_seconds_count{{node="{name}"}} {node["runs"]}')
+
+        for metric, key, kind, help_text in (
+                ('synth_node_cpu_seconds_total', 'cpu_sum', 'counter', 'CPU time of the thread running a node.'),
+                ('synth_node_errors_total', 'errors', 'counter', 'Node runs that returned an Error status.'),
+                ('synth_node_rows_out_total', 'rows_out', 'counter', 'Rows produced by a node.'),
+                ('synth_node_peak_rss_delta_bytes_max', 'rss_delta_max', 'gauge',
+                 'Largest growth of the process peak RSS during a single node run.')):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, node in nodes.items():
+                lines.append(f'{metric}{{node="{name}"}} {node[key]}')
+
+        lines.append("# HELP synth_process_peak_rss_bytes Peak resident set size of the server process.")
+        lines.append("# TYPE synth_process_peak_rss_bytes gauge")
+        lines.append(f"synth_process_peak_rss_bytes {peak_rss_bytes()}")
+        for metric, value in (extra or {}).items():
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value if value is not None else 'NaN'}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared process-wide aggregates fed by every instrumented node
+NODE_METRICS = NodeMetrics()
+
+
+def _profile_path(project_id: str, node_name: str) -> str:
+    directory = os.path.join(PROFILE_DIR, str(project_id))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{node_name}.prof")
+
+
+def instrument_node(name: str, node: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    """
+    Wraps a LangGraph node so each run appends a record (wall time, CPU time of the
+    node's thread, peak RSS delta, rows in/out) to the state's `node_metrics` (an
+    append reducer, so only the new record is returned) and to
+    the process-wide NODE_METRICS. CPU time excludes worker processes and helper
+    threads (parallel sampling, the LLM call), so wall >> cpu points at waiting.
+    Node start and finish are also published as progress events for the project.
+    """
+
+    @functools.wraps(node)
+    def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        project_id = state.get('project_id', 'default')
+        PROGRESS.publish(project_id, 'node_started', node=name, run_id=state.get('run_id'))
+        profile = PROFILE_NODES or bool(state.get('profile_nodes'))
+        profiler = cProfile.Profile() if profile else None
+        rss_before = peak_rss_bytes()
+        cpu_started = time.thread_time()
+        started = time.perf_counter()
+
+        if profiler is not None:
+            profiler.enable()
+        try:
+            update = node(state)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+
+        record = {
+            'node': name,
+            'wall_seconds': time.perf_counter() - started,
+            'cpu_seconds': time.thread_time() - cpu_started,
+            'peak_rss_delta_bytes': peak_rss_bytes() - rss_before,
+            'rows_in': _rows(state.get('original_data_ref')),
+            'rows_out': _rows_out(state, update),
+            'status': update.get('status', state.get('status')),
+        }
+        if profiler is not None:
+            record['profile_path'] = _profile_path(project_id, name)
+            profiler.dump_stats(record['profile_path'])
+
+        NODE_METRICS.observe(record)
+        PROGRESS.publish(project_id, 'node_finished', run_id=state.get('run_id'), **record)
+        return {**update, 'node_metrics': [record]}
+
+    return wrapper
@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# --- Job Queue Configuration ---
+MAX_CONCURRENT_JOBS = int(os.environ.get("SYNTH_MAX_CONCURRENT_JOBS", 2))
+MAX_QUEUED_JOBS = int(os.environ.get("SYNTH_MAX_QUEUED_JOBS", 8))
+MAX_RETAINED_JOBS = 200  # Finished jobs kept for status lookups before being forgotten
+
+TERMINAL_JOB_STATES = ('completed', 'failed', 'cancelled')
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while every worker is busy and the queue is full."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once cancellation has been requested."""
+
+
+# Cancellation flags of live jobs by id, for code that runs inside a job but only
+# carries its id (graph nodes get it through the state)
+_cancel_events: Dict[str, threading.Event] = {}
+
+
+def check_cancelled(job_id: Optional[str]) -> None:
+    """Raises JobCancelled when the job with this id has been cancelled; no-op outside a job."""
+    event = _cancel_events.get(job_id) if job_id else None
+    if event is not None and event.is_set():
+        raise JobCancelled(f"Job {job_id} was cancelled.")
+
+
+class Job:
+    """A single pipeline run tracked by the JobManager."""
+
+    def __init__(self, project_id: str, params: Dict[str, Any]):
+        self.job_id = uuid.uuid4().hex
+        self.project_id = project_id
+        self.params = params
+        self.status = 'queued'
+        self.error_message: Optional[str] = None
+        self.result: Dict[str, Any] = {}
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    def check_cancelled(self) -> None:
+        """Cooperative cancellation point for long-running job bodies."""
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"Job {self.job_id} was cancelled.")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'project_id': self.project_id,
+            'status': self.status,
+            'error_message': self.error_message,
+            'result': self.result,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Bounded executor for pipeline runs. At most `max_workers` jobs run at once and
+    at most `max_queued` wait behind them; further submissions raise QueueFullError
+    so callers can apply backpressure instead of piling up work. `on_dropped` is called
+    for a job cancelled before it started, since `run_job` never runs to report it.
+    """
+
+    def __init__(self, run_job: Callable[[Job], Dict[str, Any]],
+                 max_workers: int = MAX_CONCURRENT_JOBS, max_queued: int = MAX_QUEUED_JOBS,
+                 on_queued: Optional[Callable[[Job], None]] = None,
+                 on_dropped: Optional[Callable[[Job], None]] = None):
+        self._run_job = run_job
+        self._on_queued = on_queued
+        self._on_dropped = on_dropped
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _active_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status not in TERMINAL_JOB_STATES)
+
+    def submit(self, project_id: str, **params: Any) -> Job:
+        """Enqueues a job and returns immediately; raises QueueFullError when saturated."""
+        with self._lock:
+            if self._active_count() >= self.max_workers + self.max_queued:
+                raise QueueFullError(
+                    f"Job queue is full ({self.max_workers} running, {self.max_queued} queued). Retry later."
+                )
+            job = Job(project_id, params)
+            self._jobs[job.job_id] = job
+            _cancel_events[job.job_id] = job.cancel_event
+            self._forget_finished()
+            if self._on_queued is not None:
+                # Runs before the job can start, so 'queued' is always reported ahead of 'running'
+                self._on_queued(job)
+            job.future = self._executor.submit(self._execute, job)
+        return job
+
+    def _drop(self, job: Job) -> None:
+        job.status = 'cancelled'
+        job.finished_at = time.time()
+        if self._on_dropped is not None:
+            self._on_dropped(job)
+
+    def _execute(self, job: Job) -> None:
+        if job.cancel_event.is_set():
+            # cancel() came too late to cancel the future but before the job started
+            self._drop(job)
+            return
+
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            job.result = self._run_job(job) or {}
+            job.status = 'completed'
+        except JobCancelled as e:
+            job.status = 'cancelled'
+            job.error_message = str(e)
+        except Exception as e:
+            job.status = 'failed'
+            job.error_message = f"CRITICAL GRAPH EXECUTION ERROR: {e}"
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancels a job. Queued jobs are dropped before they start; running jobs stop
+        at their next cancellation point (between graph nodes, or between sampled batches).
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status in TERMINAL_JOB_STATES:
+            return job
+
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._drop(job)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in list(self._jobs.values()):
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {'max_workers': self.max_workers, 'max_queued': self.max_queued, 'jobs': counts}
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in TERMINAL_JOB_STATES]
+        for job_id in finished[:max(0, len(self._jobs) - MAX_RETAINED_JOBS)]:
+            del self._jobs[job_id]
+            _cancel_events.pop(job_id, None)
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,205 @@
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from core.instrumentation import peak_rss_bytes
+
+# --- Loader Configuration ---
+# Inputs are parsed in chunks and each chunk is shrunk (numeric downcasting,
+# low-cardinality strings to 'category') before the next one is read, so peak
+# memory tracks the compact frame rather than pandas' object/int64/float64 default.
+LOAD_CHUNK_ROWS = int(os.environ.get("SYNTH_LOAD_CHUNK_ROWS", 250_000))
+LOAD_ENGINES = ('pandas', 'pyarrow')
+DEFAULT_LOAD_ENGINE = os.environ.get("SYNTH_LOAD_ENGINE", "pandas")
+PYARROW_BLOCK_BYTES = 64 * 1024 * 1024
+# A string column becomes 'category' when its first chunk has at most this share of distinct values
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+# --- Chunk Readers ---
+def _iter_pandas_chunks(path: str, chunk_rows: int) -> Iterator[DataFrame]:
+    yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def _iter_pyarrow_chunks(path: str, chunk_rows: int) -> Iterator[DataFrame]:
+    """Multi-threaded Arrow CSV parse, streamed block by block."""
+    import pyarrow.csv as pv
+
+    reader = pv.open_csv(path, read_options=pv.ReadOptions(use_threads=True, block_size=PYARROW_BLOCK_BYTES))
+    for batch in reader:
+        frame = batch.to_pandas()
+        for start in range(0, frame.shape[0], chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+
+
+# --- Dtype Optimization ---
+def _is_identifier(column: Any, series: pd.Series) -> bool:
+    """Id-named or all-distinct integer columns: synthesized keys must not be capped by a narrow dtype."""
+    name = str(column).strip().lower()
+    return name == 'id' or name.endswith(('_id', ' id')) or (series.shape[0] > 1 and series.is_unique)
+
+
+def _shrink_numeric(column: Any, series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        # Keys stay int64: SDV draws new keys within the column's dtype, so an int8 ID
+        # column would allow only 256 of them
+        if _is_identifier(column, series):
+            return series.astype(np.int64) if series.dtype != np.int64 else series
+        return pd.to_numeric(series, downcast='integer')
+    if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+        # Floats are only narrowed when float32 round-trips every value exactly
+        narrowed = series.astype(np.float32)
+        if np.array_equal(narrowed.to_numpy(np.float64), series.to_numpy(np.float64), equal_nan=True):
+            return narrowed
+    return series
+
+
+def category_columns(chunk: DataFrame, max_unique_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> List[str]:
+    """String columns of a (first) chunk whose cardinality is low enough to store as 'category'."""
+    limit = max(1, int(chunk.shape[0] * max_unique_ratio))
+    return [column for column in chunk.columns
+            if chunk[column].dtype == object and chunk[column].nunique(dropna=True) <= limit]
+
+
+def optimize_chunk(chunk: DataFrame, categorical: List[str]) -> DataFrame:
+    """Downcasts numeric columns (except integer keys) and converts the given string columns to 'category'."""
+    columns = {}
+    for column in chunk.columns:
+        series = chunk[column]
+        if column in categorical:
+            columns[column] = series.astype('category')
+        elif pd.api.types.is_numeric_dtype(series):
+            columns[column] = _shrink_numeric(column, series)
+        else:
+            columns[column] = series
+    return pd.DataFrame(columns, index=chunk.index)
+
+
+def _union_categories(parts: List[pd.Series]) -> Any:
+    """
+    Merges one column's per-chunk categoricals. A later chunk that is all-null or only
+    holds numeric-looking values gets float/int categories; those are cast to strings,
+    as the first chunk's were, and a column that still can't be merged falls back to object.
+    """
+    if len({part.cat.categories.dtype for part in parts}) > 1:
+        parts = [part.cat.rename_categories(part.cat.categories.astype(str)) for part in parts]
+    try:
+        return pd.api.types.union_categoricals(parts)
+    except (TypeError, ValueError):
+        return pd.concat([part.astype(object) for part in parts], ignore_index=True)
+
+
+def concat_chunks(chunks: List[DataFrame], shrink: bool = True) -> DataFrame:
+    """Concatenates optimized chunks, merging per-chunk categories so columns stay 'category'."""
+    if not chunks:
+        return DataFrame()
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+
+    merged = {}
+    for column in chunks[0].columns:
+        if all(isinstance(chunk[column].dtype, pd.CategoricalDtype) for chunk in chunks):
+            merged[column] = _union_categories([chunk[column] for chunk in chunks])
+    frame = pd.concat([chunk.drop(columns=list(merged)) for chunk in chunks], ignore_index=True)
+    for column, values in merged.items():
+        frame[column] = values
+    frame = frame[chunks[0].columns]
+    if not shrink:
+        return frame
+
+    # Chunks may have narrowed to different widths; re-narrow the combined numeric columns
+    for column in frame.columns:
+        if column not in merged and pd.api.types.is_numeric_dtype(frame[column]):
+            frame[column] = _shrink_numeric(column, frame[column])
+    return frame
+
+
+class _Reservoir:
+    """Uniform fixed-size row sample over a stream of chunks (Algorithm R, vectorized per chunk)."""
+
+    def __init__(self, size: int, seed: Optional[int]):
+        self.size = size
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+        self.chunks: List[DataFrame] = []
+        self.sample: Optional[DataFrame] = None
+
+    def add(self, chunk: DataFrame) -> None:
+        n = chunk.shape[0]
+        fill = max(0, min(n, self.size - self.seen))
+        if fill:
+            self.chunks.append(chunk.iloc[:fill])
+        if fill < n:
+            if self.sample is None:
+                self.sample = concat_chunks(self.chunks, shrink=False)
+                self.chunks = []
+            positions = np.arange(self.seen + fill, self.seen + n)
+            slots = (self.rng.random(positions.size) * (positions + 1)).astype(np.int64)
+            keep = slots < self.size
+            # Several rows may land on one slot within a chunk; the last one wins, as in the sequential algorithm
+            replacements = pd.Series(np.flatnonzero(keep) + fill, index=slots[keep])
+            replacements = replacements[~replacements.index.duplicated(keep='last')]
+            if not replacements.empty:
+                incoming = chunk.iloc[replacements.to_numpy()]
+                survivors = self.sample.drop(index=replacements.index.to_numpy())
+                self.sample = concat_chunks([survivors, incoming], shrink=False)
+        self.seen += n
+
+    def result(self) -> List[DataFrame]:
+        return [self.sample] if self.sample is not None else self.chunks
+
+
+def load_csv(
+        path: str,
+        engine: str = DEFAULT_LOAD_ENGINE,
+        chunk_rows: int = LOAD_CHUNK_ROWS,
+        sample_rows: Optional[int] = None,
+        optimize_dtypes: bool = True,
+        seed: Optional[int] = None
+) -> Tuple[DataFrame, Dict[str, Any]]:
+    """
+    Streams a CSV in chunks of `chunk_rows`, shrinking dtypes chunk by chunk. With
+    `sample_rows`, only a uniform reservoir sample of that many rows is kept, so
+    memory stays bounded for inputs larger than RAM. Returns the frame and load
+    statistics (rows read/kept, seconds, rows/sec, frame bytes, peak RSS).
+    """
+    if engine not in LOAD_ENGINES:
+        raise ValueError(f"Unsupported load engine '{engine}'. Choose one of: {', '.join(LOAD_ENGINES)}.")
+
+    started = time.perf_counter()
+    chunks = _iter_pyarrow_chunks(path, chunk_rows) if engine == 'pyarrow' else _iter_pandas_chunks(path, chunk_rows)
+    reservoir = _Reservoir(sample_rows, seed) if sample_rows else None
+    kept: List[DataFrame] = []
+    categorical: Optional[List[str]] = None
+    rows_read = 0
+
+    for chunk in chunks:
+        if categorical is None:
+            categorical = category_columns(chunk) if optimize_dtypes else []
+        if optimize_dtypes:
+            chunk = optimize_chunk(chunk, categorical)
+        rows_read += chunk.shape[0]
+        if reservoir is not None:
+            reservoir.add(chunk)
+        else:
+            kept.append(chunk)
+
+    df = concat_chunks(reservoir.result() if reservoir is not None else kept)
+    elapsed = time.perf_counter() - started
+    stats = {
+        'engine': engine,
+        'rows_read': rows_read,
+        'rows_kept': int(df.shape[0]),
+        'sampled': reservoir is not None and rows_read > df.shape[0],
+        'seconds': elapsed,
+        'rows_per_sec': rows_read / elapsed if elapsed > 0 else None,
+        'frame_bytes': int(df.memory_usage(deep=True).sum()),
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+    return df, stats
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Tuple
+
+from pandas import DataFrame
+
+# --- Schema -> SDV Metadata ---
+# Built once per run (by the Schema Inference node) and shared by synthesis and
+# validation, so both stages agree on column types and the table isn't re-scanned.
+METADATA_SPEC_VERSION = 'SINGLE_TABLE_V1'
+
+_SCHEMA_SDTYPES = {
+    'int': 'numerical', 'integer': 'numerical', 'float': 'numerical', 'numeric': 'numerical',
+    'numerical': 'numerical', 'number': 'numerical',
+    'category': 'categorical', 'categorical': 'categorical',
+    'bool': 'boolean', 'boolean': 'boolean',
+    'datetime': 'datetime', 'date': 'datetime', 'timestamp': 'datetime',
+    'id': 'id',
+}
+
+
+def _schema_type(entry: Any) -> str:
+    """Column type from a schema entry, which the LLM may give as {'type': ...} or a bare string."""
+    value = entry.get('type') if isinstance(entry, dict) else entry
+    return str(value or '').strip().lower()
+
+
+def _looks_like_id(df: DataFrame, column: str) -> bool:
+    name = str(column).lower()
+    return (name == 'id' or name.endswith(('_id', ' id'))) and df[column].is_unique
+
+
+def metadata_from_schema(df: DataFrame, schema: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Builds an SDV single-table metadata dict from the inferred schema. Columns whose
+    schema type has no unambiguous sdtype (free text, unknown types, missing entries)
+    are detected by SDV on just those columns. Returns the dict and the detected columns.
+    Raises if the resulting metadata is invalid.
+    """
+    from sdv.metadata import SingleTableMetadata
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    primary_key = None
+    undetermined = []
+    for column in df.columns:
+        if column == 'Unnamed: 0':
+            continue
+        sdtype = _SCHEMA_SDTYPES.get(_schema_type(schema.get(column)))
+        if sdtype in ('numerical', 'id', None) and primary_key is None and _looks_like_id(df, column):
+            sdtype = 'id'
+        if sdtype is None:
+            undetermined.append(column)
+            continue
+        columns[column] = {'sdtype': sdtype}
+        if sdtype == 'id' and primary_key is None:
+            primary_key = column
+
+    if undetermined:
+        detected = SingleTableMetadata()
+        detected.detect_from_dataframe(data=df[undetermined])
+        detected_columns = detected.to_dict()['columns']
+        for column in undetermined:
+            entry = detected_columns[column]
+            if entry['sdtype'] == 'id' and primary_key is not None:
+                entry = {'sdtype': 'unknown', 'pii': True}
+            columns[column] = entry
+            if entry['sdtype'] == 'id' and primary_key is None:
+                primary_key = column
+
+    metadata_dict: Dict[str, Any] = {'columns': columns, 'METADATA_SPEC_VERSION': METADATA_SPEC_VERSION}
+    if primary_key is not None:
+        metadata_dict['primary_key'] = primary_key
+
+    SingleTableMetadata.load_from_dict(metadata_dict).validate()
+    return metadata_dict, undetermined
+
+
+def detect_metadata(df: DataFrame) -> Dict[str, Any]:
+    """SDV's own full-table detection, used when no schema-derived metadata is available."""
+    from sdv.metadata import SingleTableMetadata
+
+    if 'Unnamed: 0' in df.columns:
+        df = df.drop(columns=['Unnamed: 0'])
+    metadata = SingleTableMetadata()
+    metadata.detect_from_dataframe(data=df)
+    return metadata.to_dict()
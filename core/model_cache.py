@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from typing import Any, Dict, Optional
+
+import pandas as pd
+from pandas import DataFrame
+
+# --- Model Store Configuration ---
+# Fitted synthesizers are pickled to disk so that re-running the pipeline on the
+# same uploaded file skips metadata detection and fitting entirely.
+MODEL_CACHE_DIR = os.environ.get("SYNTH_MODEL_CACHE_DIR", "model_cache")
+MODEL_CACHE_MAX_BYTES = int(os.environ.get("SYNTH_MODEL_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+
+
+def dataset_fingerprint(df: DataFrame, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Content hash of a DataFrame plus the metadata/synthesizer parameters used to fit it.
+    Two frames with identical columns, dtypes and values map to the same key.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """On-disk, size-bounded LRU store of fitted synthesizers keyed by dataset fingerprint."""
+
+    def __init__(self, cache_dir: str = MODEL_CACHE_DIR, max_bytes: int = MODEL_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the cached synthesizer for `key`, or None on a miss. An entry that no
+        longer unpickles (truncated, or written by another SDV/RDT version, which
+        surfaces as AttributeError, ModuleNotFoundError and the like) is deleted and
+        counted as a miss.
+        """
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    synthesizer = pickle.load(f)
+            except OSError:
+                self.misses += 1
+                return None
+            except Exception as e:
+                print(f"Warning: Discarding unreadable cached model {key}. {type(e).__name__}: {e}")
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                self.misses += 1
+                return None
+
+            # Touch the entry so eviction order reflects recent use (LRU)
+            os.utime(path)
+            self.hits += 1
+            return synthesizer
+
+    def put(self, key: str, synthesizer: Any) -> None:
+        """Stores a fitted synthesizer, then evicts least-recently-used entries over the size bound."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with self._lock:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(synthesizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic rename so concurrent readers never see a half-written model
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current on-disk footprint."""
+        entries = 0
+        size = 0
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl"):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(self.cache_dir, name))
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'entries': entries,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes,
+        }
+
+
+# Shared process-wide store used by the synthesis tool
+MODEL_CACHE = ModelCache()
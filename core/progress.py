@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+# --- Progress Events ---
+# Pipeline threads publish small events (status changes, node start/finish, sampling
+# progress) per project; the /progress endpoint relays them to browsers as
+# Server-Sent Events. Publishing is a no-op when nobody is listening.
+PROGRESS_QUEUE_SIZE = 1000  # Events buffered per subscriber before new ones are dropped
+TERMINAL_EVENT = 'done'
+
+
+def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # A stalled client loses intermediate progress rather than growing server memory
+        pass
+
+
+class ProgressBus:
+    """Thread-safe fan-out of progress events from worker threads to asyncio subscribers."""
+
+    def __init__(self, queue_size: int = PROGRESS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def publish(self, project_id: str, event: str, **fields: Any) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        if not subscribers:
+            return
+
+        payload = {'event': event, 'project_id': project_id, 'time': time.time(), **fields}
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, payload)
+            except RuntimeError:
+                # The subscriber's event loop is gone; it is removed on unsubscribe
+                pass
+
+    def subscribe(self, project_id: str) -> asyncio.Queue:
+        """Registers a queue for the project's events; call from the event loop that will read it."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(project_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, project_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            remaining = [(loop, q) for loop, q in self._subscribers.get(project_id, ()) if q is not queue]
+            if remaining:
+                self._subscribers[project_id] = remaining
+            else:
+                self._subscribers.pop(project_id, None)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+# Shared process-wide bus fed by the graph nodes and the job runner
+PROGRESS = ProgressBus()
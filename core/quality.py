@@ -0,0 +1,225 @@
+import itertools
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+# --- Quality Budget Configuration ---
+# 'auto' runs the full SDMetrics report when the data fits these budgets and the
+# sampled evaluation otherwise.
+QUALITY_MODES = ('auto', 'full', 'sampled')
+QUALITY_ROW_BUDGET = int(os.environ.get("SYNTH_QUALITY_ROW_BUDGET", 50_000))
+QUALITY_MAX_COLUMN_PAIRS = int(os.environ.get("SYNTH_QUALITY_MAX_COLUMN_PAIRS", 200))
+QUALITY_TIME_BUDGET_S = float(os.environ.get("SYNTH_QUALITY_TIME_BUDGET_S", 60))
+# Sampled reports re-score this many bootstrap resamples (rows, columns and pairs) for
+# their confidence interval, within what remains of the time budget.
+QUALITY_BOOTSTRAP_ROUNDS = int(os.environ.get("SYNTH_QUALITY_BOOTSTRAP_ROUNDS", 20))
+
+_CONTINUOUS_SDTYPES = ('numerical', 'datetime')
+_DISCRETE_SDTYPES = ('categorical', 'boolean', 'ordinal')
+
+
+def needs_sampling(original_df: DataFrame, synthetic_df: DataFrame, metadata: Dict[str, Any],
+                   row_budget: int = QUALITY_ROW_BUDGET, max_pairs: int = QUALITY_MAX_COLUMN_PAIRS) -> bool:
+    """True when a full report would exceed the row or column-pair budget."""
+    eligible = len(_eligible_columns(metadata))
+    pairs = eligible * (eligible - 1) // 2
+    return max(len(original_df), len(synthetic_df)) > row_budget or pairs > max_pairs
+
+
+def _eligible_columns(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """Columns SDMetrics scores (ids and PII are skipped), mapped to their sdtype."""
+    return {
+        name: meta['sdtype']
+        for name, meta in metadata.get('columns', {}).items()
+        if meta.get('sdtype') in _CONTINUOUS_SDTYPES + _DISCRETE_SDTYPES and not meta.get('pii')
+    }
+
+
+def _strata_column(df: DataFrame, columns: Dict[str, str]) -> Optional[str]:
+    """Lowest-cardinality discrete column with at least two values, used to stratify row samples."""
+    candidates = [(df[c].nunique(), c) for c, sdtype in columns.items() if sdtype in _DISCRETE_SDTYPES]
+    candidates = [(n, c) for n, c in candidates if n >= 2]
+    return min(candidates)[1] if candidates else None
+
+
+def stratified_sample(df: DataFrame, n: int, strata: Optional[str], seed: int) -> DataFrame:
+    """Row sample of about `n` rows preserving the proportions of `strata` (plain uniform if None)."""
+    if len(df) <= n:
+        return df
+    if strata is None or strata not in df.columns:
+        return df.sample(n=n, random_state=seed)
+    return df.groupby(strata, group_keys=False, dropna=False, observed=True).sample(
+        frac=n / len(df), random_state=seed
+    )
+
+
+def _as_continuous(series: pd.Series, sdtype: str) -> pd.Series:
+    if sdtype == 'datetime':
+        converted = pd.to_datetime(series, errors='coerce')
+        values = pd.Series(converted.to_numpy(dtype='datetime64[ns]').view(np.int64), index=series.index)
+        return values.where(converted.notna())
+    return pd.to_numeric(series, errors='coerce')
+
+
+def _column_shape(real: DataFrame, synth: DataFrame, column: str, sdtype: str) -> float:
+    from sdmetrics.single_column import KSComplement, TVComplement
+
+    if sdtype in _CONTINUOUS_SDTYPES:
+        return KSComplement.compute(_as_continuous(real[column], sdtype).dropna(),
+                                    _as_continuous(synth[column], sdtype).dropna())
+    return TVComplement.compute(real[column], synth[column])
+
+
+def _pair_trend(real: DataFrame, synth: DataFrame, a: str, b: str, columns: Dict[str, str]) -> float:
+    from sdmetrics.column_pairs import CorrelationSimilarity, ContingencySimilarity
+
+    continuous = [c for c in (a, b) if columns[c] in _CONTINUOUS_SDTYPES]
+    real_pair = real[[a, b]].copy()
+    synth_pair = synth[[a, b]].copy()
+    for c in continuous:
+        real_pair[c] = _as_continuous(real_pair[c], columns[c])
+        synth_pair[c] = _as_continuous(synth_pair[c], columns[c])
+    if len(continuous) == 2:
+        return CorrelationSimilarity.compute(real_pair.dropna(), synth_pair.dropna(), coefficient='Pearson')
+    return ContingencySimilarity.compute(real_pair, synth_pair, continuous_column_names=continuous or None)
+
+
+def _property_scores(real: DataFrame, synth: DataFrame, columns: Dict[str, str], shape_columns: List[str],
+                     pairs: List[Tuple[str, str]], deadline: float = float('inf')) -> Tuple[List[float], List[float]]:
+    """Column Shapes and Column Pair Trends component scores; pairs stop at `deadline`."""
+    shape_scores = []
+    for column in shape_columns:
+        try:
+            shape_scores.append(_column_shape(real, synth, column, columns[column]))
+        except Exception:
+            continue
+    pair_scores = []
+    for a, b in pairs:
+        if time.perf_counter() > deadline:
+            break
+        try:
+            pair_scores.append(_pair_trend(real, synth, a, b, columns))
+        except Exception:
+            continue
+    return shape_scores, pair_scores
+
+
+def _mean(scores: List[float]) -> float:
+    values = [s for s in scores if s is not None and not np.isnan(s)]
+    return float(np.mean(values)) if values else float('nan')
+
+
+def _overall(shapes: float, trends: float) -> float:
+    present = [score for score in (shapes, trends) if not np.isnan(score)]
+    return float(np.mean(present)) if present else float('nan')
+
+
+def _bootstrap_scores(real: DataFrame, synth: DataFrame, columns: Dict[str, str], pairs: List[Tuple[str, str]],
+                      rounds: int, deadline: float, round_s: float, seed: int) -> List[Tuple[float, float, float]]:
+    """
+    (shapes, trends, overall) of bootstrap resamples: rows of both samples, the scored
+    columns and the evaluated pairs are redrawn with replacement, so the spread covers
+    row-sampling and pair-selection error as well as the metrics' own variation. A
+    round (expected to take `round_s`) only starts if it can finish by `deadline`.
+    """
+    if real.empty or synth.empty or not columns:
+        return []
+    rng = np.random.default_rng(seed)
+    column_names = list(columns)
+    results = []
+    for _ in range(rounds):
+        if time.perf_counter() + round_s > deadline:
+            break
+        real_rows = real.iloc[rng.integers(0, len(real), len(real))]
+        synth_rows = synth.iloc[rng.integers(0, len(synth), len(synth))]
+        shape_columns = [column_names[i] for i in rng.integers(0, len(column_names), len(column_names))]
+        round_pairs = [pairs[i] for i in rng.integers(0, len(pairs), len(pairs))] if pairs else []
+        shape_scores, pair_scores = _property_scores(real_rows, synth_rows, columns, shape_columns, round_pairs)
+        shapes, trends = _mean(shape_scores), _mean(pair_scores)
+        results.append((shapes, trends, _overall(shapes, trends)))
+    return results
+
+
+def _interval(values: List[float], estimate: float) -> Tuple[float, float]:
+    """95% percentile interval around `estimate`; [0, 1] (nothing is known) with fewer than two resamples."""
+    values = [v for v in values if not np.isnan(v)]
+    if np.isnan(estimate):
+        return estimate, estimate
+    if len(values) < 2:
+        return 0.0, 1.0
+    low, high = np.percentile(values, [2.5, 97.5])
+    return float(min(low, estimate)), float(max(high, estimate))
+
+
+def sampled_quality_report(original_df: DataFrame, synthetic_df: DataFrame, metadata: Dict[str, Any],
+                           row_budget: int = QUALITY_ROW_BUDGET, max_pairs: int = QUALITY_MAX_COLUMN_PAIRS,
+                           time_budget_s: float = QUALITY_TIME_BUDGET_S, seed: int = 0,
+                           bootstrap_rounds: int = QUALITY_BOOTSTRAP_ROUNDS) -> Dict[str, Any]:
+    """
+    Budgeted approximation of the SDMetrics single-table QualityReport: the same
+    Column Shapes (KS/TV complement) and Column Pair Trends (correlation/contingency
+    similarity) metrics, computed on stratified row samples and on at most
+    `max_pairs` randomly chosen column pairs, stopping early at `time_budget_s`.
+    Scores come with 95% bootstrap confidence bounds (see _bootstrap_scores) from
+    the rounds that fit in the rest of the time budget.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_s
+    columns = {c: t for c, t in _eligible_columns(metadata).items()
+               if c in original_df.columns and c in synthetic_df.columns}
+    strata = _strata_column(original_df, columns)
+    real = stratified_sample(original_df, row_budget, strata, seed)
+    synth = stratified_sample(synthetic_df, row_budget, strata, seed)
+
+    # Column Shapes cover every eligible column (linear in columns); Column Pair Trends
+    # a random subset of pairs (quadratic in columns otherwise)
+    all_pairs = list(itertools.combinations(columns, 2))
+    pairs = random.Random(seed).sample(all_pairs, max_pairs) if len(all_pairs) > max_pairs else all_pairs
+    scoring_started = time.perf_counter()
+    shape_scores, pair_scores = _property_scores(real, synth, columns, list(columns), pairs, deadline)
+    evaluated_pairs = pairs[:len(pair_scores)]
+    shapes, trends = _mean(shape_scores), _mean(pair_scores)
+    overall = _overall(shapes, trends)
+
+    resamples = _bootstrap_scores(real, synth, columns, evaluated_pairs, bootstrap_rounds, deadline,
+                                  time.perf_counter() - scoring_started, seed)
+    properties = [(name, score, *_interval([r[i] for r in resamples], score))
+                  for i, (name, score) in enumerate((('Column Shapes', shapes), ('Column Pair Trends', trends)))
+                  if not np.isnan(score)]
+
+    return {
+        'Overall Score': overall,
+        'Confidence Interval': list(_interval([r[2] for r in resamples], overall)),
+        'Details': pd.DataFrame(properties, columns=['Property', 'Score', 'CI Low', 'CI High']).to_json(),
+        'Mode': 'sampled',
+        'Rows Evaluated': [len(real), len(synth)],
+        'Stratified By': strata,
+        'Column Pairs Evaluated': len(pair_scores),
+        'Column Pairs Total': len(all_pairs),
+        'Bootstrap Rounds': len(resamples),
+        'Elapsed Seconds': time.perf_counter() - started,
+    }
+
+
+def full_quality_report(original_df: DataFrame, synthetic_df: DataFrame, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Exact SDMetrics single-table QualityReport over the complete frames."""
+    from sdmetrics.reports.single_table import QualityReport
+
+    started = time.perf_counter()
+    report = QualityReport()
+    report.generate(original_df, synthetic_df, metadata, verbose=False)
+    overall_score = report.get_score()
+
+    # FIX: Use 'get_properties()' instead of 'get_details()'
+    # This returns the summary dataframe (Column Shapes, Trends scores)
+    return {
+        'Overall Score': overall_score,
+        'Details': report.get_properties().to_json(),
+        'Mode': 'full',
+        'Elapsed Seconds': time.perf_counter() - started,
+    }
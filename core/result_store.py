@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from pandas import DataFrame
+
+from core.sinks import count_output_rows, find_output, read_output, read_output_slice
+
+# --- Result Store Configuration ---
+# Upper bound on the memory held by loaded synthetic DataFrames across all projects.
+RESULT_STORE_MAX_BYTES = int(os.environ.get("SYNTH_RESULT_STORE_MAX_BYTES", 1024 ** 3))
+
+
+class ProjectResult:
+    """Status, quality report and output handle of one project's latest run."""
+
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self.status = 'Awaiting Run'
+        self.quality_score: Optional[float] = None
+        self.quality_report: Dict[str, Any] = {}
+        self.error_message: Optional[str] = None
+        self.job_id: Optional[str] = None
+        self.output_path: Optional[str] = None
+        self.input_file_path: Optional[str] = None
+        self.metadata: Optional[Dict[str, Any]] = None
+        self.node_metrics: List[Dict[str, Any]] = []
+        self.row_count = 0
+        self.updated_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'project_id': self.project_id,
+            'status': self.status,
+            'quality_score': self.quality_score,
+            'quality_report': self.quality_report,
+            'error_message': self.error_message,
+            'job_id': self.job_id,
+            'output_path': self.output_path,
+            'synthetic_row_count': self.row_count,
+            'node_metrics': self.node_metrics,
+            'updated_at': self.updated_at,
+        }
+
+
+class ResultStore:
+    """
+    Per-project result registry. Status entries are tiny and always kept; loaded
+    output frames are cached on top of them in an LRU bounded by total bytes, so
+    concurrent projects neither clobber each other's status nor thrash reloads.
+    """
+
+    def __init__(self, max_bytes: int = RESULT_STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._results: Dict[str, ProjectResult] = {}
+        self._frames: "OrderedDict[str, tuple[str, DataFrame, int]]" = OrderedDict()
+        self._frame_bytes = 0
+        self._lock = threading.Lock()
+        # A project's load lock lives only while some reader holds it, so the map doesn't
+        # grow with every project a long-lived server has seen
+        self._load_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+
+    def get(self, project_id: str) -> Optional[ProjectResult]:
+        return self._results.get(project_id)
+
+    def update(self, project_id: str, **fields: Any) -> ProjectResult:
+        """Creates or updates a project's entry; a new output_path invalidates its cached frame."""
+        with self._lock:
+            result = self._results.get(project_id)
+            if result is None:
+                result = self._results[project_id] = ProjectResult(project_id)
+            if 'output_path' in fields and fields['output_path'] != result.output_path:
+                self._drop_frame(project_id)
+            for name, value in fields.items():
+                setattr(result, name, value)
+            result.updated_at = time.time()
+            return result
+
+    def discover(self, project_id: str) -> Optional[ProjectResult]:
+        """
+        Returns a project's entry, registering an output already on disk (e.g. from
+        before a restart) for projects this process hasn't seen, without loading it.
+        """
+        result = self.get(project_id)
+        if result is not None:
+            return result
+
+        output_path = find_output(project_id)
+        if output_path is None:
+            return result
+        return self.update(project_id, output_path=output_path, row_count=count_output_rows(output_path))
+
+    def get_frame(self, project_id: str) -> Optional[DataFrame]:
+        """Returns the project's output as a DataFrame, loading it at most once per eviction."""
+        result = self.discover(project_id)
+        if result is None or not result.output_path:
+            return None
+
+        with self._lock:
+            cached = self._frames.get(project_id)
+            if cached is not None and cached[0] == result.output_path:
+                self._frames.move_to_end(project_id)
+                return cached[1]
+            load_lock = self._load_locks.setdefault(project_id, threading.Lock())
+
+        # One loader per project; concurrent readers wait for it instead of re-reading the file
+        with load_lock:
+            with self._lock:
+                cached = self._frames.get(project_id)
+                if cached is not None and cached[0] == result.output_path:
+                    return cached[1]
+
+            output_path = result.output_path
+            try:
+                frame = read_output(output_path)
+            except (OSError, ValueError):
+                return None
+
+            size = int(frame.memory_usage(deep=True).sum())
+            with self._lock:
+                self._drop_frame(project_id)
+                if size <= self.max_bytes:
+                    self._frames[project_id] = (output_path, frame, size)
+                    self._frame_bytes += size
+                    self._evict()
+                result.row_count = frame.shape[0]
+            return frame
+
+    def read_page(self, project_id: str, offset: int, limit: int,
+                  columns: Optional[List[str]] = None) -> Optional[DataFrame]:
+        """
+        Returns one page of a project's output, sliced from the cached frame when there
+        is one and straight from the file otherwise. A CSV page only parses the rows up
+        to `offset + limit`, so large CSV outputs are never loaded whole for one page.
+        """
+        result = self.discover(project_id)
+        if result is None or not result.output_path:
+            return None
+
+        with self._lock:
+            cached = self._frames.get(project_id)
+            if cached is not None and cached[0] == result.output_path:
+                self._frames.move_to_end(project_id)
+                page = cached[1].iloc[offset:offset + limit]
+                return page[columns] if columns else page
+
+        try:
+            page = read_output_slice(result.output_path, offset, limit, columns)
+        except (OSError, ValueError):
+            return None
+        # usecols keeps the file's column order; pages follow the requested order
+        return page[columns] if columns else page
+
+    def _drop_frame(self, project_id: str) -> None:
+        cached = self._frames.pop(project_id, None)
+        if cached is not None:
+            self._frame_bytes -= cached[2]
+
+    def _evict(self) -> None:
+        while self._frame_bytes > self.max_bytes and self._frames:
+            _, (_, _, size) = self._frames.popitem(last=False)
+            self._frame_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'projects': len(self._results),
+            'cached_frames': len(self._frames),
+            'cached_bytes': self._frame_bytes,
+            'max_bytes': self.max_bytes,
+        }
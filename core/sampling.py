@@ -0,0 +1,204 @@
+import math
+import multiprocessing
+import os
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from core.constraints import ConstraintError, ConstraintSet
+
+# --- Sampling Configuration ---
+# Rows drawn from the fitted synthesizer per batch; peak memory during a streamed
+# run is bounded by this rather than by the total number of requested rows.
+DEFAULT_BATCH_SIZE = 100_000
+DEFAULT_SEED = 42
+
+# Constrained sampling: each draw is sized from the acceptance rate observed so far,
+# with some margin, so a batch usually fills in one or two draws.
+CONSTRAINT_OVERSAMPLE_MARGIN = 1.2
+CONSTRAINT_MIN_DRAW_ROWS = 256
+CONSTRAINT_MAX_OVERSAMPLE = 20  # Largest single draw, in batch sizes (bounds memory)
+# Below this acceptance rate (measured over at least the probe rows) the constraints
+# are treated as unsatisfiable for the fitted model and the run fails.
+CONSTRAINT_MIN_ACCEPTANCE = 0.001
+CONSTRAINT_PROBE_ROWS = 10_000
+
+
+def iter_synthetic_batches(
+        synthesizer: Any,
+        num_rows: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        seed: int | None = None
+) -> Iterator[DataFrame]:
+    """
+    Generator that draws `num_rows` rows from a fitted synthesizer in batches of at
+    most `batch_size`, yielding each batch as soon as it is sampled. With a `seed`,
+    each batch is re-seeded from (seed, batch index) so the run is reproducible.
+    """
+    sizes = _shard_sizes(num_rows, batch_size)
+    seeds = shard_seeds(seed, len(sizes)) if seed is not None else [None] * len(sizes)
+    if seed is not None:
+        reset_sampling(synthesizer)
+    for rows, shard_seed in zip(sizes, seeds):
+        if shard_seed is not None:
+            seed_synthesizer(synthesizer, shard_seed)
+        yield synthesizer.sample(num_rows=rows)
+
+
+def iter_constrained_batches(
+        synthesizer: Any,
+        num_rows: int,
+        constraints: ConstraintSet,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        seed: int | None = None,
+        stats: Optional[Dict[str, Any]] = None
+) -> Iterator[DataFrame]:
+    """
+    Like iter_synthetic_batches, but only rows satisfying `constraints` are kept,
+    via one vectorized mask per draw. Draws are oversampled by the inverse of the
+    acceptance rate observed so far, and accepted rows beyond a batch carry over to
+    the next one, so `num_rows` rows come out in as few draws as possible. Draw
+    counts are recorded in `stats`. Raises ConstraintError when almost no sampled
+    rows pass.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(drawn=0, accepted=0, draws=0)
+    seed_sequence = np.random.SeedSequence(seed) if seed is not None else None
+    if seed is not None:
+        reset_sampling(synthesizer)
+    pending: List[DataFrame] = []
+    pending_rows = 0
+    emitted = 0
+
+    while emitted < num_rows:
+        target = min(batch_size, num_rows - emitted)
+        while pending_rows < target:
+            rate = stats['accepted'] / stats['drawn'] if stats['drawn'] else 1.0
+            if stats['drawn'] >= CONSTRAINT_PROBE_ROWS and rate < CONSTRAINT_MIN_ACCEPTANCE:
+                raise ConstraintError(
+                    f"Only {stats['accepted']} of {stats['drawn']} sampled rows satisfied the constraints "
+                    f"({'; '.join(constraints.texts)}); they look unsatisfiable for this data.")
+            need = target - pending_rows
+            margin = CONSTRAINT_OVERSAMPLE_MARGIN if stats['drawn'] else 1.0
+            draw = math.ceil(need / max(rate, CONSTRAINT_MIN_ACCEPTANCE) * margin)
+            draw = min(max(draw, need, CONSTRAINT_MIN_DRAW_ROWS), batch_size * CONSTRAINT_MAX_OVERSAMPLE)
+
+            if seed_sequence is not None:
+                seed_synthesizer(synthesizer, int(seed_sequence.spawn(1)[0].generate_state(1)[0]))
+            accepted = constraints.apply(synthesizer.sample(num_rows=draw))
+            stats['drawn'] += draw
+            stats['accepted'] += accepted.shape[0]
+            stats['draws'] += 1
+            if accepted.shape[0]:
+                pending.append(accepted)
+                pending_rows += accepted.shape[0]
+
+        rows = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0].reset_index(drop=True)
+        pending = [rows.iloc[target:]] if rows.shape[0] > target else []
+        pending_rows = rows.shape[0] - target
+        emitted += target
+        yield rows.iloc[:target]
+
+
+def _shard_sizes(num_rows: int, batch_size: int) -> List[int]:
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}.")
+    full, rest = divmod(num_rows, batch_size)
+    return [batch_size] * full + ([rest] if rest else [])
+
+
+def shard_seeds(seed: int, num_shards: int) -> List[int]:
+    """Independent, reproducible per-shard seeds derived from one run seed."""
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(num_shards)]
+
+
+def seed_synthesizer(synthesizer: Any, seed: int) -> None:
+    """
+    Re-seeds every random source an SDV synthesizer samples from: the copula model
+    and the reversible data transformers (including Faker-backed PII columns). Only
+    the synthesizer's own generators are touched, never NumPy's global state, which
+    concurrent jobs in the same process share.
+    """
+    if hasattr(synthesizer, '_set_random_state'):
+        synthesizer._set_random_state(seed)
+
+    data_processor = getattr(synthesizer, '_data_processor', None)
+    hyper_transformer = getattr(data_processor, '_hyper_transformer', None)
+    for transformer in getattr(hyper_transformer, 'field_transformers', {}).values():
+        if hasattr(transformer, 'random_states'):
+            transformer.random_states['reverse_transform'] = np.random.RandomState(seed)
+        if hasattr(transformer, 'faker'):
+            transformer.faker.seed_instance(seed)
+
+
+def reset_sampling(synthesizer: Any) -> None:
+    """
+    Rewinds the synthesizer to its state right after fitting: key counters and regex
+    generators restart, so a cached model sampled by an earlier run produces the
+    same keys again for the same seed.
+    """
+    if hasattr(synthesizer, 'reset_sampling'):
+        synthesizer.reset_sampling()
+
+
+# --- Process-Pool Sampling Engine ---
+# Each worker unpickles the fitted synthesizer exactly once (pool initializer) and
+# then samples whole shards with a seed derived from (run seed, shard index).
+_WORKER_SYNTHESIZER = None
+
+
+def _init_worker(synthesizer_bytes: bytes) -> None:
+    global _WORKER_SYNTHESIZER
+    _WORKER_SYNTHESIZER = pickle.loads(synthesizer_bytes)
+
+
+def _sample_shard(shard: Tuple[int, int]) -> DataFrame:
+    rows, seed = shard
+    # A worker samples several shards: start each from the fitted state so a shard's
+    # output doesn't depend on which shards its worker sampled before. The worker
+    # process is private to this run, so its global RNG can be seeded as well.
+    reset_sampling(_WORKER_SYNTHESIZER)
+    np.random.seed(seed)
+    seed_synthesizer(_WORKER_SYNTHESIZER, seed)
+    return _WORKER_SYNTHESIZER.sample(num_rows=rows)
+
+
+def iter_parallel_batches(
+        synthesizer: Any,
+        num_rows: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int | None = None,
+        seed: int = DEFAULT_SEED
+) -> Iterator[DataFrame]:
+    """
+    Samples `num_rows` rows across a process pool, one shard per batch, yielding
+    shards in order. Output depends only on (seed, num_rows, batch_size), not on the
+    number of workers. At most 2 * workers shards are in flight, so memory stays
+    bounded when the consumer streams batches to disk.
+
+    Note: ID/PII columns are generated independently per shard, so values such as
+    primary keys are only guaranteed unique within a shard.
+    """
+    sizes = _shard_sizes(num_rows, batch_size)
+    shards = list(zip(sizes, shard_seeds(seed, len(sizes))))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(shards)))
+
+    # 'spawn' keeps workers safe to start from a multi-threaded API server process
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(pickle.dumps(synthesizer, protocol=pickle.HIGHEST_PROTOCOL),)
+    ) as executor:
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(_sample_shard, shard))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# --- Schema Cache Configuration ---
+# The schema prompt is a pure function of the dataframe statistics, so parsed LLM
+# schemas can be reused for identical prompts instead of calling the endpoint again.
+SCHEMA_CACHE_DIR = os.environ.get("SYNTH_SCHEMA_CACHE_DIR", "schema_cache")
+SCHEMA_CACHE_TTL_S = float(os.environ.get("SYNTH_SCHEMA_CACHE_TTL_S", 7 * 24 * 3600))
+SCHEMA_CACHE_MAX_MEMORY_ENTRIES = 256
+SCHEMA_CACHE_MAX_DISK_ENTRIES = int(os.environ.get("SYNTH_SCHEMA_CACHE_MAX_DISK_ENTRIES", 1024))
+
+
+def prompt_key(prompt: str) -> str:
+    """Cache key of an LLM prompt."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class SchemaCache:
+    """Two-tier (memory LRU + JSON files on disk) TTL cache of parsed schemas keyed by prompt hash."""
+
+    def __init__(self, cache_dir: str = SCHEMA_CACHE_DIR, ttl_s: float = SCHEMA_CACHE_TTL_S,
+                 max_memory_entries: int = SCHEMA_CACHE_MAX_MEMORY_ENTRIES,
+                 max_disk_entries: int = SCHEMA_CACHE_MAX_DISK_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl_s = ttl_s
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached schema for `key`, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] < self.ttl_s:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            try:
+                with open(self._path(key), "r") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+
+            if now - record['created_at'] >= self.ttl_s:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._remember(key, record['created_at'], record['schema'])
+            self.hits += 1
+            return record['schema']
+
+    def put(self, key: str, schema: Dict[str, Any]) -> None:
+        created_at = time.time()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with self._lock:
+            self._remember(key, created_at, schema)
+            with open(tmp_path, "w") as f:
+                json.dump({'created_at': created_at, 'schema': schema}, f)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+
+    def _remember(self, key: str, created_at: float, schema: Dict[str, Any]) -> None:
+        self._memory[key] = (created_at, schema)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _remove(self, key: str) -> None:
+        self._memory.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict_disk(self) -> None:
+        names = [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        if len(names) <= self.max_disk_entries:
+            return
+        names.sort(key=lambda name: os.path.getmtime(os.path.join(self.cache_dir, name)))
+        for name in names[:len(names) - self.max_disk_entries]:
+            os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'memory_entries': len(self._memory),
+            'ttl_s': self.ttl_s,
+        }
+
+
+# Shared process-wide cache used by the Schema Inference node
+SCHEMA_CACHE = SchemaCache()
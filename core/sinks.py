@@ -0,0 +1,281 @@
+import os
+import re
+import uuid
+from typing import Iterator, List, Optional
+import pandas as pd
+from pandas import DataFrame
+
+# --- Output Formats ---
+# CSV stays the default for compatibility; Parquet (zstd-compressed) is the smallest
+# on disk, and Arrow IPC/Feather (uncompressed) can be memory-mapped on read-back.
+OUTPUT_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.arrow',
+}
+DEFAULT_OUTPUT_FORMAT = 'csv'
+PARQUET_COMPRESSION = 'zstd'
+# Row groups / record batches are kept small enough that a preview page only
+# has to decode the chunk(s) it overlaps, not the whole file.
+CHUNK_ROWS = 65_536
+
+
+def _check_format(fmt: str) -> str:
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{fmt}'. Choose one of: {', '.join(OUTPUT_FORMATS)}.")
+    return fmt
+
+
+def output_path_for(project_id: str, fmt: str = DEFAULT_OUTPUT_FORMAT) -> str:
+    """Final location of a project's synthetic dataset in the given format."""
+    return f"synthetic_data_{project_id}{OUTPUT_FORMATS[_check_format(fmt)]}"
+
+
+def format_of(path: str) -> str:
+    """Infers the output format from a file extension."""
+    for fmt, ext in OUTPUT_FORMATS.items():
+        if path.endswith(ext):
+            return fmt
+    raise ValueError(f"Cannot infer output format of '{path}'.")
+
+
+def find_output(project_id: str) -> Optional[str]:
+    """Returns the most recently written output file for a project, in any format."""
+    candidates = [output_path_for(project_id, fmt) for fmt in OUTPUT_FORMATS]
+    existing = [path for path in candidates if os.path.exists(path)]
+    if not existing:
+        return None
+    return max(existing, key=os.path.getmtime)
+
+
+# --- Partial Files ---
+# Each write goes to its own `<path>.<token>.partial` file, so concurrent runs of one
+# project never write to the same file, and is moved onto `path` once it is complete.
+_PARTIAL_SUFFIX = re.compile(r"(\.[0-9a-f]{8})?\.partial$")
+
+
+def partial_path_for(path: str) -> str:
+    """A fresh, run-private partial file for the final output `path`."""
+    return f"{path}.{uuid.uuid4().hex[:8]}.partial"
+
+
+def publish_partial(partial_path: str) -> str:
+    """Atomically moves a finished `.partial` output to its final path and returns it."""
+    final_path = _PARTIAL_SUFFIX.sub("", partial_path)
+    if os.path.exists(final_path) and os.path.samefile(partial_path, final_path):
+        # A restored checkpoint linked the same file again; rename() would leave the partial behind
+        os.remove(partial_path)
+    else:
+        os.replace(partial_path, final_path)
+    return final_path
+
+
+def discard_partial(partial_path: Optional[str]) -> None:
+    """Deletes an unpublished partial output, if there is one."""
+    if partial_path and os.path.exists(partial_path):
+        os.remove(partial_path)
+
+
+# --- Whole-Frame Write / Read ---
+def write_frame(df: DataFrame, path: str) -> None:
+    """Writes a complete DataFrame in the format implied by `path`, replacing it atomically."""
+    fmt = format_of(path)
+    partial_path = partial_path_for(path)
+    try:
+        if fmt == 'csv':
+            df.to_csv(partial_path, index=False)
+        elif fmt == 'parquet':
+            df.to_parquet(partial_path, index=False, compression=PARQUET_COMPRESSION, row_group_size=CHUNK_ROWS)
+        else:
+            df.reset_index(drop=True).to_feather(partial_path, compression='uncompressed', chunksize=CHUNK_ROWS)
+    except BaseException:
+        discard_partial(partial_path)
+        raise
+    publish_partial(partial_path)
+
+
+def read_output(path: str) -> DataFrame:
+    """
+    Loads a stored output. Arrow IPC files are memory-mapped and Parquet is read
+    through a memory map, so neither goes through a text parse like CSV does.
+    """
+    fmt = format_of(path)
+    if fmt == 'csv':
+        return pd.read_csv(path)
+
+    import pyarrow as pa
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(path, memory_map=True).to_pandas()
+
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+# --- Partial Reads (Used by the paginated / streamed /data endpoints) ---
+def _open_arrow_file(path: str):
+    import pyarrow as pa
+    return pa.ipc.open_file(pa.memory_map(path, 'r'))
+
+
+def output_columns(path: str) -> List[str]:
+    """Column names of a stored output, read from its header/schema only."""
+    fmt = format_of(path)
+    if fmt == 'csv':
+        return pd.read_csv(path, nrows=0).columns.tolist()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).schema_arrow.names
+    return _open_arrow_file(path).schema.names
+
+
+def count_output_rows(path: str) -> int:
+    """
+    Row count of a stored output. Columnar formats answer from file metadata; CSV is
+    counted by scanning for newlines without parsing (quoted multi-line fields are
+    not accounted for).
+    """
+    fmt = format_of(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    if fmt == 'feather':
+        reader = _open_arrow_file(path)
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+    lines = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+    return max(lines - 1, 0)
+
+
+def read_output_slice(path: str, offset: int, limit: int, columns: Optional[List[str]] = None) -> DataFrame:
+    """
+    Reads rows [offset, offset + limit) of a stored output, optionally projected to
+    `columns`. Parquet decodes only the overlapping row groups and Arrow IPC slices
+    the memory map, so a page costs roughly the rows it returns.
+    """
+    fmt = format_of(path)
+    if fmt == 'csv':
+        return pd.read_csv(path, skiprows=range(1, offset + 1), nrows=limit, usecols=columns)
+
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        groups, first_row, start = [], None, 0
+        for i in range(parquet_file.num_row_groups):
+            rows = parquet_file.metadata.row_group(i).num_rows
+            if start + rows > offset and start < offset + limit:
+                groups.append(i)
+                first_row = start if first_row is None else first_row
+            start += rows
+        if not groups:
+            return parquet_file.schema_arrow.empty_table().select(columns or parquet_file.schema_arrow.names).to_pandas()
+        table = parquet_file.read_row_groups(groups, columns=columns)
+        return table.slice(offset - first_row, limit).to_pandas()
+
+    table = _open_arrow_file(path).read_all()
+    if columns:
+        table = table.select(columns)
+    return table.slice(offset, limit).to_pandas()
+
+
+def iter_output_batches(path: str, columns: Optional[List[str]] = None, batch_size: int = CHUNK_ROWS,
+                        offset: int = 0, limit: Optional[int] = None) -> Iterator[DataFrame]:
+    """
+    Yields rows [offset, offset + limit) of a stored output as DataFrame chunks of at
+    most `batch_size` rows, without ever materializing the whole file.
+    """
+    fmt = format_of(path)
+    if fmt == 'csv':
+        batches = pd.read_csv(path, usecols=columns, chunksize=batch_size)
+    else:
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            arrow_batches = pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size, columns=columns)
+        else:
+            table = _open_arrow_file(path).read_all()
+            arrow_batches = (table.select(columns) if columns else table).to_batches(max_chunksize=batch_size)
+        batches = (batch.to_pandas() for batch in arrow_batches)
+
+    remaining = limit
+    for batch in batches:
+        if offset >= batch.shape[0]:
+            offset -= batch.shape[0]
+            continue
+        if offset:
+            batch, offset = batch.iloc[offset:], 0
+        if remaining is not None:
+            batch = batch.iloc[:remaining]
+            remaining -= batch.shape[0]
+        yield batch
+        if remaining == 0:
+            return
+
+
+# --- Output Sinks (Used by Data Generation / Persistence Agents) ---
+class CsvSink:
+    """
+    Incremental CSV writer: batches are appended as they arrive so a streamed run
+    never holds more than one batch in memory. Writes go to a run-private `.partial`
+    file that is only published to `path` by `publish_partial()` once the run is approved.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.partial_path = partial_path_for(path)
+        self.rows_written = 0
+        self._file = open(self.partial_path, "w", newline="")
+
+    def write(self, batch: DataFrame) -> None:
+        batch.to_csv(self._file, index=False, header=self.rows_written == 0)
+        self.rows_written += batch.shape[0]
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class ArrowSink:
+    """
+    Incremental Parquet / Arrow IPC writer with the same contract as CsvSink. The
+    schema is fixed by the first batch and later batches are cast to it, so every
+    row group / record batch in the file shares one set of column types.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.partial_path = partial_path_for(path)
+        self.rows_written = 0
+        self.fmt = format_of(path)
+        self._writer = None
+        self._schema = None
+
+    def write(self, batch: DataFrame) -> None:
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(batch, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.partial_path, self._schema, compression=PARQUET_COMPRESSION)
+            else:
+                self._writer = pa.ipc.new_file(self.partial_path, self._schema)
+        if self.fmt == 'parquet':
+            self._writer.write_table(table, row_group_size=CHUNK_ROWS)
+        else:
+            self._writer.write_table(table, max_chunksize=CHUNK_ROWS)
+        self.rows_written += batch.shape[0]
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def open_sink(path: str):
+    """Returns an incremental sink for the format implied by `path`."""
+    return CsvSink(path) if format_of(path) == 'csv' else ArrowSink(path)
+
@@ -0,0 +1,309 @@
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+# --- Synthesizer Registry ---
+# Name -> (class name, factory(metadata_dict)). The class name is part of the model
+# cache key; SDV classes are imported only when a run actually selects them.
+DEFAULT_SYNTHESIZER = 'gaussian_copula'
+
+
+def _sdv_factory(class_name: str) -> Callable[[Dict[str, Any]], Any]:
+    def factory(metadata_dict: Dict[str, Any]) -> Any:
+        import sdv.single_table
+        from sdv.metadata import SingleTableMetadata
+
+        synthesizer_class = getattr(sdv.single_table, class_name)
+        return synthesizer_class(SingleTableMetadata.load_from_dict(metadata_dict))
+    return factory
+
+
+def _fast_factory(metadata_dict: Dict[str, Any]) -> Any:
+    return FastCopulaSynthesizer(metadata_dict)
+
+
+SYNTHESIZERS: Dict[str, tuple] = {
+    'gaussian_copula': ('GaussianCopulaSynthesizer', _sdv_factory('GaussianCopulaSynthesizer')),
+    'ctgan': ('CTGANSynthesizer', _sdv_factory('CTGANSynthesizer')),
+    'tvae': ('TVAESynthesizer', _sdv_factory('TVAESynthesizer')),
+    'copula_gan': ('CopulaGANSynthesizer', _sdv_factory('CopulaGANSynthesizer')),
+    'fast': ('FastCopulaSynthesizer', _fast_factory),
+}
+
+
+def check_synthesizer(name: str) -> str:
+    if name not in SYNTHESIZERS:
+        raise ValueError(f"Unknown synthesizer '{name}'. Choose one of: {', '.join(SYNTHESIZERS)}.")
+    return name
+
+
+def create_synthesizer(name: str, metadata_dict: Dict[str, Any]) -> Any:
+    """Instantiates the registered synthesizer `name` for the given SDV metadata dict."""
+    return SYNTHESIZERS[check_synthesizer(name)][1](metadata_dict)
+
+
+# --- NumPy Fast Engine ---
+# Quantile points kept per numeric marginal; sampling interpolates between them.
+FAST_QUANTILES = 1024
+# Columns of unmodelled sdtypes (free text / PII) with more distinct values than this
+# get placeholder values instead of resampled originals.
+FAST_MAX_RESAMPLED_VALUES = 1000
+
+
+class FastCopulaSynthesizer:
+    """
+    Lightweight Gaussian copula for previews. Fitting stores each column's empirical
+    marginal (a quantile grid for numbers/dates, frequencies for categories) and the
+    correlation matrix of the columns' normal scores. Sampling draws correlated
+    normals and maps them through each marginal's inverse CDF, fully vectorized.
+    Exposes the `fit` / `sample` interface used by the SDV synthesizers.
+    """
+
+    def __init__(self, metadata_dict: Dict[str, Any]):
+        self.metadata = metadata_dict
+        self.columns: List[str] = []
+        self.marginals: Dict[str, Dict[str, Any]] = {}
+        self.modelled: List[str] = []
+        self.cholesky: Optional[np.ndarray] = None
+        # Sufficient statistics of the normal scores, so appended rows can be folded in
+        self.num_rows = 0
+        self.score_sum: Optional[np.ndarray] = None
+        self.score_outer: Optional[np.ndarray] = None
+        self._rng = np.random.default_rng()
+        # Rows sampled so far: keys continue across sample() calls, as SDV's id generators do
+        self._sampled_rows = 0
+
+    def _set_random_state(self, seed: Optional[int]) -> None:
+        self._rng = np.random.default_rng(seed)
+
+    def reset_sampling(self) -> None:
+        """Restarts generated keys from the first one."""
+        self._sampled_rows = 0
+
+    # --- Fitting ---
+    def fit(self, df: DataFrame) -> None:
+        columns_meta = self.metadata.get('columns', {})
+        self.columns = list(df.columns)
+        self.marginals, self.modelled = {}, []
+        for column in self.columns:
+            column_meta = columns_meta.get(column, {})
+            marginal = self._fit_marginal(df[column], column_meta.get('sdtype', 'categorical'), column_meta)
+            self.marginals[column] = marginal
+            if marginal['kind'] in ('numerical', 'datetime', 'categorical'):
+                self.modelled.append(column)
+
+        self.num_rows = 0
+        self._sampled_rows = 0
+        self.score_sum = np.zeros(len(self.modelled))
+        self.score_outer = np.zeros((len(self.modelled), len(self.modelled)))
+        self._accumulate_scores(df)
+
+    def update(self, delta: DataFrame) -> None:
+        """
+        Folds appended rows into the fitted model without revisiting the original rows:
+        category counts and null counts are added, numeric marginals are merged as a
+        count-weighted mixture of CDFs, and the normal-score moments are accumulated.
+        """
+        if list(delta.columns) != self.columns:
+            raise ValueError("Appended rows must have the same columns as the fitted data.")
+        columns_meta = self.metadata.get('columns', {})
+        for column in self.columns:
+            marginal = self.marginals[column]
+            if marginal['kind'] in ('numerical', 'datetime'):
+                self._merge_numeric(marginal, self._numeric_values(delta[column], marginal['kind'] == 'datetime',
+                                                                   columns_meta.get(column, {})))
+            elif marginal['kind'] == 'categorical':
+                self._merge_categorical(marginal, delta[column])
+            elif marginal['kind'] == 'placeholder':
+                total = marginal['rows'] + len(delta)
+                marginal['null_fraction'] = (marginal['null_fraction'] * marginal['rows']
+                                             + float(delta[column].isna().sum())) / max(total, 1)
+                marginal['rows'] = total
+        self._accumulate_scores(delta)
+
+    @staticmethod
+    def _numeric_values(series: pd.Series, is_datetime: bool, column_meta: Dict[str, Any]) -> np.ndarray:
+        if is_datetime:
+            parsed = pd.to_datetime(series, errors='coerce', format=column_meta.get('datetime_format'))
+            values = parsed.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(float)
+            values[parsed.isna().to_numpy()] = np.nan
+            return values
+        return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+
+    def _fit_marginal(self, series: pd.Series, sdtype: str, column_meta: Dict[str, Any]) -> Dict[str, Any]:
+        n = len(series)
+        if sdtype == 'id':
+            numeric = pd.api.types.is_numeric_dtype(series)
+            return {'kind': 'id', 'numeric': numeric, 'dtype': series.dtype,
+                    'start': int(series.min()) if numeric and n else 0}
+
+        if sdtype in ('numerical', 'datetime'):
+            is_datetime = sdtype == 'datetime'
+            values = self._numeric_values(series, is_datetime, column_meta)
+            present = values[~np.isnan(values)]
+            if not present.size:
+                return {'kind': 'constant', 'value': np.nan, 'dtype': series.dtype}
+            levels = np.linspace(0, 1, min(FAST_QUANTILES, present.size))
+            return {
+                'kind': 'datetime' if is_datetime else 'numerical',
+                'levels': levels, 'quantiles': np.quantile(present, levels),
+                'count': int(present.size), 'null_count': int(n - present.size),
+                'null_fraction': float((n - present.size) / n),
+                'round': not is_datetime and bool(np.all(np.mod(present, 1) == 0)),
+                'dtype': series.dtype, 'datetime_format': column_meta.get('datetime_format'),
+                'string_dates': is_datetime and not pd.api.types.is_datetime64_any_dtype(series),
+            }
+
+        # categorical / boolean / ordinal, and unmodelled sdtypes with few distinct values
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)  # NaN is a category of its own
+        if sdtype not in ('categorical', 'boolean', 'ordinal') and len(uniques) > FAST_MAX_RESAMPLED_VALUES:
+            return {'kind': 'placeholder', 'rows': n, 'null_fraction': float(series.isna().mean()) if n else 0.0}
+        marginal = {'kind': 'categorical', 'values': np.asarray(uniques, dtype=object),
+                    'counts': np.bincount(codes, minlength=len(uniques)).astype(np.int64), 'dtype': series.dtype}
+        self._set_cumulative(marginal)
+        return marginal
+
+    @staticmethod
+    def _set_cumulative(marginal: Dict[str, Any]) -> None:
+        cumulative = np.cumsum(marginal['counts'] / max(int(marginal['counts'].sum()), 1))
+        cumulative[-1] = 1.0
+        marginal['cumulative'] = cumulative
+
+    @staticmethod
+    def _merge_numeric(marginal: Dict[str, Any], values: np.ndarray) -> None:
+        present = np.sort(values[~np.isnan(values)])
+        marginal['null_count'] += int(values.size - present.size)
+        if present.size:
+            old_count = marginal['count']
+            delta_quantiles = np.quantile(present, np.linspace(0, 1, min(FAST_QUANTILES, present.size)))
+            grid = np.union1d(marginal['quantiles'], delta_quantiles)
+            old_cdf = np.interp(grid, marginal['quantiles'], marginal['levels'], left=0.0, right=1.0)
+            new_cdf = np.searchsorted(present, grid, side='right') / present.size
+            cdf = (old_count * old_cdf + present.size * new_cdf) / (old_count + present.size)
+            marginal['count'] = old_count + int(present.size)
+            marginal['levels'] = np.linspace(0, 1, min(FAST_QUANTILES, marginal['count']))
+            marginal['quantiles'] = np.interp(marginal['levels'], np.maximum.accumulate(cdf), grid)
+            marginal['round'] = marginal['round'] and bool(np.all(np.mod(present, 1) == 0))
+        marginal['null_fraction'] = marginal['null_count'] / (marginal['count'] + marginal['null_count'])
+
+    def _merge_categorical(self, marginal: Dict[str, Any], series: pd.Series) -> None:
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        counts = np.bincount(codes, minlength=len(uniques))
+        index = pd.Index(marginal['values'])
+        positions = index.get_indexer(uniques)
+        new = positions < 0
+        if new.any():
+            marginal['values'] = np.concatenate([marginal['values'], np.asarray(uniques, dtype=object)[new]])
+            marginal['counts'] = np.concatenate([marginal['counts'], np.zeros(int(new.sum()), dtype=np.int64)])
+            positions[new] = np.arange(index.size, index.size + int(new.sum()))
+        np.add.at(marginal['counts'], positions, counts)
+        self._set_cumulative(marginal)
+
+    def _uniform_scores(self, column: str, series: pd.Series) -> np.ndarray:
+        """Each value's position on the column's fitted CDF (category midpoints for categories)."""
+        marginal = self.marginals[column]
+        if marginal['kind'] == 'categorical':
+            positions = pd.Index(marginal['values']).get_indexer(series)
+            probabilities = np.diff(np.concatenate([[0.0], marginal['cumulative']]))
+            return marginal['cumulative'][positions] - probabilities[positions] / 2
+        values = self._numeric_values(series, marginal['kind'] == 'datetime',
+                                      self.metadata.get('columns', {}).get(column, {}))
+        u = np.interp(values, marginal['quantiles'], marginal['levels'])
+        return np.where(np.isnan(values), 0.5, u)
+
+    def _accumulate_scores(self, df: DataFrame) -> None:
+        from scipy.special import ndtri
+
+        if self.modelled and len(df):
+            scores = np.column_stack([ndtri(np.clip(self._uniform_scores(column, df[column]), 1e-6, 1 - 1e-6))
+                                      for column in self.modelled])
+            self.score_sum += scores.sum(axis=0)
+            self.score_outer += scores.T @ scores
+        self.num_rows += len(df)
+        self._refresh_cholesky()
+
+    def _refresh_cholesky(self) -> None:
+        if not self.modelled or self.num_rows == 0:
+            self.cholesky = None
+            return
+        mean = self.score_sum / self.num_rows
+        covariance = self.score_outer / self.num_rows - np.outer(mean, mean)
+        scale = np.sqrt(np.clip(np.diag(covariance), 1e-12, None))
+        correlation = np.nan_to_num(covariance / np.outer(scale, scale))
+        np.fill_diagonal(correlation, 1.0)
+        # Clip to the nearest positive-definite matrix so the Cholesky factor exists
+        eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+        correlation = eigenvectors @ np.diag(np.clip(eigenvalues, 1e-6, None)) @ eigenvectors.T
+        scale = np.sqrt(np.diag(correlation))
+        self.cholesky = np.linalg.cholesky(correlation / np.outer(scale, scale))
+
+    # --- Sampling ---
+    def sample(self, num_rows: int) -> DataFrame:
+        from scipy.special import ndtr
+
+        rng = self._rng
+        uniforms = {}
+        if self.modelled:
+            z = rng.standard_normal((num_rows, len(self.modelled))) @ self.cholesky.T
+            u = ndtr(z)
+            uniforms = {column: u[:, i] for i, column in enumerate(self.modelled)}
+
+        # Models cached before the key counter existed start from the first key
+        offset = getattr(self, '_sampled_rows', 0)
+        data = {}
+        for column in self.columns:
+            marginal = self.marginals[column]
+            if marginal['kind'] == 'id':
+                data[column] = self._sample_ids(column, marginal, offset, num_rows)
+            else:
+                data[column] = self._sample_column(column, marginal, uniforms.get(column), num_rows, rng)
+        self._sampled_rows = offset + num_rows
+        return pd.DataFrame(data, columns=self.columns)
+
+    @staticmethod
+    def _sample_ids(column: str, marginal: Dict[str, Any], offset: int, num_rows: int):
+        """Consecutive keys after the `offset` already generated; numeric keys are int64 so they never wrap."""
+        if marginal['numeric']:
+            start = marginal['start'] + offset
+            return np.arange(start, start + num_rows, dtype=np.int64)
+        return np.array([f"{column}_{i}" for i in range(offset, offset + num_rows)], dtype=object)
+
+    @staticmethod
+    def _sample_column(column: str, marginal: Dict[str, Any], u: Optional[np.ndarray], num_rows: int, rng):
+        kind = marginal['kind']
+        if kind == 'placeholder':
+            values = pd.Series([f"{column}_{i}" for i in range(num_rows)], dtype=object)
+            return values.mask(rng.random(num_rows) < marginal['null_fraction'])
+
+        if kind == 'constant':
+            return pd.Series(np.full(num_rows, marginal['value']))
+
+        if kind == 'categorical':
+            index = np.searchsorted(marginal['cumulative'], u, side='right')
+            values = pd.Series(marginal['values'][np.minimum(index, marginal['values'].size - 1)])
+            if marginal['dtype'] != object:
+                # Restore the column's dtype (ints, bools, category) unless missing values prevent it
+                try:
+                    return values.astype(marginal['dtype'])
+                except (TypeError, ValueError):
+                    pass
+            return values
+
+        values = np.interp(u, marginal['levels'], marginal['quantiles'])
+        missing = rng.random(num_rows) < marginal['null_fraction']
+        if kind == 'datetime':
+            dates = pd.Series(pd.to_datetime(values.astype('int64'))).mask(missing)
+            if marginal['string_dates']:
+                fmt = marginal['datetime_format'] or (
+                    '%Y-%m-%d' if (dates.dropna().dt.normalize() == dates.dropna()).all() else '%Y-%m-%d %H:%M:%S')
+                return dates.dt.strftime(fmt)
+            return dates
+
+        if marginal['round']:
+            values = np.round(values)
+        series = pd.Series(values).mask(missing)
+        if pd.api.types.is_integer_dtype(marginal['dtype']) and not missing.any():
+            return series.astype(marginal['dtype'])
+        return series
@@ -1,11 +1,127 @@
 import pandas as pd
+import numpy as np
 import json
 import io
-from langchain.tools import tool
-from sdv.single_table import GaussianCopulaSynthesizer
-from sdv.metadata import SingleTableMetadata
+import os
+import warnings
+# langchain_core's decorator is the one langchain.tools re-exports, minus ~1s of imports
+from langchain_core.tools import tool
 from pandas import DataFrame
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from core.incremental import DATASET_REGISTRY
+from core.metadata import detect_metadata
+from core.model_cache import MODEL_CACHE, dataset_fingerprint
+from core.synthesizers import DEFAULT_SYNTHESIZER, SYNTHESIZERS, check_synthesizer, create_synthesizer
+
+
+# --- Profiling Configuration ---
+# Above APPROX_ROWS_THRESHOLD rows, moments are computed on a uniform row sample and
+# distinct counts with a K-minimum-values sketch instead of exact full-table passes.
+APPROX_ROWS_THRESHOLD = int(os.environ.get("SYNTH_PROFILE_APPROX_ROWS", 1_000_000))
+PROFILE_SAMPLE_ROWS = 100_000
+DISTINCT_SKETCH_K = 4096
+TOP_VALUES_MAX_CARDINALITY = 20
+
+
+def approx_distinct_count(col: pd.Series, k: int = DISTINCT_SKETCH_K) -> int:
+    """
+    K-minimum-values distinct-count estimate (HyperLogLog-style sketch): hash every
+    value to 64 bits and infer the cardinality from the k-th smallest distinct hash,
+    using O(n) selection instead of a full sort or hash table. Low-cardinality
+    columns, where the sketch carries no information, are counted exactly.
+    """
+    hashes = pd.util.hash_pandas_object(col.dropna(), index=False).to_numpy()
+    if hashes.size <= k:
+        return int(np.unique(hashes).size)
+    threshold = np.partition(hashes, k - 1)[k - 1]
+    distinct_below = np.unique(hashes[hashes <= threshold]).size
+    if distinct_below < 64:
+        return int(col.nunique())
+    return int((distinct_below - 1) / (float(threshold) / 2.0 ** 64))
+
+
+def _block_distinct_counts(block: np.ndarray) -> np.ndarray:
+    """Exact per-column distinct counts of a float block (NaN excluded) via one column-wise sort."""
+    ordered = np.sort(block, axis=0)
+    valid = ~np.isnan(ordered)  # NaNs sort to the end of each column
+    changes = (ordered[1:] != ordered[:-1]) & valid[1:]
+    return changes.sum(axis=0) + valid[0]
+
+
+def profile_dataframe(df: DataFrame, approximate: bool | None = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Single-pass column profile used to prompt the Schema Inference Agent. Numeric
+    moments and cardinalities come from NumPy reductions over the whole numeric
+    block, and top values are computed only for low-cardinality non-numeric columns.
+    `approximate` defaults to True above APPROX_ROWS_THRESHOLD rows; it then takes
+    mean/std from a uniform row sample and numeric distinct counts from a sketch.
+    """
+    if approximate is None:
+        approximate = len(df) > APPROX_ROWS_THRESHOLD
+    sample_df = df.sample(n=PROFILE_SAMPLE_ROWS, random_state=0) if approximate and len(df) > PROFILE_SAMPLE_ROWS else df
+
+    numeric_columns = [c for c, dtype in df.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)]
+    other_columns = [c for c in df.columns if c not in set(numeric_columns)]
+
+    # 1. Cardinalities: one hash pass over the non-numeric columns
+    unique_counts = df[other_columns].nunique().to_dict() if other_columns else {}
+
+    # 2. Numeric block: a single float64 matrix reduced column-wise in NumPy.
+    # Min/max stay exact (cheap); mean/std use the sample in approximate mode.
+    numeric_stats = {}
+    if numeric_columns:
+        block = df[numeric_columns].to_numpy(dtype='float64', na_value=np.nan)
+        moments_block = block if sample_df is df else sample_df[numeric_columns].to_numpy(dtype='float64', na_value=np.nan)
+
+        if np.isnan(block).any():
+            with warnings.catch_warnings():
+                # All-NaN columns legitimately produce NaN statistics
+                warnings.simplefilter("ignore", RuntimeWarning)
+                means = np.nanmean(moments_block, axis=0)
+                stds = np.nanstd(moments_block, axis=0, ddof=1)
+                mins = np.nanmin(block, axis=0)
+                maxs = np.nanmax(block, axis=0)
+        else:
+            # Fast path: no missing values, so skip the NaN-masking copies
+            means = moments_block.mean(axis=0)
+            stds = moments_block.std(axis=0, ddof=1) if moments_block.shape[0] > 1 else np.full(len(numeric_columns), np.nan)
+            mins = block.min(axis=0)
+            maxs = block.max(axis=0)
+
+        if approximate:
+            unique_counts.update({c: approx_distinct_count(df[c]) for c in numeric_columns})
+        else:
+            unique_counts.update(zip(numeric_columns, _block_distinct_counts(block)))
+
+        for i, column in enumerate(numeric_columns):
+            # FIX: Cast numpy types to standard Python types (float/int/bool)
+            dtype = df[column].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                cast = bool
+            elif pd.api.types.is_integer_dtype(dtype) and not np.isnan(mins[i]):
+                cast = int
+            else:
+                cast = float
+            numeric_stats[column] = {
+                'mean': float(means[i]),
+                'std': float(stds[i]),
+                'min': cast(mins[i]),
+                'max': cast(maxs[i])
+            }
+
+    # 3. Assemble, with top values only where cardinality is low
+    summary = {}
+    for column, dtype in df.dtypes.items():
+        # FIX: Cast nunique to standard Python int for JSON serialization
+        stats = {'type': str(dtype), 'unique_count': int(unique_counts[column])}
+        if column in numeric_stats:
+            stats.update(numeric_stats[column])
+        elif unique_counts[column] < TOP_VALUES_MAX_CARDINALITY:
+            # FIX: Ensure list items are standard types
+            stats['top_values'] = df[column].value_counts().head(5).index.tolist()
+        summary[column] = stats
+
+    return summary
 
 
 # --- Tool 1: Pandas Analysis (Used by Schema Inference Agent) ---
@@ -13,59 +129,160 @@ from typing import Dict, Any
 def analyze_dataframe_stats(df: DataFrame) -> str:
     """
     Analyzes a Pandas DataFrame (df) to extract key statistical information
-    needed for synthetic data generation. Returns a JSON string summary.
+    needed for synthetic data generation. Returns a compact JSON string summary.
     """
-    summary = {}
     if df.empty: return "DataFrame is empty, cannot perform analysis."
 
-    for column in df.columns:
-        col = df[column]
-        col_type = col.dtype
-        # FIX: Cast nunique to standard Python int for JSON serialization
-        stats = {'type': str(col_type), 'unique_count': int(col.nunique())}
-
-        if pd.api.types.is_numeric_dtype(col_type):
-            # FIX: Cast numpy types to standard Python types (float/int)
-            stats.update({
-                'mean': float(col.mean()),
-                'std': float(col.std()),
-                'min': col.min().item() if hasattr(col.min(), 'item') else col.min(),
-                'max': col.max().item() if hasattr(col.max(), 'item') else col.max()
-            })
-        elif col.nunique() < 20 and not pd.api.types.is_numeric_dtype(col_type):
-            # FIX: Ensure list items are standard types
-            stats['top_values'] = col.value_counts().head(5).index.tolist()
+    # Compact separators: the summary is sent to the LLM, so whitespace costs tokens
+    return json.dumps(profile_dataframe(df), separators=(',', ':'), default=str)
 
-        summary[column] = stats
 
-    return json.dumps(summary, indent=2)
+# --- Rule-Based Schema Inference (Offline fallback for the Schema Inference Agent) ---
+def infer_schema_from_stats(stats: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Deterministically derives a schema in the same shape the LLM is asked for
+    (column -> type plus min/max/top_values) from `analyze_dataframe_stats` output.
+    Used when the LLM endpoint is unavailable, too slow, or returns invalid JSON.
+    """
+    schema = {}
+    for column, col_stats in stats.items():
+        dtype = str(col_stats.get('type', 'object'))
+
+        if dtype.startswith('bool'):
+            col_type = 'boolean'
+        elif dtype.startswith(('int', 'uint', 'Int', 'UInt')):
+            col_type = 'int'
+        elif dtype.startswith(('float', 'Float')):
+            col_type = 'float'
+        elif dtype.startswith('datetime'):
+            col_type = 'datetime'
+        elif 'top_values' in col_stats or dtype == 'category':
+            col_type = 'category'
+        else:
+            col_type = 'string'
+
+        entry = {'type': col_type}
+        for limit in ('min', 'max', 'top_values'):
+            if limit in col_stats:
+                entry[limit] = col_stats[limit]
+        schema[column] = entry
+
+    return schema
 
 
 # --- Tool 2: SDV Synthesis (Used by Data Generation Agent) ---
-@tool
-def generate_synthetic_data_tool(original_data_csv: str, num_rows: int = 5000) -> str:
+SYNTHESIZER_PARAMS = {'synthesizer': 'GaussianCopulaSynthesizer', 'metadata': 'detect_from_dataframe'}
+
+
+def _model_cache_key(df: DataFrame, metadata_dict: Optional[Dict[str, Any]], synthesizer_name: str) -> str:
+    params = dict(SYNTHESIZER_PARAMS, synthesizer=SYNTHESIZERS[check_synthesizer(synthesizer_name)][0])
+    if metadata_dict:
+        params['metadata'] = metadata_dict
+    return dataset_fingerprint(df, params)
+
+
+def _object_categories(df: DataFrame) -> DataFrame:
+    # The loader stores low-cardinality strings as 'category'; SDV's categorical
+    # transformers fit noticeably worse on that dtype than on plain object columns
+    categorical = df.select_dtypes('category').columns
+    if len(categorical):
+        df = df.astype({column: object for column in categorical})
+    return df
+
+
+def fit_synthesizer(df: DataFrame, metadata_dict: Optional[Dict[str, Any]] = None,
+                    synthesizer_name: str = DEFAULT_SYNTHESIZER,
+                    schema: Optional[Dict[str, Any]] = None, record: bool = False) -> Tuple[Any, bool]:
     """
-    Generates synthetic data using the SDV library (GaussianCopula).
-    Returns the synthetic data as a CSV string.
+    Returns a fitted synthesizer from the registry (GaussianCopula by default) for
+    `df` and whether it came from the model cache. Uses `metadata_dict` (the
+    pipeline's shared metadata) when given and only detects metadata otherwise.
+    On a cache hit both metadata handling and fitting are skipped. With `record`
+    (incremental runs), the model is recorded in the dataset registry so a later
+    appended version can build on it; that hashes every row, so other runs skip it.
     """
-    try:
-        df = pd.read_csv(io.StringIO(original_data_csv))
+    # FIX: Drop index column if it exists to prevent SDV errors
+    if 'Unnamed: 0' in df.columns:
+        df = df.drop(columns=['Unnamed: 0'])
 
-        # FIX: Drop index column if it exists to prevent SDV errors
-        if 'Unnamed: 0' in df.columns:
-            df = df.drop(columns=['Unnamed: 0'])
+    cache_key = _model_cache_key(df, metadata_dict, synthesizer_name)
+    synthesizer = MODEL_CACHE.get(cache_key)
+    cache_hit = synthesizer is not None
+    if not cache_hit:
+        df = _object_categories(df)
 
-        # FIX: Instantiate metadata object first (Required for SDV 1.0+)
-        metadata = SingleTableMetadata()
-        metadata.detect_from_dataframe(data=df)
+        # SDV is imported lazily (inside detect_metadata and the registry factories):
+        # it is the heaviest dependency and is only needed to fit
+        if not metadata_dict:
+            metadata_dict = detect_metadata(df)
 
-        # Initialize, fit, and sample the synthesizer
-        synthesizer = GaussianCopulaSynthesizer(metadata)
+        # Initialize and fit the synthesizer
+        synthesizer = create_synthesizer(synthesizer_name, metadata_dict)
         synthesizer.fit(df)
+        MODEL_CACHE.put(cache_key, synthesizer)
+
+    if record:
+        # Cache hits too: the model may have been fitted by a run that didn't record it
+        DATASET_REGISTRY.record(df, SYNTHESIZERS[synthesizer_name][0], cache_key, metadata_dict, schema)
+    return synthesizer, cache_hit
 
-        synthetic_df = synthesizer.sample(num_rows=num_rows)
+
+def refit_incremental(df: DataFrame, base: Dict[str, Any], metadata_dict: Optional[Dict[str, Any]] = None,
+                      synthesizer_name: str = DEFAULT_SYNTHESIZER,
+                      schema: Optional[Dict[str, Any]] = None) -> Optional[Tuple[Any, bool]]:
+    """
+    Updates the model fitted on `base` (a dataset registry record that `df` extends
+    by appending rows) with only the appended rows. Returns (synthesizer, cache_hit)
+    like fit_synthesizer, or None when the base model is gone or the engine cannot
+    be updated incrementally, in which case the caller should fit from scratch.
+
+    Only engines with an `update` method can be updated, which today is just the
+    'fast' engine; SDV models (gaussian_copula, ctgan, ...) always refit, and an
+    incremental run only saves them the schema inference.
+    """
+    if 'Unnamed: 0' in df.columns:
+        df = df.drop(columns=['Unnamed: 0'])
+
+    cache_key = _model_cache_key(df, metadata_dict, synthesizer_name)
+    synthesizer = MODEL_CACHE.get(cache_key)
+    if synthesizer is not None:
+        return synthesizer, True
+
+    class_name = SYNTHESIZERS[check_synthesizer(synthesizer_name)][0]
+    base_key = base.get('models', {}).get(class_name)
+    synthesizer = MODEL_CACHE.get(base_key) if base_key else None
+    if synthesizer is None or not hasattr(synthesizer, 'update'):
+        return None
+
+    synthesizer.update(_object_categories(df.iloc[base['rows']:]))
+    MODEL_CACHE.put(cache_key, synthesizer)
+    DATASET_REGISTRY.record(df, class_name, cache_key, metadata_dict or base.get('metadata'), schema)
+    return synthesizer, False
+
+
+def synthesize_dataframe(df: DataFrame, num_rows: int = 5000, synthesizer_name: str = DEFAULT_SYNTHESIZER) -> DataFrame:
+    """
+    DataFrame-native synthesis path used in-process by the Data Generation node.
+    Fits (or reuses a cached) synthesizer on `df` and returns the sampled rows
+    without any CSV round-trip, so column dtypes survive the handoff. Raises on failure.
+    """
+    synthesizer, _ = fit_synthesizer(df, synthesizer_name=synthesizer_name)
+    return synthesizer.sample(num_rows=num_rows)
+
+
+@tool
+def generate_synthetic_data_tool(original_data_csv: str, num_rows: int = 5000,
+                                 synthesizer: str = DEFAULT_SYNTHESIZER) -> str:
+    """
+    Generates synthetic data using a registered synthesizer: 'gaussian_copula'
+    (default), 'ctgan', 'tvae', 'copula_gan' (SDV) or 'fast' (NumPy preview engine).
+    Returns the synthetic data as a CSV string.
+    """
+    try:
+        df = pd.read_csv(io.StringIO(original_data_csv))
+        synthetic_df = synthesize_dataframe(df, num_rows=num_rows, synthesizer_name=synthesizer)
 
         return synthetic_df.to_csv(index=False)
 
     except Exception as e:
-        return f"SYNTHESIS_ERROR: {e}"
\ No newline at end of file
+        return f"SYNTHESIS_ERROR: {e}"
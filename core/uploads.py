@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# --- Upload Configuration ---
+# Multipart upload bodies are parsed as they arrive and the file part is streamed to
+# disk while being hashed and stored under its SHA-256 (uploads/<sha256>.csv), so
+# re-uploading the same file is a no-op and the content hash doubles as a stable key
+# for anything derived from the input.
+UPLOAD_DIR = os.environ.get("SYNTH_UPLOAD_DIR", "uploads")
+UPLOAD_MAX_BYTES = int(os.environ.get("SYNTH_UPLOAD_MAX_BYTES", 1024 ** 3))
+# Multipart bodies carry boundaries, part headers and other form fields on top of the file itself
+UPLOAD_MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+class InvalidUpload(ValueError):
+    """Raised for a malformed multipart body, a missing file part or a disallowed file type."""
+
+
+def content_path(upload_dir: str, digest: str, suffix: str = ".csv") -> str:
+    return os.path.join(upload_dir, f"{digest}{suffix}")
+
+
+class _ContentAddressedWriter:
+    """Writes an upload to a temporary file while hashing it, then moves it to its content address."""
+
+    def __init__(self, upload_dir: str, max_bytes: int, suffix: str):
+        os.makedirs(upload_dir, exist_ok=True)
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.tmp_path = os.path.join(upload_dir, f".upload-{uuid.uuid4().hex}.tmp")
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self._out = None
+
+    async def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge(f"Upload exceeds the {self.max_bytes:,} byte limit.")
+        self.digest.update(data)
+        if self._out is None:
+            self._out = await asyncio.to_thread(open, self.tmp_path, "wb")
+        await asyncio.to_thread(self._out.write, data)
+
+    async def commit(self) -> Dict[str, Any]:
+        if self._out is None:
+            self._out = await asyncio.to_thread(open, self.tmp_path, "wb")
+        await asyncio.to_thread(self._out.close)
+        file_path = content_path(self.upload_dir, self.digest.hexdigest(), self.suffix)
+        deduplicated = os.path.exists(file_path)
+        if deduplicated:
+            os.remove(self.tmp_path)
+        else:
+            os.replace(self.tmp_path, file_path)
+        return {'file_path': file_path, 'sha256': self.digest.hexdigest(), 'size_bytes': self.size,
+                'deduplicated': deduplicated}
+
+    def abort(self) -> None:
+        if self._out is not None:
+            self._out.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+async def store_upload(body: AsyncIterator[bytes], content_type: str, upload_dir: str = UPLOAD_DIR,
+                       max_bytes: int = UPLOAD_MAX_BYTES, field_name: str = "file",
+                       suffix: str = ".csv") -> Dict[str, Any]:
+    """
+    Parses a multipart/form-data request body (e.g. Starlette's `request.stream()`) as
+    it arrives and streams its `field_name` file part to a temporary file in
+    `upload_dir`, hashing it on the way, then moves it to its content address. The file
+    is written once, never spooled first, and the size limit applies to the bytes
+    received, with or without a Content-Length. Disk writes run in a worker thread so
+    the event loop never blocks. Returns the stored path, hex digest, size, whether an
+    identical file was already stored and the client's filename. Raises UploadTooLarge
+    past `max_bytes` and InvalidUpload for a malformed body, a missing file part or a
+    filename without `suffix`, leaving nothing behind either way.
+    """
+    from python_multipart.multipart import MultipartParser, parse_options_header
+
+    mime_type, options = parse_options_header(content_type)
+    if mime_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise InvalidUpload("Expected a multipart/form-data body.")
+
+    # Parser callbacks run synchronously inside parser.write(); file data they collect
+    # from each received chunk is written out after it
+    header_field, header_value = bytearray(), bytearray()
+    headers: Dict[bytes, bytes] = {}
+    pending: List[bytes] = []
+    filename: Optional[str] = None
+    in_file = complete = False
+
+    def on_part_begin() -> None:
+        headers.clear()
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header_value.extend(data[start:end])
+
+    def on_header_end() -> None:
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished() -> None:
+        nonlocal filename, in_file
+        _, params = parse_options_header(headers.get(b"content-disposition", b""))
+        if filename is None and params.get(b"name") == field_name.encode() and b"filename" in params:
+            filename = params[b"filename"].decode("utf-8", "replace")
+            in_file = True
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if in_file:
+            pending.append(data[start:end])
+
+    def on_part_end() -> None:
+        nonlocal in_file, complete
+        complete = complete or in_file
+        in_file = False
+
+    parser = MultipartParser(options[b"boundary"], {
+        'on_part_begin': on_part_begin, 'on_header_field': on_header_field, 'on_header_value': on_header_value,
+        'on_header_end': on_header_end, 'on_headers_finished': on_headers_finished,
+        'on_part_data': on_part_data, 'on_part_end': on_part_end,
+    })
+    writer = _ContentAddressedWriter(upload_dir, max_bytes, suffix)
+    received = 0
+    try:
+        async for chunk in body:
+            # Form fields besides the file count too, so no part can stream forever
+            received += len(chunk)
+            if received > max_bytes + UPLOAD_MULTIPART_OVERHEAD:
+                raise UploadTooLarge(f"Upload exceeds the {max_bytes:,} byte limit.")
+            try:
+                parser.write(chunk)
+            except ValueError as e:
+                raise InvalidUpload(f"Malformed multipart body: {e}")
+            if filename is not None and not filename.lower().endswith(suffix):
+                raise InvalidUpload(f"Only {suffix.lstrip('.').upper()} files are allowed.")
+            if pending:
+                await writer.write(b"".join(pending))
+                pending.clear()
+        parser.finalize()
+        if not complete:
+            raise InvalidUpload(f"The body has no complete '{field_name}' file part.")
+        stored = await writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+    return {**stored, 'filename': filename}
@@ -1,13 +1,20 @@
+import uuid
+
 import pandas as pd
 from langgraph.graph import StateGraph, END
 from typing import Dict, Any
 
 # Import the shared state
+from core.artifacts import ARTIFACT_STORE
+from core.checkpoints import checkpoint_node
 from core.graph_state import GenerationState
+from core.instrumentation import instrument_node
+from core.sinks import discard_partial
 
 # Import the nodes
 from nodes.data_loader import data_loader
 from nodes.schema_inference import schema_inference
+from nodes.model_fitting import model_fitting
 from nodes.data_generation import data_generation
 from nodes.quality_check import quality_check
 from nodes.data_saver import data_saver
@@ -17,17 +24,24 @@ from nodes.data_saver import data_saver
 def build_generation_graph():
     builder = StateGraph(GenerationState)
 
-    # 1. Add the nodes
-    builder.add_node("data_loader", data_loader)
-    builder.add_node("schema_inference", schema_inference)
-    builder.add_node("data_generation", data_generation)
-    builder.add_node("quality_check", quality_check)
-    builder.add_node("data_saver", data_saver)
-
-    # 2. Define the Edges (Sequential Flow)
+    # 1. Add the nodes (each wrapped to record timing/memory into state['node_metrics']).
+    # All but data_saver restore their output from a checkpoint when the run enables it.
+    builder.add_node("data_loader", instrument_node("data_loader", checkpoint_node("data_loader", data_loader)))
+    builder.add_node("schema_inference",
+                     instrument_node("schema_inference", checkpoint_node("schema_inference", schema_inference)))
+    builder.add_node("model_fitting", instrument_node("model_fitting", checkpoint_node("model_fitting", model_fitting)))
+    builder.add_node("data_generation",
+                     instrument_node("data_generation", checkpoint_node("data_generation", data_generation)))
+    builder.add_node("quality_check", instrument_node("quality_check", checkpoint_node("quality_check", quality_check)))
+    builder.add_node("data_saver", instrument_node("data_saver", data_saver))
+
+    # 2. Define the Edges: schema inference and model fitting fan out from the loader
+    # and join before generation. model_fitting is a no-op unless state['parallel'] is set,
+    # so the default run is still sequential; in parallel mode the fit overlaps the LLM call.
     builder.set_entry_point("data_loader")
     builder.add_edge("data_loader", "schema_inference")
-    builder.add_edge("schema_inference", "data_generation")
+    builder.add_edge("data_loader", "model_fitting")
+    builder.add_edge(["schema_inference", "model_fitting"], "data_generation")
     builder.add_edge("data_generation", "quality_check")
 
     # 3. Define the Conditional Edge for Error Handling
@@ -53,6 +67,19 @@ def build_generation_graph():
     return builder.compile()
 
 
+# --- Optional Warm-Up ---
+def warm_up() -> None:
+    """
+    Eagerly imports the heavy libraries the nodes load lazily (SDV, SDMetrics) and
+    initializes the LLM client, so the first pipeline run doesn't pay for them.
+    """
+    import sdv.single_table  # noqa: F401
+    import sdmetrics.reports.single_table  # noqa: F401
+    from nodes.schema_inference import warm_up_llm
+
+    warm_up_llm()
+
+
 # Example Usage (Used for testing/running the graph)
 if __name__ == "__main__":
     # Create a dummy CSV file for demonstration
@@ -71,18 +98,49 @@ if __name__ == "__main__":
 
     initial_state = GenerationState(
         project_id="P_001",
+        job_id=None,  # Set by the API's job queue; None runs without cancellation checks
+        run_id=uuid.uuid4().hex,
         input_file_path=dummy_file,
-        original_data=None,  # Loaded by data_loader
+        original_data_ref=None,  # Stored by data_loader
+        load_engine='pandas',
+        load_sample_rows=None,  # Set to fit on a reservoir sample of very large inputs
+        load_stats={},
+        incremental=False,  # True updates the model of an earlier input this file only appends to
+        append_base=None,
+        data_stats=None,
         inferred_schema={},
         user_constraints=[],
-        synthetic_data=None,
+        metadata=None,
+        num_rows=5000,
+        synthesizer='gaussian_copula',
+        parallel=False,  # True fits the model concurrently with the LLM schema call
+        prefit_metadata=None,
+        prefit_error=None,
+        batch_size=1000,  # Smaller than num_rows to exercise the streamed path
+        workers=1,
+        seed=None,
+        output_format='csv',
+        quality_mode='auto',
+        quality_row_budget=50_000,
+        quality_max_column_pairs=200,
+        quality_time_budget_s=60.0,
+        quality_threshold=None,  # e.g. 0.8 fails runs scoring lower
+        synthetic_data_ref=None,
+        streamed_output_path=None,
         quality_report={},
+        output_path=None,
+        output_row_count=0,
         status='Initialized',
         log_messages=[],
-        error_message=None
+        error_message=None,
+        node_metrics=[],
+        profile_nodes=False,  # True dumps a cProfile per node under profiles/
+        checkpoint=False,  # True restores node outputs of an earlier run with the same input and parameters
+        executed_nodes=[]
     )
 
     print("--- Starting Agentic Synthetic Data Pipeline ---")
+    final_state = initial_state
     try:
         final_state = app_graph.invoke(initial_state)
 
@@ -99,4 +157,9 @@ if __name__ == "__main__":
             print(f"Overall Quality Score: {final_state.get('quality_report', {}).get('Overall Score', 'N/A')}")
 
     except Exception as e:
-        print(f"\n❌ CRITICAL GRAPH EXECUTION ERROR: {e}")
\ No newline at end of file
+        print(f"\n❌ CRITICAL GRAPH EXECUTION ERROR: {e}")
+    finally:
+        ARTIFACT_STORE.release(initial_state['run_id'])
+        if not final_state.get('output_path'):
+            # Validation failed: the streamed output was never published
+            discard_partial(final_state.get('streamed_output_path'))
\ No newline at end of file
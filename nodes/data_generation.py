@@ -1,30 +1,131 @@
-import io
+import time
 from typing import Dict, Any
+from core.artifacts import ARTIFACT_STORE, run_id_for
 from core.graph_state import GenerationState
-from core.tools import generate_synthetic_data_tool  # Import the tool
-import pandas as pd
+from core.tools import fit_synthesizer, refit_incremental  # DataFrame-native synthesis path
+from core.synthesizers import DEFAULT_SYNTHESIZER
+from core.constraints import ConstraintError, compile_constraints
+from core.jobs import JobCancelled, check_cancelled
+from core.sampling import (
+    DEFAULT_BATCH_SIZE, DEFAULT_SEED, iter_constrained_batches, iter_parallel_batches, iter_synthetic_batches,
+)
+from core.progress import PROGRESS
+from core.sinks import DEFAULT_OUTPUT_FORMAT, discard_partial, open_sink, output_path_for
+
+
+def _publish_sampling(state: GenerationState, rows: int, num_rows: int, batches: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    PROGRESS.publish(state['project_id'], 'sampling', run_id=state.get('run_id'), rows_generated=rows,
+                     num_rows=num_rows, batches=batches, rows_per_sec=rows / elapsed if elapsed > 0 else None)
 
 
 def data_generation(state: GenerationState) -> Dict[str, Any]:
-    """LangGraph node: Orchestrates the synthetic data generation using SDV Tool."""
+    """
+    LangGraph node: Orchestrates the synthetic data generation using SDV Tool.
+    user_constraints are compiled into vectorized masks and enforced per sampled batch.
+    """
+
+    # --- SAFETY CHECK: Nothing to synthesize when loading or schema inference failed ---
+    df = ARTIFACT_STORE.get(state.get('original_data_ref'))
+    if state.get('status') == 'Error' or df is None:
+        return {
+            'status': 'Error',
+            'error_message': state.get('error_message') or "Synthesis skipped: the input data was not loaded.",
+            'log_messages': ["Synthesis skipped due to previous error."]
+        }
+
+    num_rows = state.get('num_rows') or 5000
+    batch_size = state.get('batch_size') or DEFAULT_BATCH_SIZE
+    workers = state.get('workers') or 1
+    seed = state.get('seed')
+    output_format = state.get('output_format') or DEFAULT_OUTPUT_FORMAT
+    synthesizer_name = state.get('synthesizer') or DEFAULT_SYNTHESIZER
 
-    df = state['original_data']
-    original_data_csv = df.to_csv(index=False)
+    sampling_stats: Dict[str, Any] = {}
 
-    # Execute the synthesis tool
-    result_csv_str = generate_synthetic_data_tool.invoke({
-        'original_data_csv': original_data_csv,
-        'num_rows': 5000
-    })
+    # Execute the synthesis in-process: frames go in and come out directly,
+    # no CSV text is materialized and dtypes are preserved.
+    try:
+        constraints = compile_constraints(state.get('user_constraints'), df.columns)
+        append_base = state.get('append_base')
+        fitted = None
+        if append_base:
+            # Append-only input: update the base version's model from the new rows when the engine allows it
+            fitted = refit_incremental(df, append_base, state.get('metadata'), synthesizer_name,
+                                       state.get('inferred_schema'))
+        incremental = fitted is not None
+        synthesizer, cache_hit = fitted or fit_synthesizer(df, state.get('metadata'), synthesizer_name,
+                                                           state.get('inferred_schema'),
+                                                           record=bool(state.get('incremental')))
 
-    if result_csv_str.startswith("SYNTHESIS_ERROR"):
-        return {'status': 'Error', 'error_message': result_csv_str}
+        if constraints:
+            # Constrained runs sample in-process: each draw is sized from the acceptance rate so far
+            batches = iter_constrained_batches(synthesizer, num_rows, constraints, batch_size, seed, sampling_stats)
+        elif workers > 1 and num_rows > batch_size:
+            # Process-pool engine: shards are sampled concurrently with derived seeds
+            batches = iter_parallel_batches(synthesizer, num_rows, batch_size, workers,
+                                            seed if seed is not None else DEFAULT_SEED)
+        else:
+            batches = iter_synthetic_batches(synthesizer, num_rows, batch_size, seed)
 
-    synthetic_df = pd.read_csv(io.StringIO(result_csv_str))
+        sampling_started = time.perf_counter()
+        if num_rows <= batch_size:
+            synthetic_df = next(batches)
+            streamed_output_path = None
+            _publish_sampling(state, synthetic_df.shape[0], num_rows, 1, sampling_started)
+        else:
+            # Large request: stream batches straight to the output sink so peak memory
+            # is bounded by batch_size. The first batch is kept for quality validation.
+            sink = open_sink(output_path_for(state['project_id'], output_format))
+            synthetic_df = None
+            rows_written = 0
+            try:
+                for batch_number, batch in enumerate(batches, 1):
+                    # A cancelled job stops here rather than after the whole run is sampled
+                    check_cancelled(state.get('job_id'))
+                    sink.write(batch)
+                    if synthetic_df is None:
+                        synthetic_df = batch
+                    rows_written += batch.shape[0]
+                    _publish_sampling(state, rows_written, num_rows, batch_number, sampling_started)
+            except BaseException:
+                # Sampling failed or was cancelled: the partial output will never be published
+                sink.close()
+                discard_partial(sink.partial_path)
+                raise
+            finally:
+                sink.close()
+            streamed_output_path = sink.partial_path
+    except JobCancelled:
+        raise
+    except ConstraintError as e:
+        return {'status': 'Error', 'error_message': f"CONSTRAINT_ERROR: {e}"}
+    except Exception as e:
+        return {'status': 'Error', 'error_message': f"SYNTHESIS_ERROR: {e}"}
 
-    log = f"Synthesis Agent: Generated {synthetic_df.shape[0]} synthetic rows."
+    prefit_metadata = state.get('prefit_metadata')
+    if prefit_metadata is not None and prefit_metadata == state.get('metadata') and cache_hit:
+        model_source = f"used {synthesizer_name} model fitted concurrently with schema inference"
+    elif prefit_metadata is not None and prefit_metadata != state.get('metadata'):
+        model_source = f"refitted {synthesizer_name} model: the inferred schema changed the metadata of the concurrent fit"
+    elif cache_hit:
+        model_source = f"reused cached {synthesizer_name} model"
+    elif incremental:
+        model_source = (f"incrementally updated {synthesizer_name} model with "
+                        f"{df.shape[0] - append_base['rows']} appended rows")
+    else:
+        model_source = f"fitted new {synthesizer_name} model"
+    if streamed_output_path:
+        log = (f"Synthesis Agent: Streamed {num_rows} synthetic rows in batches of {batch_size} "
+               f"using {1 if constraints else workers} worker(s) to {streamed_output_path} ({model_source}).")
+    else:
+        log = f"Synthesis Agent: Generated {synthetic_df.shape[0]} synthetic rows ({model_source})."
+    if constraints:
+        log += (f" Enforced {len(constraints.texts)} constraint(s): {sampling_stats['accepted']:,} of "
+                f"{sampling_stats['drawn']:,} sampled rows accepted in {sampling_stats['draws']} draw(s).")
     return {
-        'synthetic_data': synthetic_df,
+        'synthetic_data_ref': ARTIFACT_STORE.put(run_id_for(state), 'synthetic', synthetic_df),
+        'streamed_output_path': streamed_output_path,
         'status': 'Data Generated',
-        'log_messages': state.get('log_messages', []) + [log]
-    }
\ No newline at end of file
+        'log_messages': [log]
+    }
@@ -1,27 +1,67 @@
-import pandas as pd
 from typing import Dict, Any
+from core.artifacts import ARTIFACT_STORE, run_id_for
 from core.graph_state import GenerationState
+from core.incremental import DATASET_REGISTRY
+from core.loader import DEFAULT_LOAD_ENGINE, load_csv
+from core.tools import analyze_dataframe_stats
 
 
 def data_loader(state: GenerationState) -> Dict[str, Any]:
-    """LangGraph node: Loads the input file (CSV) into a Pandas DataFrame."""
+    """
+    LangGraph node: Loads the input file (CSV) into a Pandas DataFrame.
+    The file is streamed in chunks with compact dtypes; with load_sample_rows set,
+    only a uniform reservoir sample of the input is kept for fitting and validation.
+    In incremental mode, an input that only appends rows to a previously fitted
+    version is detected here so later nodes can reuse that version's work.
+    The frame is profiled here once, for schema_inference and model_fitting to share.
+    """
 
     file_path = state['input_file_path']
     project_id = state['project_id']
 
     try:
-        df = pd.read_csv(file_path)
+        df, load_stats = load_csv(
+            file_path,
+            engine=state.get('load_engine') or DEFAULT_LOAD_ENGINE,
+            sample_rows=state.get('load_sample_rows'),
+            seed=state.get('seed')
+        )
         log = f"Project {project_id}: Data loaded successfully. Shape: {df.shape}"
+        if load_stats['sampled']:
+            log += f" (reservoir sample of {load_stats['rows_read']} rows)"
+        log += (f". Read {load_stats['rows_per_sec'] or 0:,.0f} rows/s with the {load_stats['engine']} engine; "
+                f"frame {load_stats['frame_bytes'] / 1024 ** 2:.1f} MiB, peak RSS {load_stats['peak_rss_bytes'] / 1024 ** 2:.0f} MiB.")
+
+        append_base = None
+        if state.get('incremental'):
+            if load_stats['sampled']:
+                log += " Incremental mode skipped: a sampled input cannot be matched against earlier versions."
+            else:
+                append_base = DATASET_REGISTRY.find_base(df.drop(columns=['Unnamed: 0'], errors='ignore'))
+                if append_base is not None:
+                    log += (f" Input appends {df.shape[0] - append_base['rows']} rows to a previously "
+                            f"processed version of {append_base['rows']} rows.")
+
+        # An appended input reuses its base version's schema and needs no profile
+        data_stats = None
+        if append_base is None:
+            try:
+                data_stats = analyze_dataframe_stats.invoke({'df': df})
+            except Exception:
+                pass  # schema_inference re-profiles and reports the error
 
         return {
-            'original_data': df,
+            'original_data_ref': ARTIFACT_STORE.put(run_id_for(state), 'original', df),
+            'load_stats': load_stats,
+            'append_base': append_base,
+            'data_stats': data_stats,
             'status': 'Data Loaded',
-            'log_messages': state.get('log_messages', []) + [log]
+            'log_messages': [log]
         }
     except Exception as e:
         error_msg = f"Error loading data: {e}"
         return {
             'status': 'Error',
             'error_message': error_msg,
-            'log_messages': state.get('log_messages', []) + [error_msg]
-        }
\ No newline at end of file
+            'log_messages': [error_msg]
+        }
@@ -1,6 +1,7 @@
 from typing import Dict, Any
+from core.artifacts import ARTIFACT_STORE
 from core.graph_state import GenerationState
-import pandas as pd
+from core.sinks import DEFAULT_OUTPUT_FORMAT, output_path_for, publish_partial, write_frame
 
 
 def data_saver(state: GenerationState) -> Dict[str, Any]:
@@ -9,15 +10,26 @@ def data_saver(state: GenerationState) -> Dict[str, Any]:
     In a FastAPI app, this updates the MySQL status and stores the file.
     """
 
-    synthetic_df = state['synthetic_data']
     project_id = state['project_id']
+    streamed_output_path = state.get('streamed_output_path')
 
     # --- MVP Logic: Save file locally ---
-    output_path = f"synthetic_data_{project_id}.csv"
-    synthetic_df.to_csv(output_path, index=False)
+    if streamed_output_path:
+        # Streamed runs were already written batch-by-batch; just publish the file.
+        output_path = publish_partial(streamed_output_path)
+        row_count = state['num_rows']
+    else:
+        output_path = output_path_for(project_id, state.get('output_format') or DEFAULT_OUTPUT_FORMAT)
+        synthetic_df = ARTIFACT_STORE.get(state['synthetic_data_ref'])
+        write_frame(synthetic_df, output_path)
+        row_count = synthetic_df.shape[0]
 
     final_status = state['status']
     log = f"Persistence Agent: Final status '{final_status}'. Data saved to {output_path}."
 
     # Final return for the state before END
-    return {'log_messages': state.get('log_messages', []) + [log]}
\ No newline at end of file
+    return {
+        'output_path': output_path,
+        'output_row_count': row_count,
+        'log_messages': [log]
+    }
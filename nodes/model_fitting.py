@@ -0,0 +1,44 @@
+import json
+from typing import Dict, Any
+from core.artifacts import ARTIFACT_STORE
+from core.graph_state import GenerationState
+from core.metadata import detect_metadata, metadata_from_schema
+from core.synthesizers import DEFAULT_SYNTHESIZER
+from core.tools import analyze_dataframe_stats, fit_synthesizer, infer_schema_from_stats
+
+
+def model_fitting(state: GenerationState) -> Dict[str, Any]:
+    """
+    LangGraph node (parallel mode only): Fits the synthesizer while schema_inference
+    waits on the LLM. The model is fitted on metadata from the rule-based schema and
+    lands in the model cache; when the LLM's schema yields the same metadata,
+    data_generation picks it up as a cache hit, otherwise it refits. Never writes
+    'status', which schema_inference owns in the same step.
+    """
+    if not state.get('parallel'):
+        return {}
+
+    df = ARTIFACT_STORE.get(state.get('original_data_ref'))
+    # Nothing to do when loading failed, and appended inputs are updated incrementally by data_generation
+    if df is None or state.get('append_base'):
+        return {}
+
+    synthesizer_name = state.get('synthesizer') or DEFAULT_SYNTHESIZER
+    try:
+        stats_output = state.get('data_stats') or analyze_dataframe_stats.invoke({'df': df})
+        schema = infer_schema_from_stats(json.loads(stats_output))
+        try:
+            metadata, _ = metadata_from_schema(df, schema)
+        except Exception:
+            metadata = detect_metadata(df)
+        _, cache_hit = fit_synthesizer(df, metadata, synthesizer_name, schema, record=bool(state.get('incremental')))
+    except Exception as e:
+        error_msg = f"Fitting Agent: Concurrent fit failed, synthesis will fit after schema inference. {e}"
+        return {'prefit_error': str(e), 'log_messages': [error_msg]}
+
+    source = "found cached" if cache_hit else "fitted"
+    return {
+        'prefit_metadata': metadata,
+        'log_messages': [f"Fitting Agent: {source} {synthesizer_name} model on rule-based metadata "
+                         f"concurrently with schema inference."]
+    }
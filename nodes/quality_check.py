@@ -1,8 +1,12 @@
-import pandas as pd
-from sdv.metadata import SingleTableMetadata
-from sdmetrics.reports.single_table import QualityReport
+import math
 from typing import Dict, Any
+from core.artifacts import ARTIFACT_STORE
 from core.graph_state import GenerationState
+from core.metadata import detect_metadata
+from core.quality import (
+    QUALITY_MAX_COLUMN_PAIRS, QUALITY_ROW_BUDGET, QUALITY_TIME_BUDGET_S,
+    full_quality_report, needs_sampling, sampled_quality_report,
+)
 
 
 def quality_check(state: GenerationState) -> Dict[str, Any]:
@@ -13,12 +17,12 @@ def quality_check(state: GenerationState) -> Dict[str, Any]:
     if state.get('status') == 'Error':
         return {
             'status': 'Error',
-            'log_messages': state.get('log_messages', []) + ["Validation skipped due to previous error."]
+            'log_messages': ["Validation skipped due to previous error."]
         }
 
-    original_df = state['original_data']
-    synthetic_df = state['synthetic_data']
-    log_messages = state.get('log_messages', [])
+    original_df = ARTIFACT_STORE.get(state.get('original_data_ref'))
+    synthetic_df = ARTIFACT_STORE.get(state.get('synthetic_data_ref'))
+    log_messages = []
 
     if synthetic_df is None:
         error_msg = "Critical Error: Synthetic data is missing (None) despite 'Data Generated' status."
@@ -45,32 +49,54 @@ def quality_check(state: GenerationState) -> Dict[str, Any]:
 
     # --- 2. Statistical Validation (Fidelity Check) ---
     try:
-        # 1. Instantiate metadata object first (Required for SDV 1.0+)
-        metadata = SingleTableMetadata()
-        metadata.detect_from_dataframe(data=original_df)
+        # 1. Reuse the metadata synthesis was fitted with; detect only if the run has none
+        metadata_dict = state.get('metadata') or detect_metadata(original_df)
 
-        report = QualityReport()
+        # 2. Full SDMetrics report for small data, budgeted sampled report otherwise
+        row_budget = state.get('quality_row_budget') or QUALITY_ROW_BUDGET
+        max_pairs = state.get('quality_max_column_pairs') or QUALITY_MAX_COLUMN_PAIRS
+        mode = state.get('quality_mode') or 'auto'
+        if mode == 'auto':
+            mode = 'sampled' if needs_sampling(original_df, synthetic_df, metadata_dict, row_budget, max_pairs) else 'full'
 
-        # 2. Convert SingleTableMetadata object to a dictionary for SDMetrics
-        report.generate(original_df, synthetic_df, metadata.to_dict())
-
-        overall_score = report.get_score()
-
-        log = f"Statistical Validation Complete. Overall Score: {overall_score:.2f}"
+        if mode == 'sampled':
+            quality_report = sampled_quality_report(
+                original_df, synthetic_df, metadata_dict,
+                row_budget=row_budget,
+                max_pairs=max_pairs,
+                time_budget_s=state.get('quality_time_budget_s') or QUALITY_TIME_BUDGET_S,
+                seed=state.get('seed') or 0,
+            )
+            low, high = quality_report['Confidence Interval']
+            log = (f"Statistical Validation Complete (sampled). Overall Score: {quality_report['Overall Score']:.2f} "
+                   f"[95% CI {low:.2f}-{high:.2f}], {quality_report['Column Pairs Evaluated']}/"
+                   f"{quality_report['Column Pairs Total']} column pairs.")
+        else:
+            quality_report = full_quality_report(original_df, synthetic_df, metadata_dict)
+            log = f"Statistical Validation Complete. Overall Score: {quality_report['Overall Score']:.2f}"
         log_messages.append(log)
 
-        # 3. FIX: Use 'get_properties()' instead of 'get_details()'
-        # This returns the summary dataframe (Column Shapes, Trends scores)
-        properties_json = report.get_properties().to_json()
+        # 3. Optional acceptance threshold on the overall score; a missing or NaN score
+        # (nothing could be scored) never meets it
+        threshold = state.get('quality_threshold')
+        score = quality_report.get('Overall Score')
+        if threshold is not None and (score is None or math.isnan(score) or score < threshold):
+            if score is None or math.isnan(score):
+                error_msg = f"Quality Below Threshold: no Overall Score could be computed (required {threshold:.2f})."
+            else:
+                error_msg = f"Quality Below Threshold: Overall Score {score:.2f} is under the required {threshold:.2f}."
+            return {
+                'quality_report': quality_report,
+                'status': 'Validation Failure',
+                'error_message': error_msg,
+                'log_messages': log_messages + [error_msg]
+            }
 
         return {
-            'quality_report': {
-                'Overall Score': overall_score,
-                'Details': properties_json
-            },
+            'quality_report': quality_report,
             'status': 'Quality Approved',
             'log_messages': log_messages
         }
     except Exception as e:
         error_msg = f"Statistical Validation Error: SDMetrics failed. {e}"
-        return {'status': 'Error', 'error_message': error_msg}
\ No newline at end of file
+        return {'status': 'Error', 'error_message': error_msg}
@@ -1,49 +1,147 @@
 import json
 import os
-# FIX: Use the new langchain_huggingface package to support newer huggingface_hub versions
-from langchain_huggingface import HuggingFaceEndpoint
-from langchain_core.messages import HumanMessage
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import Dict, Any
+from core.artifacts import ARTIFACT_STORE
 from core.graph_state import GenerationState
-from core.tools import analyze_dataframe_stats
+from core.tools import analyze_dataframe_stats, infer_schema_from_stats
+from core.schema_cache import SCHEMA_CACHE, prompt_key
+from core.metadata import detect_metadata, metadata_from_schema
 
 # --- Hugging Face LLM Setup ---
 HF_REPO_ID = "meta-llama/Llama-2-7b-chat-hf"
 
-try:
-    # The environment variable HUGGINGFACEHUB_API_TOKEN must be set.
-    hf_llm = HuggingFaceEndpoint(
-        repo_id=HF_REPO_ID,
-        temperature=0.01,
-        max_new_tokens=2048,
-        task="text-generation"  # Explicitly define task
-    )
-    print(f"HuggingFace Endpoint initialized with model: {HF_REPO_ID}")
-except Exception as e:
-    print(f"Warning: Failed to initialize HuggingFace Endpoint. {e}")
-    hf_llm = None
+# The endpoint client is created on first use (or by warm_up_llm), not at import time,
+# so importing the graph and booting the API server don't pay for it.
+_hf_llm = None
+_hf_llm_initialized = False
+_hf_llm_lock = threading.Lock()
 
 
-def schema_inference(state: GenerationState) -> Dict[str, Any]:
-    """LangGraph node: Uses Hugging Face LLM to infer the schema based on Pandas stats."""
+def get_llm():
+    """Returns the shared HuggingFace endpoint client, creating it on first call (None if unavailable)."""
+    global _hf_llm, _hf_llm_initialized
 
-    # 1. Check if LLM is ready
-    if hf_llm is None:
+    if _hf_llm_initialized:
+        return _hf_llm
+
+    with _hf_llm_lock:
+        if not _hf_llm_initialized:
+            try:
+                # FIX: Use the new langchain_huggingface package to support newer huggingface_hub versions
+                from langchain_huggingface import HuggingFaceEndpoint
+
+                # The environment variable HUGGINGFACEHUB_API_TOKEN must be set.
+                _hf_llm = HuggingFaceEndpoint(
+                    repo_id=HF_REPO_ID,
+                    temperature=0.01,
+                    max_new_tokens=2048,
+                    task="text-generation"  # Explicitly define task
+                )
+                print(f"HuggingFace Endpoint initialized with model: {HF_REPO_ID}")
+            except Exception as e:
+                print(f"Warning: Failed to initialize HuggingFace Endpoint. {e}")
+                _hf_llm = None
+            _hf_llm_initialized = True
+
+    return _hf_llm
+
+
+def warm_up_llm() -> bool:
+    """Optional warm-up hook: initializes the LLM client ahead of the first run."""
+    return get_llm() is not None
+
+
+# --- Latency Budget ---
+# Above this many seconds the rule-based schema is used instead of waiting for the LLM.
+SCHEMA_LLM_TIMEOUT_S = float(os.environ.get("SYNTH_SCHEMA_LLM_TIMEOUT_S", 30))
+_llm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="schema-llm")
+
+
+def _parse_llm_schema(raw_output: str) -> Dict[str, Any]:
+    """Cleans up and parses the LLM's JSON schema; raises json.JSONDecodeError when invalid."""
+    cleaned_output = raw_output.strip()
+    # Remove markdown code blocks if present
+    if cleaned_output.startswith("```"):
+        cleaned_output = cleaned_output.strip("`").replace("json", "").strip()
+
+    inferred_schema = json.loads(cleaned_output)
+
+    # Handle wrapped responses if necessary
+    if 'columns' in inferred_schema:
+        return inferred_schema['columns']
+    return inferred_schema
+
+
+def _cache_late_result(cache_key: str, future) -> None:
+    """Caches an LLM answer that arrived after the latency budget, for the next run."""
+    try:
+        SCHEMA_CACHE.put(cache_key, _parse_llm_schema(future.result()))
+    except Exception:
+        pass
+
+
+def _schema_result(df, schema_data: Dict[str, Any], log_messages: list) -> Dict[str, Any]:
+    """Node output for an inferred schema, with the SDV metadata shared by synthesis and validation."""
+    try:
+        metadata, detected_columns = metadata_from_schema(df, schema_data)
+        if detected_columns:
+            log_messages.append(f"Schema Agent: Metadata built from schema; detected {len(detected_columns)} "
+                                f"column(s) without a usable type: {', '.join(map(str, detected_columns))}.")
+    except Exception as e:
+        metadata = detect_metadata(df)
+        log_messages.append(f"Schema Agent: Schema could not be mapped to SDV metadata ({e}). Detected it instead.")
+
+    return {
+        'inferred_schema': schema_data,
+        'metadata': metadata,
+        'status': 'Schema Inferred',
+        'log_messages': log_messages
+    }
+
+
+def _fallback_schema(df, stats_output: str, reason: str, log_messages: list) -> Dict[str, Any]:
+    schema_data = infer_schema_from_stats(json.loads(stats_output))
+    log_messages.append(f"Schema Agent: {reason} Used rule-based schema inferred from statistics.")
+    return _schema_result(df, schema_data, log_messages)
+
+
+def schema_inference(state: GenerationState) -> Dict[str, Any]:
+    """
+    LangGraph node: Uses Hugging Face LLM to infer the schema based on Pandas stats.
+    Parsed schemas are cached by prompt hash; when the cache misses and the LLM is
+    unavailable, over its latency budget or returns invalid JSON, a deterministic
+    rule-based schema derived from the same stats is used instead.
+    """
+
+    # Keep the loader's error rather than replacing it with a profiling failure
+    if state.get('status') == 'Error':
+        return {'status': 'Error', 'log_messages': ["Schema inference skipped due to previous error."]}
+
+    log_messages = []
+
+    # An append-only change keeps the columns and their types: reuse the base version's schema
+    append_base = state.get('append_base') or {}
+    if append_base.get('schema') and append_base.get('metadata'):
+        log_messages.append(f"Schema Agent: Schema and metadata reused from the previously processed "
+                            f"version ({append_base['rows']} rows); profiling skipped.")
         return {
-            'status': 'Error',
-            'error_message': "Schema Agent Error: LLM not initialized (Check API Token)."
+            'inferred_schema': append_base['schema'],
+            'metadata': append_base['metadata'],
+            'status': 'Schema Inferred',
+            'log_messages': log_messages
         }
 
-    df = state['original_data']
-    log_messages = state.get('log_messages', [])
-
-    # 2. Get the statistical summary from the Tool
+    # 1. Get the statistical summary from the Tool (profiled by data_loader)
+    df = ARTIFACT_STORE.get(state['original_data_ref'])
     try:
-        stats_output = analyze_dataframe_stats.invoke({'df': df})
+        stats_output = state.get('data_stats') or analyze_dataframe_stats.invoke({'df': df})
+        json.loads(stats_output)
     except Exception as e:
         return {'status': 'Error', 'error_message': f"Pandas Tool Error: {e}"}
 
-    # 3. Strong Prompt Engineering for JSON Output
+    # 2. Strong Prompt Engineering for JSON Output
     system_prompt = (
         "You are the Schema Inference Agent. Your task is to analyze the provided "
         "data statistics and generate a formal JSON schema for synthetic data generation. "
@@ -54,43 +152,43 @@ def schema_inference(state: GenerationState) -> Dict[str, Any]:
 
     llm_prompt = f"{system_prompt}\n\nDATA STATISTICS:\n{stats_output}\n\nOutput the complete JSON schema:"
 
-    try:
-        # 4. Call the Hugging Face endpoint
-        raw_output = hf_llm.invoke(llm_prompt)
-
-        # 5. Cleanup and Parse the JSON Output
-        cleaned_output = raw_output.strip()
-        # Remove markdown code blocks if present
-        if cleaned_output.startswith("```"):
-            cleaned_output = cleaned_output.strip("`").replace("json", "").strip()
+    # 3. Identical statistics produce an identical prompt: reuse the parsed schema
+    cache_key = prompt_key(f"{HF_REPO_ID}\n{llm_prompt}")
+    cached_schema = SCHEMA_CACHE.get(cache_key)
+    if cached_schema is not None:
+        log_messages.append(f"Schema Agent: Schema reused from cache (prompt {cache_key[:12]}).")
+        return _schema_result(df, cached_schema, log_messages)
 
-        # Attempt to parse the cleaned JSON
-        inferred_schema = json.loads(cleaned_output)
+    # 4. Check if LLM is ready
+    hf_llm = get_llm()
+    if hf_llm is None:
+        return _fallback_schema(df, stats_output, "LLM not initialized (Check API Token).", log_messages)
 
-        # Handle wrapped responses if necessary
-        if 'columns' in inferred_schema:
-            schema_data = inferred_schema['columns']
-        else:
-            schema_data = inferred_schema
+    try:
+        # 5. Call the Hugging Face endpoint within the latency budget
+        future = _llm_executor.submit(hf_llm.invoke, llm_prompt)
+        try:
+            raw_output = future.result(timeout=SCHEMA_LLM_TIMEOUT_S)
+        except FuturesTimeoutError:
+            future.add_done_callback(lambda f: _cache_late_result(cache_key, f))
+            return _fallback_schema(
+                df, stats_output, f"LLM exceeded the {SCHEMA_LLM_TIMEOUT_S:g}s latency budget.", log_messages
+            )
+
+        # 6. Cleanup and Parse the JSON Output
+        schema_data = _parse_llm_schema(raw_output)
+        SCHEMA_CACHE.put(cache_key, schema_data)
 
         log = f"Schema Agent: Schema inferred successfully using {HF_REPO_ID}."
         log_messages.append(log)
 
-        return {
-            'inferred_schema': schema_data,
-            'status': 'Schema Inferred',
-            'log_messages': log_messages
-        }
+        return _schema_result(df, schema_data, log_messages)
 
-    except json.JSONDecodeError as jde:
-        # Fallback: If JSON parsing fails, we can log it but might allow the pipeline
-        # to proceed if we trust the SDV auto-detection in the next step.
-        # For MVP, we mark it as an error.
-        error_msg = f"Schema Agent Error: LLM output was not valid JSON. Output snippet: {cleaned_output[:50]}..."
-        log_messages.append(error_msg)
-        return {'status': 'Error', 'error_message': error_msg, 'log_messages': log_messages}
+    except json.JSONDecodeError:
+        # The stats are trustworthy even when the LLM's answer isn't: fall back to the rules.
+        return _fallback_schema(
+            df, stats_output, f"LLM output was not valid JSON. Output snippet: {raw_output.strip()[:50]}...", log_messages
+        )
 
     except Exception as e:
-        error_msg = f"Schema Agent Error: Failed to invoke Hugging Face Endpoint. {e}"
-        log_messages.append(error_msg)
-        return {'status': 'Error', 'error_message': error_msg, 'log_messages': log_messages}
\ No newline at end of file
+        return _fallback_schema(df, stats_output, f"Failed to invoke Hugging Face Endpoint. {e}", log_messages)
@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+
+import nodes.schema_inference as schema_inference
+from core.artifacts import ArtifactStore
+from main_graph import build_generation_graph
+
+
+def test_round_trip_and_release(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    frame = pd.DataFrame({'Age': [1, 2, 3], 'City': ['NY', 'LA', None]})
+    mixed = pd.DataFrame({'value': [1, "a", {'b': 2}]})
+
+    refs = [store.put("run", "frame", frame), store.put("run", "mixed", mixed)]
+
+    assert refs[0]['path'].endswith(".arrow") and refs[1]['path'].endswith(".pkl")
+    assert refs[0]['rows'] == 3 and refs[0]['columns'] == 2
+    pd.testing.assert_frame_equal(store.get(refs[0]), frame)
+    assert store.get(refs[1])['value'].tolist() == mixed['value'].tolist()
+    assert store.get(None) is None
+
+    store.release("run")
+    assert not any(os.path.exists(ref['path']) for ref in refs)
+
+
+def test_state_holds_references_and_appended_logs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(schema_inference, "get_llm", lambda: None)
+    pd.DataFrame({'Age': [20 + i % 40 for i in range(100)], 'City': ['NY', 'LA'] * 50}).to_csv("input.csv", index=False)
+
+    state = build_generation_graph().invoke({
+        'project_id': "REFS", 'run_id': "refs", 'input_file_path': "input.csv", 'original_data_ref': None,
+        'inferred_schema': {}, 'user_constraints': [], 'metadata': None, 'num_rows': 50,
+        'synthetic_data_ref': None, 'quality_report': {}, 'status': 'Initialized', 'log_messages': [],
+        'error_message': None,
+    })
+
+    assert state['status'] == 'Quality Approved', state.get('error_message')
+    assert not any(isinstance(value, pd.DataFrame) for value in state.values())
+    assert state['original_data_ref']['rows'] == 100 and state['synthetic_data_ref']['rows'] == 50
+    # Each node contributes its own entries exactly once, in graph order
+    assert len(state['log_messages']) == len(set(state['log_messages']))
+    assert state['log_messages'][0].startswith("Project REFS: Data loaded successfully.")
+    assert len(state['node_metrics']) == 6
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from core.batches import BatchManager
+from core.jobs import JobManager
+
+
+def _wait_finished(batch, timeout=10):
+    deadline = time.time() + timeout
+    while batch.finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert batch.finished_at is not None
+
+
+def _manager(run_job, max_workers=2, max_queued=0):
+    jobs = JobManager(run_job, max_workers=max_workers, max_queued=max_queued)
+    return BatchManager(jobs, lambda project_id, params: jobs.submit(project_id, **params), jobs.cancel, max_items=5)
+
+
+def test_batch_runs_every_item_within_the_worker_limit():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def run_job(job):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return {'status': 'Quality Approved', 'synthetic_row_count': job.params['num_rows']}
+
+    items = [{'project_id': f"T{i}", 'input_file_path': f"t{i}.csv", 'num_rows': 10 * (i + 1)} for i in range(5)]
+    batch = _manager(run_job).submit(items)
+    _wait_finished(batch)
+
+    summary = batch.to_dict()
+    assert summary['status'] == 'completed'
+    assert summary['counts'] == {'completed': 5}
+    assert [item['synthetic_row_count'] for item in summary['items']] == [10, 20, 30, 40, 50]
+    assert summary['throughput']['rows_generated'] == 150
+    assert peak[0] <= 2
+
+
+def test_cancel_stops_remaining_items():
+    release = threading.Event()
+    manager = _manager(lambda job: release.wait(5) and {}, max_workers=1)
+    batch = manager.submit([{'project_id': f"T{i}", 'input_file_path': f"t{i}.csv"} for i in range(3)])
+    while batch.jobs[0] is None:
+        time.sleep(0.01)
+
+    manager.cancel(batch.batch_id)
+    release.set()
+    _wait_finished(batch)
+
+    assert batch.status == 'cancelled'
+    assert [batch.item_state(i) for i in (1, 2)] == ['cancelled', 'cancelled']
+
+
+@pytest.mark.parametrize("items", [[], [{'project_id': "T", 'input_file_path': "t.csv"}] * 6])
+def test_batch_size_is_validated(items):
+    with pytest.raises(ValueError):
+        _manager(lambda job: {}).submit(items)
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+import core.checkpoints as checkpoints
+import nodes.schema_inference as schema_inference
+from core.checkpoints import CheckpointStore, checkpoint_run_id
+from main_graph import build_generation_graph
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(schema_inference, "get_llm", lambda: None)
+    monkeypatch.setattr(checkpoints, "CHECKPOINTS", CheckpointStore(str(tmp_path / "checkpoints.sqlite3")))
+    return tmp_path
+
+
+def _run(input_path, **params):
+    return build_generation_graph().invoke({
+        'project_id': "CK", 'run_id': checkpoint_run_id(input_path), 'input_file_path': input_path,
+        'original_data_ref': None, 'inferred_schema': {}, 'user_constraints': [], 'metadata': None,
+        'num_rows': 500, 'seed': 3, 'synthetic_data_ref': None, 'quality_report': {}, 'status': 'Initialized',
+        'log_messages': [], 'error_message': None, 'checkpoint': True, 'executed_nodes': [], **params,
+    })
+
+
+def test_column_named_path_is_not_a_file_reference(workdir):
+    pd.DataFrame({'path': [f"/tmp/{i}" for i in range(50)], 'size': range(50)}).to_csv("input.csv", index=False)
+
+    state = _run("input.csv")
+    assert state['status'] == 'Quality Approved', state.get('error_message')
+
+    assert _run("input.csv")['executed_nodes'] == []
+
+
+def test_revalidating_streamed_run_reuses_sampled_output(workdir):
+    pd.DataFrame({'Age': [20 + i % 40 for i in range(200)], 'City': ['NY', 'LA'] * 100}).to_csv("input.csv", index=False)
+    first = _run("input.csv", batch_size=100)
+    assert first['status'] == 'Quality Approved', first.get('error_message')
+    published = pd.read_csv(first['output_path'])
+
+    # Only the threshold changed: the published output is sampled data the checkpoint still holds
+    second = _run("input.csv", batch_size=100, quality_threshold=0.1)
+
+    assert second['status'] == 'Quality Approved', second.get('error_message')
+    assert second['executed_nodes'] == ['quality_check']
+    pd.testing.assert_frame_equal(pd.read_csv(second['output_path']), published)
+    assert not list(workdir.glob("*.partial"))
@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+from core.constraints import ConstraintError, compile_constraints
+
+FRAME = pd.DataFrame({'smoker': [True, False, True], 'City': ['NY', None, 'LA']})
+
+
+@pytest.mark.parametrize("text", ["smoker == True", "smoker == true", "smoker in [True]", "smoker != False"])
+def test_boolean_literals(text):
+    assert compile_constraints([text], FRAME.columns).mask(FRAME).tolist() == [True, False, True]
+
+
+def test_null_literal():
+    assert compile_constraints(["City == null"], FRAME.columns).mask(FRAME).tolist() == [False, True, False]
+
+
+def test_unknown_column_is_named():
+    with pytest.raises(ConstraintError, match="Unknown column 'age'"):
+        compile_constraints(["age >= 18"], FRAME.columns)
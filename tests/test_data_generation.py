@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+import nodes.schema_inference as schema_inference
+from main_graph import build_generation_graph
+
+
+@pytest.mark.parametrize("input_name", ["missing.csv", "empty.csv"])
+def test_failed_load_with_constraints_keeps_loader_error(tmp_path, monkeypatch, input_name):
+    (tmp_path / "empty.csv").write_text("")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(schema_inference, "get_llm", lambda: None)
+
+    state = build_generation_graph().invoke({
+        'project_id': "FAILED_LOAD", 'run_id': "failed-load", 'input_file_path': input_name,
+        'original_data_ref': None, 'inferred_schema': {}, 'user_constraints': ["Age >= 18"], 'metadata': None,
+        'num_rows': 100, 'synthetic_data_ref': None, 'quality_report': {}, 'status': 'Initialized',
+        'log_messages': [], 'error_message': None,
+    })
+
+    assert state['status'] == 'Error'
+    assert state['error_message'].startswith("Error loading data:")
+
+
+def test_large_run_streams_batches_to_the_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(schema_inference, "get_llm", lambda: None)
+    pd.DataFrame({'Age': [20 + i % 40 for i in range(200)], 'City': ['NY', 'LA'] * 100}).to_csv("input.csv", index=False)
+
+    state = build_generation_graph().invoke({
+        'project_id': "STREAMED", 'run_id': "streamed", 'input_file_path': "input.csv",
+        'original_data_ref': None, 'inferred_schema': {}, 'user_constraints': [], 'metadata': None,
+        'num_rows': 2500, 'batch_size': 1000, 'synthesizer': 'fast', 'synthetic_data_ref': None,
+        'quality_report': {}, 'status': 'Initialized', 'log_messages': [], 'error_message': None,
+    })
+
+    assert state['status'] == 'Quality Approved', state.get('error_message')
+    # Only the first batch is kept in the artifact store; the rest went straight to disk
+    assert state['synthetic_data_ref']['rows'] == 1000
+    assert state['output_row_count'] == 2500
+    assert len(pd.read_csv(state['output_path'])) == 2500
+    assert not list(tmp_path.glob("*.partial"))
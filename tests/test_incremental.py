@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+import core.tools as tools
+from core.incremental import DatasetRegistry
+from core.synthesizers import FastCopulaSynthesizer
+
+METADATA = {'columns': {'Age': {'sdtype': 'numerical'}, 'Salary': {'sdtype': 'numerical'},
+                        'City': {'sdtype': 'categorical'}}}
+
+
+def _frame(rows, seed):
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 80, rows)
+    return pd.DataFrame({'Age': age, 'Salary': age * 1000 + rng.normal(0, 5000, rows),
+                         'City': rng.choice(['NY', 'LA', 'SF'], rows, p=[0.5, 0.3, 0.2])})
+
+
+def _correlation(synthesizer):
+    return synthesizer.cholesky @ synthesizer.cholesky.T
+
+
+def test_fast_update_matches_full_refit():
+    base, delta = _frame(3000, 1), _frame(1000, 2)
+    updated = FastCopulaSynthesizer(METADATA)
+    updated.fit(base)
+    updated.update(delta)
+    refit = FastCopulaSynthesizer(METADATA)
+    refit.fit(pd.concat([base, delta], ignore_index=True))
+
+    assert updated.num_rows == refit.num_rows == 4000
+    for column in ('Age', 'Salary'):
+        spread = refit.marginals[column]['quantiles'][-1] - refit.marginals[column]['quantiles'][0]
+        assert np.abs(updated.marginals[column]['quantiles'] - refit.marginals[column]['quantiles']).max() < 0.02 * spread
+    assert np.array_equal(updated.marginals['City']['counts'], refit.marginals['City']['counts'])
+    assert np.abs(_correlation(updated) - _correlation(refit)).max() < 0.02
+
+
+def test_fits_are_recorded_only_when_requested(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = DatasetRegistry(str(tmp_path / "registry"))
+    monkeypatch.setattr(tools, "DATASET_REGISTRY", registry)
+    df = _frame(200, 3)
+
+    tools.fit_synthesizer(df, METADATA, 'fast')
+    assert registry.find_base(pd.concat([df, _frame(10, 4)], ignore_index=True)) is None
+
+    # A cache hit still records, so the next appended version finds this one
+    _, cache_hit = tools.fit_synthesizer(df, METADATA, 'fast', record=True)
+    assert cache_hit
+    assert registry.find_base(pd.concat([df, _frame(10, 4)], ignore_index=True))['rows'] == 200
@@ -0,0 +1,38 @@
+import pytest
+
+from core.jobs import Job, JobCancelled, JobManager, check_cancelled
+
+
+def test_cancel_racing_job_start_releases_slot():
+    dropped = []
+    manager = JobManager(lambda job: {}, max_workers=1, max_queued=0, on_dropped=dropped.append)
+    job = Job("P", {})
+    manager._jobs[job.job_id] = job
+
+    # cancel() set the flag after the executor picked the job up, so its future could not be cancelled
+    job.cancel_event.set()
+    manager._execute(job)
+
+    assert job.status == 'cancelled' and job.finished_at is not None
+    assert dropped == [job]
+    assert manager._active_count() == 0
+
+
+def test_check_cancelled_by_job_id():
+    manager = JobManager(lambda job: job.cancel_event.wait(5) and {}, max_workers=1)
+    job = manager.submit("P")
+    check_cancelled(job.job_id)
+    check_cancelled(None)
+    manager.cancel(job.job_id)
+    with pytest.raises(JobCancelled):
+        check_cancelled(job.job_id)
+
+
+def test_queued_is_reported_before_the_job_runs():
+    events = []
+    manager = JobManager(lambda job: events.append(('running', job.job_id)) or {}, max_workers=1,
+                         on_queued=lambda job: events.append(('queued', job.job_id)))
+    job = manager.submit("P")
+    job.future.result(timeout=5)
+
+    assert events == [('queued', job.job_id), ('running', job.job_id)]
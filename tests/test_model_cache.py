@@ -0,0 +1,32 @@
+import os
+import pickle
+
+import pytest
+
+from core.model_cache import ModelCache
+
+
+class _Stale:
+    pass
+
+
+@pytest.mark.parametrize("payload", [
+    b"not a pickle",
+    # A model pickled against a class that no longer exists, as after an SDV upgrade
+    pickle.dumps(_Stale()).replace(b"test_model_cache", b"gone_module_xyz"),
+])
+def test_unreadable_entry_is_a_miss_and_deleted(tmp_path, payload):
+    cache = ModelCache(str(tmp_path))
+    with open(os.path.join(tmp_path, "key.pkl"), "wb") as f:
+        f.write(payload)
+
+    assert cache.get("key") is None
+    assert not os.path.exists(os.path.join(tmp_path, "key.pkl"))
+    assert cache.stats()['misses'] == 1
+
+
+def test_round_trip(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    cache.put("key", {'model': 1})
+    assert cache.get("key") == {'model': 1}
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,25 @@
+import pandas as pd
+
+import core.tools as tools
+import nodes.schema_inference as schema_inference
+from main_graph import build_generation_graph
+
+
+def test_parallel_run_profiles_input_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(schema_inference, "get_llm", lambda: None)
+    calls = []
+    profile = tools.profile_dataframe
+    monkeypatch.setattr(tools, "profile_dataframe", lambda df: calls.append(len(df)) or profile(df))
+    pd.DataFrame({'Age': [20 + i % 40 for i in range(200)], 'City': ['NY', 'LA'] * 100}).to_csv("input.csv", index=False)
+
+    state = build_generation_graph().invoke({
+        'project_id': "MF", 'run_id': "mf", 'input_file_path': "input.csv", 'original_data_ref': None,
+        'inferred_schema': {}, 'user_constraints': [], 'metadata': None, 'num_rows': 100, 'parallel': True,
+        'synthetic_data_ref': None, 'quality_report': {}, 'status': 'Initialized', 'log_messages': [],
+        'error_message': None,
+    })
+
+    assert state['status'] == 'Quality Approved', state.get('error_message')
+    assert state['prefit_metadata'] is not None
+    assert calls == [200]
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+import nodes.quality_check as quality_check_node
+from core.artifacts import ArtifactStore
+from core.quality import sampled_quality_report
+
+METADATA = {'columns': {'Age': {'sdtype': 'numerical'}, 'Salary': {'sdtype': 'numerical'},
+                        'City': {'sdtype': 'categorical'}}}
+
+
+def _frame(rows, seed):
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 80, rows)
+    return pd.DataFrame({'Age': age, 'Salary': age * 1000 + rng.normal(0, 5000, rows),
+                         'City': rng.choice(['NY', 'LA', 'SF'], rows)})
+
+
+def _width(report):
+    low, high = report['Confidence Interval']
+    assert low <= report['Overall Score'] <= high
+    return high - low
+
+
+def test_interval_covers_row_sampling_error():
+    real, synth = _frame(20_000, 1), _frame(20_000, 2)
+
+    small = sampled_quality_report(real, synth, METADATA, row_budget=200, bootstrap_rounds=30)
+    large = sampled_quality_report(real, synth, METADATA, row_budget=10_000, bootstrap_rounds=30)
+
+    assert small['Bootstrap Rounds'] == large['Bootstrap Rounds'] == 30
+    # Fewer evaluated rows must mean a wider interval
+    assert _width(small) > 2 * _width(large) > 0
+
+
+def test_nan_score_fails_the_threshold(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path))
+    monkeypatch.setattr(quality_check_node, "ARTIFACT_STORE", store)
+    monkeypatch.setattr(quality_check_node, "full_quality_report", lambda *args: {'Overall Score': float('nan')})
+    frame = _frame(50, 3)
+    state = {'status': 'Data Generated', 'metadata': METADATA, 'quality_mode': 'full', 'quality_threshold': 0.5,
+             'original_data_ref': store.put("run", "original", frame),
+             'synthetic_data_ref': store.put("run", "synthetic", frame)}
+
+    update = quality_check_node.quality_check(state)
+
+    assert update['status'] == 'Validation Failure'
+    assert "no Overall Score" in update['error_message']
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from core.result_store import ResultStore
+
+
+def test_csv_page_is_read_without_loading_the_output(tmp_path):
+    path = tmp_path / "synthetic_data_P.csv"
+    pd.DataFrame({'id': range(1000), 'value': [i * 2 for i in range(1000)]}).to_csv(path, index=False)
+    store = ResultStore(max_bytes=0)
+    store.update('P', output_path=str(path), row_count=1000)
+
+    page = store.read_page('P', 500, 3, ['value', 'id'])
+
+    assert list(page.columns) == ['value', 'id']
+    assert page['id'].tolist() == [500, 501, 502]
+    assert store.stats()['cached_frames'] == 0
+
+
+def test_csv_page_uses_the_cached_frame(tmp_path):
+    path = tmp_path / "synthetic_data_P.csv"
+    pd.DataFrame({'id': range(10)}).to_csv(path, index=False)
+    store = ResultStore()
+    store.update('P', output_path=str(path), row_count=10)
+    store.get_frame('P')
+    path.unlink()
+
+    assert store.read_page('P', 8, 5)['id'].tolist() == [8, 9]
+
+
+def test_load_locks_are_not_retained(tmp_path):
+    store = ResultStore()
+    for index in range(3):
+        path = tmp_path / f"synthetic_data_P{index}.csv"
+        pd.DataFrame({'id': range(10)}).to_csv(path, index=False)
+        store.update(f"P{index}", output_path=str(path), row_count=10)
+        store.get_frame(f"P{index}")
+
+    assert len(store._load_locks) == 0
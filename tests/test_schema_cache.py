@@ -0,0 +1,77 @@
+import json
+
+import pandas as pd
+
+import nodes.schema_inference as schema_inference
+from core.artifacts import ArtifactStore
+from core.schema_cache import SchemaCache
+from core.tools import analyze_dataframe_stats, infer_schema_from_stats
+
+FRAME = pd.DataFrame({'Age': [25, 30, 45, 60] * 5, 'Salary': [5e4, 7.5e4, 1.2e5, 4.5e4] * 5,
+                      'City': pd.Series(['NY', 'LA', 'NY', 'SF'] * 5, dtype='category')})
+
+
+class _FakeLLM:
+    def __init__(self, output):
+        self.output = output
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return self.output
+
+
+def _state(tmp_path, monkeypatch, llm):
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    monkeypatch.setattr(schema_inference, "ARTIFACT_STORE", store)
+    monkeypatch.setattr(schema_inference, "SCHEMA_CACHE", SchemaCache(str(tmp_path / "schemas")))
+    monkeypatch.setattr(schema_inference, "get_llm", lambda: llm)
+    return {'original_data_ref': store.put("run", "original", FRAME), 'status': 'Data Loaded'}
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    SchemaCache(str(tmp_path)).put("key", {'Age': {'type': 'int'}})
+    cache = SchemaCache(str(tmp_path))
+    assert cache.get("key") == {'Age': {'type': 'int'}}
+    assert cache.stats()['hits'] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SchemaCache(str(tmp_path), ttl_s=0)
+    cache.put("key", {'Age': {'type': 'int'}})
+    assert cache.get("key") is None
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_disk_entries_are_bounded(tmp_path):
+    cache = SchemaCache(str(tmp_path), max_disk_entries=2)
+    for i in range(4):
+        cache.put(f"key{i}", {})
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_rule_based_schema_from_stats():
+    schema = infer_schema_from_stats(json.loads(analyze_dataframe_stats.invoke({'df': FRAME})))
+    assert schema['Age']['type'] == 'int' and schema['Age']['min'] == 25 and schema['Age']['max'] == 60
+    assert schema['Salary']['type'] == 'float'
+    assert schema['City']['type'] == 'category' and set(schema['City']['top_values']) == {'NY', 'LA', 'SF'}
+
+
+def test_identical_stats_call_the_llm_once(tmp_path, monkeypatch):
+    llm = _FakeLLM(json.dumps({'Age': {'type': 'int'}, 'Salary': {'type': 'float'}, 'City': {'type': 'category'}}))
+    state = _state(tmp_path, monkeypatch, llm)
+
+    first = schema_inference.schema_inference(state)
+    second = schema_inference.schema_inference(state)
+
+    assert llm.calls == 1
+    assert second['inferred_schema'] == first['inferred_schema']
+    assert "reused from cache" in second['log_messages'][0]
+
+
+def test_unavailable_or_invalid_llm_falls_back_to_rules(tmp_path, monkeypatch):
+    for llm in (None, _FakeLLM("not json")):
+        result = schema_inference.schema_inference(_state(tmp_path, monkeypatch, llm))
+        assert result['status'] == 'Schema Inferred'
+        assert result['inferred_schema']['City']['type'] == 'category'
+        assert "rule-based schema" in result['log_messages'][-1]
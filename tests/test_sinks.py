@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from core.sampling import iter_synthetic_batches
+from core.sinks import OUTPUT_FORMATS, open_sink, publish_partial, read_output
+
+FRAME = pd.DataFrame({'Age': range(10), 'City': ['NY', 'LA'] * 5})
+
+
+class _CountingSynthesizer:
+    def __init__(self):
+        self.requests = []
+
+    def sample(self, num_rows):
+        self.requests.append(num_rows)
+        return FRAME.iloc[:0].reindex(range(num_rows))
+
+
+def test_batches_are_bounded_by_batch_size():
+    synthesizer = _CountingSynthesizer()
+    batches = list(iter_synthetic_batches(synthesizer, 2500, batch_size=1000))
+
+    assert synthesizer.requests == [1000, 1000, 500]
+    assert sum(len(b) for b in batches) == 2500
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_sink_appends_batches_and_publishes(tmp_path, fmt):
+    final_path = tmp_path / f"out{OUTPUT_FORMATS[fmt]}"
+    sink = open_sink(str(final_path))
+    for start in range(0, 10, 4):
+        sink.write(FRAME.iloc[start:start + 4])
+    sink.close()
+
+    assert not final_path.exists()
+    path = publish_partial(sink.partial_path)
+    assert sink.rows_written == 10
+    pd.testing.assert_frame_equal(read_output(path), FRAME)
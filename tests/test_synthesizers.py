@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.sampling import iter_synthetic_batches
+from core.synthesizers import FastCopulaSynthesizer, create_synthesizer
+
+METADATA = {
+    'columns': {'ID': {'sdtype': 'id'}, 'Age': {'sdtype': 'numerical'}, 'City': {'sdtype': 'categorical'}},
+    'primary_key': 'ID',
+}
+
+
+def _fitted() -> FastCopulaSynthesizer:
+    df = pd.DataFrame({'ID': np.arange(100, dtype=np.int8), 'Age': np.arange(100) % 60 + 18,
+                       'City': ['NY', 'LA', 'SF', 'NY'] * 25})
+    synthesizer = FastCopulaSynthesizer(METADATA)
+    synthesizer.fit(df)
+    return synthesizer
+
+
+def test_fast_ids_do_not_wrap_narrow_dtype():
+    ids = _fitted().sample(500)['ID']
+    assert ids.dtype == np.int64
+    assert ids.is_unique
+
+
+def test_fast_ids_continue_across_batches():
+    synthesizer = _fitted()
+    ids = pd.concat(iter_synthetic_batches(synthesizer, 3000, batch_size=1000, seed=1), ignore_index=True)['ID']
+    assert ids.is_unique and ids.shape[0] == 3000
+
+    synthesizer.reset_sampling()
+    assert synthesizer.sample(5)['ID'].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_unknown_synthesizer_is_named():
+    with pytest.raises(ValueError, match="Unknown synthesizer 'gan'"):
+        create_synthesizer('gan', METADATA)
+
+
+def test_registry_builds_sdv_models():
+    assert type(create_synthesizer('gaussian_copula', METADATA)).__name__ == 'GaussianCopulaSynthesizer'
+    assert isinstance(create_synthesizer('fast', METADATA), FastCopulaSynthesizer)
+
+
+def test_fast_engine_keeps_marginals_and_correlation():
+    rng = np.random.default_rng(0)
+    x = rng.normal(50, 10, 5000)
+    df = pd.DataFrame({'x': x, 'y': 2 * x + rng.normal(0, 5, 5000),
+                       'City': rng.choice(['NY', 'LA', 'SF'], 5000, p=[0.6, 0.3, 0.1])})
+    metadata = {'columns': {'x': {'sdtype': 'numerical'}, 'y': {'sdtype': 'numerical'},
+                            'City': {'sdtype': 'categorical'}}}
+    synthesizer = create_synthesizer('fast', metadata)
+    synthesizer.fit(df)
+    synthetic = synthesizer.sample(5000)
+
+    assert abs(synthetic['x'].mean() - df['x'].mean()) < 1
+    assert abs(synthetic['x'].std() - df['x'].std()) < 1
+    assert synthetic['x'].between(df['x'].min(), df['x'].max()).all()
+    assert abs(synthetic['x'].corr(synthetic['y']) - df['x'].corr(df['y'])) < 0.05
+    frequencies = synthetic['City'].value_counts(normalize=True)
+    assert set(frequencies.index) == {'NY', 'LA', 'SF'}
+    assert abs(frequencies['NY'] - 0.6) < 0.03
@@ -0,0 +1,50 @@
+import asyncio
+import os
+
+import pytest
+
+from core.uploads import InvalidUpload, UploadTooLarge, store_upload
+
+BOUNDARY = "xYzBoundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _body(content: bytes, filename: str = "input.csv") -> bytes:
+    return (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n"
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: text/csv\r\n\r\n").encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _store(body: bytes, upload_dir, chunk: int = 7, **kwargs):
+    async def stream():
+        for start in range(0, len(body), chunk):
+            yield body[start:start + chunk]
+
+    return asyncio.run(store_upload(stream(), CONTENT_TYPE, str(upload_dir), **kwargs))
+
+
+def test_file_part_is_stored_once_by_content(tmp_path):
+    content = b"a,b\n" + b"1,2\n" * 100
+
+    first = _store(_body(content), tmp_path)
+    second = _store(_body(content, "copy.csv"), tmp_path, chunk=1000)
+
+    assert first['filename'] == "input.csv" and not first['deduplicated'] and first['size_bytes'] == len(content)
+    assert second['deduplicated'] and second['file_path'] == first['file_path']
+    with open(first['file_path'], 'rb') as f:
+        assert f.read() == content
+    assert os.listdir(tmp_path) == [os.path.basename(first['file_path'])]
+
+
+def test_limit_applies_to_received_bytes(tmp_path):
+    # No Content-Length is involved: the stream is cut off once the file part crosses the limit
+    with pytest.raises(UploadTooLarge):
+        _store(_body(b"x" * 5000), tmp_path, max_bytes=1000)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("body", [_body(b"a\n1\n", "input.txt"), _body(b"a\n1\n")[:-20], b"not multipart"])
+def test_invalid_uploads_leave_nothing_behind(tmp_path, body):
+    with pytest.raises(InvalidUpload):
+        _store(body, tmp_path)
+    assert os.listdir(tmp_path) == []